@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                         run_benchmarks.py                                        #
+#     Python script to time and memory-profile the post-processing parsers on synthetic files      #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: run_benchmarks.py [-s <SIZES>] [-r <REPEATS>] [-o <JSON-FILE>] [--compare <JSON-FILE>]    #
+#                          [--workdir <FOLDER>]                                                    #
+#                                                                                                  #
+# Benchmarks (synthetic files written by synthetic_files.py):                                      #
+#               . 'g09_geometry':    get_g09_geom.py index, step, tail and trajectory readers      #
+#                                    (get_g09_geometry) on an optimization Log File                #
+#               . 'molden_cas':      get_molden_active_space.py format_molden_file                 #
+#               . 'molden_nto':      clean_orca_nto.py format_nto_molden_file                      #
+#                                                                                                  #
+# Options:                                                                                         #
+#               . 's': Comma-separated sizes, 'small', 'medium' and/or 'large'                     #
+#                      (default: 'small,medium')                                                   #
+#               . 'r': Number of timed repeats of each case (default: 5), best and median kept     #
+#               . 'o': JSON results file (default: 'benchmarks.json')                              #
+#               . '--compare': Print time ratios against the results of a previous run             #
+#               . '--workdir': Folder of synthetic files (default: temporary folder, removed)      #
+#                                                                                                  #
+# Peak memory is measured by tracemalloc in an extra, untimed run of each case.                    #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path, makedirs
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##       JSON encoder and decoder Module       ##
+import json
+##           Time access Module                ##
+import time
+##    Trace memory allocations Module          ##
+import tracemalloc
+##       Mathematical statistics Module        ##
+import statistics
+##       Access underlying platform data       ##
+import platform
+##        Generate temporary files Module      ##
+import tempfile
+##     High-level file operations Module       ##
+import shutil
+##     Implementation of import Module         ##
+import importlib.util
+##        Basic date and time types Module     ##
+from datetime import datetime
+##     Fundamental package for array computing ##
+import numpy as np
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+#################################################
+
+## Root folder of CompChemTools repository
+COMPCHEMTOOLS_ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+
+## Post-processing scripts benchmarked, loaded as modules
+BENCHMARK_SCRIPTS = {
+    'get_g09_geom': path.join('post-processing', 'g09', 'get_g09_geom.py'),
+    'get_molden_active_space': path.join('post-processing', 'molden',
+                                         'get_molden_active_space.py'),
+    'clean_orca_nto': path.join('post-processing', 'orca', 'clean_orca_nto.py')
+}
+
+## Synthetic file sizes: g09 atoms and steps, Molden atoms, basis functions and orbitals
+BENCHMARK_SIZES = {
+    'small': {'g09_atoms': 20, 'g09_steps': 20,
+              'molden_atoms': 10, 'basis_size': 100, 'orbitals_number': 100},
+    'medium': {'g09_atoms': 100, 'g09_steps': 200,
+               'molden_atoms': 40, 'basis_size': 500, 'orbitals_number': 500},
+    'large': {'g09_atoms': 500, 'g09_steps': 500,
+              'molden_atoms': 150, 'basis_size': 2000, 'orbitals_number': 2000}
+}
+
+## Version of the JSON results layout
+BENCHMARK_RESULTS_VERSION = 1
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('-s', dest='sizes',
+                        type=str,
+                        default='small,medium',
+                        help='comma-separated sizes of synthetic files ({})'
+                             .format(', '.join(BENCHMARK_SIZES)))
+
+    parser.add_argument('-r', dest='repeats',
+                        type=int,
+                        default=5,
+                        help='number of timed repeats of each case')
+
+    parser.add_argument('-o', dest='output_file',
+                        type=str,
+                        default='benchmarks.json',
+                        help='JSON results file')
+
+    parser.add_argument('--compare', dest='compare_file',
+                        type=str,
+                        default=None,
+                        help='JSON results of a previous run to compare with')
+
+    parser.add_argument('--workdir', dest='workdir',
+                        type=str,
+                        default=None,
+                        help='folder of synthetic files (kept after the run)')
+
+    args = parser.parse_args()
+
+    args.sizes = args.sizes.split(',')
+    for size in args.sizes:
+        if size not in BENCHMARK_SIZES:
+            parser.error('invalid size: {}'.format(size))
+
+    if args.repeats < 1:
+        parser.error('number of repeats must be positive')
+
+    return args
+
+def load_script(_script_name):
+    """Function to load a post-processing script as a module, without running its main program
+
+    Arguments:
+        _script_name {str} -- key of BENCHMARK_SCRIPTS
+
+    Returns:
+        module:script -- loaded script
+    """
+    script_spec = importlib.util.spec_from_file_location(
+        _script_name, path.join(COMPCHEMTOOLS_ROOT, BENCHMARK_SCRIPTS[_script_name]))
+    script = importlib.util.module_from_spec(script_spec)
+    script_spec.loader.exec_module(script)
+
+    return script
+
+def measure_case(_function, _repeats):
+    """Function to time a benchmark case and measure its peak memory
+
+    Arguments:
+        _function {callable} -- benchmark case, called without arguments
+        _repeats {int} -- number of timed calls
+
+    Returns:
+        dict:measure -- 'times' (s), 'best' and 'median' times, and 'peak_memory' (bytes)
+    """
+    times = []
+    for _ in range(_repeats):
+        start = time.perf_counter()
+        _function()
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc slows allocations down, so memory is measured apart from timing
+    tracemalloc.start()
+    try:
+        _function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'times': times,
+            'best': min(times),
+            'median': statistics.median(times),
+            'peak_memory': peak_memory}
+
+def get_g09_cases(_scripts, _g09_log_file):
+    """Function to build the g09 geometry benchmark cases
+
+    Arguments:
+        _scripts {dict} -- loaded post-processing scripts
+        _g09_log_file {str} -- synthetic g09 Log File name
+
+    Returns:
+        dict:cases -- benchmark cases keyed by case name
+    """
+    g09_geom = _scripts['get_g09_geom']
+
+    def get_arguments(_step):
+        return argparse.Namespace(g09_log_file=_g09_log_file, step=_step, format='input',
+                                  use_cache=False)
+
+    g09_index = g09_geom.index_g09_file(get_arguments('opt'))
+    atoms_number = g09_index['atoms_number']
+
+    def get_geometry(_step):
+        g09_arguments = get_arguments(_step)
+        return g09_geom.format_g09_geometry(
+            g09_arguments, g09_geom.get_g09_geometry(g09_arguments, g09_index), atoms_number)
+
+    def get_tail_geometry(_step):
+        g09_arguments = get_arguments(_step)
+        return g09_geom.format_g09_geometry(
+            g09_arguments, *g09_geom.get_g09_tail_geometry(g09_arguments))
+
+    def get_trajectory():
+        g09_arguments = get_arguments(slice(None))
+        return g09_geom.format_g09_geometry(
+            g09_arguments, g09_geom.get_g09_trajectory(g09_arguments, g09_index), atoms_number)
+
+    return {
+        'index': lambda: g09_geom.index_g09_file(get_arguments('opt')),
+        'step_first': lambda: get_geometry(0),
+        'step_opt': lambda: get_geometry('opt'),
+        'tail_opt': lambda: get_tail_geometry('opt'),
+        'tail_last': lambda: get_tail_geometry(-1),
+        'trajectory_all': get_trajectory
+    }
+
+def get_molden_cases(_scripts, _molden_file, _nto_file):
+    """Function to build the Molden benchmark cases
+
+    Arguments:
+        _scripts {dict} -- loaded post-processing scripts
+        _molden_file {str} -- synthetic CAS Molden File name
+        _nto_file {str} -- synthetic NTO Molden File name
+
+    Returns:
+        dict:cases -- benchmark cases keyed by (benchmark, case) names
+    """
+    active_space = _scripts['get_molden_active_space']
+    orca_nto = _scripts['clean_orca_nto']
+
+    cas_arguments = argparse.Namespace(molden_filename=_molden_file, occupation_window=None,
+                                       spin=None, top=None, unrestricted=False)
+    nto_arguments = argparse.Namespace(molden_nto_file=_nto_file, occupation_thresholds=[0.01],
+                                       spin=None, top=None, cumulative=None)
+
+    molden_text = active_space.open_molden_file(cas_arguments)
+    nto_text = orca_nto.open_ntos_molden_file(nto_arguments)
+
+    return {
+        ('molden_cas', 'read'): lambda: active_space.open_molden_file(cas_arguments),
+        ('molden_cas', 'format'): lambda: active_space.format_molden_file(cas_arguments,
+                                                                          molden_text),
+        ('molden_nto', 'read'): lambda: orca_nto.open_ntos_molden_file(nto_arguments),
+        ('molden_nto', 'format'): lambda: orca_nto.format_nto_molden_file(nto_arguments,
+                                                                          nto_text)
+    }
+
+def run_size_benchmarks(_arguments, _scripts, _size, _workdir):
+    """Function to write the synthetic files of one size and run all benchmark cases on them
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _scripts {dict} -- loaded post-processing scripts
+        _size {str} -- key of BENCHMARK_SIZES
+        _workdir {str} -- folder of synthetic files
+
+    Returns:
+        list:results -- one result (dict) per benchmark case
+    """
+    size_parameters = BENCHMARK_SIZES[_size]
+
+    g09_log_file = path.join(_workdir, 'synthetic.{}.log'.format(_size))
+    molden_file = path.join(_workdir, 'synthetic.{}.molden'.format(_size))
+    nto_file = path.join(_workdir, 'synthetic.{}.nto'.format(_size))
+
+    synthetic_files.write_g09_optimization_log(
+        g09_log_file, size_parameters['g09_atoms'], size_parameters['g09_steps'])
+    synthetic_files.write_molden_file(
+        molden_file, size_parameters['molden_atoms'], size_parameters['basis_size'],
+        size_parameters['orbitals_number'], 'cas')
+    synthetic_files.write_molden_file(
+        nto_file, size_parameters['molden_atoms'], size_parameters['basis_size'],
+        size_parameters['orbitals_number'], 'nto')
+
+    benchmark_cases = [
+        (('g09_geometry', case_name), g09_log_file, case)
+        for case_name, case in get_g09_cases(_scripts, g09_log_file).items()]
+    benchmark_cases.extend(
+        (case_key, molden_file if case_key[0] == 'molden_cas' else nto_file, case)
+        for case_key, case in get_molden_cases(_scripts, molden_file, nto_file).items())
+
+    results = []
+    for (benchmark, case_name), input_file, case in benchmark_cases:
+        measure = measure_case(case, _arguments.repeats)
+        file_size = path.getsize(input_file)
+
+        results.append(dict(benchmark=benchmark,
+                            case=case_name,
+                            size=_size,
+                            parameters=size_parameters,
+                            file_size=file_size,
+                            throughput=file_size / measure['best'] / 1e6,
+                            **measure))
+
+        print('> {:<13} {:<15} {:<7} {:10.2f} ms {:10.1f} MB/s {:10.2f} MB peak'.format(
+            benchmark, case_name, _size, 1e3 * measure['best'], results[-1]['throughput'],
+            measure['peak_memory'] / 1e6))
+
+    return results
+
+def get_run_metadata():
+    """Function to describe the machine and versions of a benchmark run
+
+    Returns:
+        dict:metadata -- date, Python, NumPy and platform of the run
+    """
+    return {'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine()}
+
+def compare_results(_results, _compare_file):
+    """Function to print best time ratios of this run against a previous run
+
+    Arguments:
+        _results {list} -- results of this run
+        _compare_file {str} -- JSON results file of a previous run
+    """
+    with open(_compare_file, 'rt') as file:
+        previous_results = json.load(file)['results']
+
+    previous_times = {(result['benchmark'], result['case'], result['size']): result['best']
+                      for result in previous_results}
+
+    print('> Comparison with {} (time ratio, < 1 is faster):'.format(_compare_file))
+    for result in _results:
+        previous_time = previous_times.get((result['benchmark'], result['case'], result['size']))
+        if previous_time is None:
+            continue
+        print('> {:<13} {:<15} {:<7} {:8.3f}'.format(result['benchmark'], result['case'],
+                                                     result['size'],
+                                                     result['best'] / previous_time))
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Loading post-processing scripts
+    scripts = {script_name: load_script(script_name) for script_name in BENCHMARK_SCRIPTS}
+
+    # Running benchmarks on synthetic files of each size
+    if arguments.workdir is None:
+        workdir = tempfile.mkdtemp(prefix='compchemtools-benchmarks.')
+    else:
+        workdir = arguments.workdir
+        makedirs(workdir, exist_ok=True)
+    try:
+        results = []
+        for size in arguments.sizes:
+            results.extend(run_size_benchmarks(arguments, scripts, size, workdir))
+    finally:
+        if arguments.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    # Writing JSON results
+    with open(arguments.output_file, 'wt') as file:
+        json.dump({'version': BENCHMARK_RESULTS_VERSION,
+                   'metadata': get_run_metadata(),
+                   'repeats': arguments.repeats,
+                   'results': results}, file, indent=2)
+
+    # Comparing with a previous run
+    if arguments.compare_file is not None:
+        try:
+            compare_results(results, arguments.compare_file)
+        except (OSError, ValueError, KeyError) as error:
+            print_script_output('> Results could not be compared: {}'.format(error), 'error')
+            sys.exit(1)
+
+    # End of run_benchmarks.py execution
+    print_script_output(
+        '> {} benchmark cases sucessfully written to {}!'
+            .format(len(results), arguments.output_file),
+        'job_done')
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                        synthetic_files.py                                        #
+#       Python script to generate synthetic Gaussian09 Log Files and Molden files of any size      #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: synthetic_files.py g09 <LOG-FILE> [-a <ATOMS>] [-n <STEPS>] [--no-stationary]             #
+#        synthetic_files.py molden <MOLDEN-FILE> [-a <ATOMS>] [-b <BASIS>] [-m <ORBITALS>]         #
+#                                  [-occ <PROFILE>]                                                #
+#                                                                                                  #
+# g09 Log Files hold the 'NAtoms', 'Input orientation:', 'Standard orientation:', 'SCF Done',      #
+# 'Step number', 'Stationary point found' and 'Normal termination' lines of an optimization.       #
+#                                                                                                  #
+# Molden occupation profiles:                                                                      #
+#               . 'closed': Closed shell orbitals, lower half doubly occupied (default)            #
+#               . 'cas':    Doubly occupied core, fractional active space and empty virtuals       #
+#               . 'nto':    ORCA NTO pairs, occupations decaying from the first pair               #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##       Parser for command-line options       ##
+import argparse
+##  Generate pseudo-random numbers Module      ##
+import random
+#################################################
+
+## Occupation profiles of synthetic Molden files
+MOLDEN_OCCUPATION_PROFILES = ['closed', 'cas', 'nto']
+
+## Number of active orbitals of the 'cas' profile
+MOLDEN_ACTIVE_ORBITALS = 8
+
+## Dashed line closing the header and the body of g09 orientation blocks
+G09_DASHED_LINE = ' ' + '-' * 69 + '\n'
+
+## Atomic numbers cycled along synthetic molecules (C, H, O, N)
+SYNTHETIC_ATOMIC_NUMBERS = [6, 1, 8, 7]
+
+## Highest occupied orbital of synthetic g09 TD Log Files
+G09_HOMO = 20
+
+## Conversion of transition energies (eV) into wavelengths (nm)
+G09_EV_NM = 1239.84193
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('file_type',
+                        type=str,
+                        choices=['g09', 'molden'],
+                        help='type of synthetic file')
+
+    parser.add_argument('filename',
+                        type=str,
+                        help='synthetic file name')
+
+    parser.add_argument('-a', dest='atoms_number',
+                        type=int,
+                        default=20,
+                        help='number of atoms')
+
+    parser.add_argument('-n', dest='steps_number',
+                        type=int,
+                        default=10,
+                        help='number of optimization steps (g09)')
+
+    parser.add_argument('--no-stationary', dest='stationary',
+                        action='store_false',
+                        help='do not write the stationary point and optimized geometry (g09)')
+
+    parser.add_argument('-b', dest='basis_size',
+                        type=int,
+                        default=100,
+                        help='number of basis functions (Molden)')
+
+    parser.add_argument('-m', dest='orbitals_number',
+                        type=int,
+                        default=None,
+                        help='number of molecular orbitals (Molden, default: basis size)')
+
+    parser.add_argument('-occ', dest='occupation_profile',
+                        type=str,
+                        default='closed',
+                        choices=MOLDEN_OCCUPATION_PROFILES,
+                        help='occupation profile of molecular orbitals (Molden)')
+
+    args = parser.parse_args()
+
+    if args.orbitals_number is None:
+        args.orbitals_number = args.basis_size
+
+    return args
+
+def format_g09_orientation(_orientation, _atoms_number, _step):
+    """Function to format a g09 orientation block, displacing atoms along optimization steps
+
+    Arguments:
+        _orientation {str} -- orientation name ('Input', 'Standard' or 'Z-Matrix')
+        _atoms_number {int} -- number of atoms
+        _step {int} -- optimization step of the geometry
+
+    Returns:
+        str:g09_block -- orientation block lines
+    """
+    block_lines = [
+        '                          {} orientation:\n'.format(_orientation),
+        G09_DASHED_LINE,
+        ' Center     Atomic      Atomic             Coordinates (Angstroms)\n',
+        ' Number     Number       Type             X           Y           Z\n',
+        G09_DASHED_LINE]
+
+    displacement = 0.001 * _step
+    block_lines.extend(
+        ' {:6d} {:10d} {:11d} {:15.6f} {:11.6f} {:11.6f}\n'.format(
+            atom + 1, SYNTHETIC_ATOMIC_NUMBERS[atom % len(SYNTHETIC_ATOMIC_NUMBERS)], 0,
+            1.4 * (atom % 10) + displacement, 1.4 * (atom // 10 % 10) - displacement,
+            1.4 * (atom // 100) + 0.5 * displacement)
+        for atom in range(_atoms_number))
+    block_lines.append(G09_DASHED_LINE)
+
+    return ''.join(block_lines)
+
+def write_g09_optimization_log(_filename, _atoms_number, _steps_number, _stationary=True):
+    """Function to write a synthetic g09 optimization Log File
+
+    Each step holds an input and a standard orientation block, the SCF energy and the step
+    number. The optimized geometry is written again after the stationary point, as g09 does.
+
+    Arguments:
+        _filename {str} -- g09 Log File name
+        _atoms_number {int} -- number of atoms
+        _steps_number {int} -- number of optimization steps
+        _stationary {bool} -- write the stationary point and optimized geometry
+    """
+    with open(_filename, 'w') as file:
+        file.write(' Entering Gaussian System, Link 0=g09\n')
+        file.write(' #p opt b3lyp/6-31g(d)\n')
+        file.write(' NAtoms=    {} NQM=    {} NQMF=       0 NMMI=      0\n'
+                   .format(_atoms_number, _atoms_number))
+
+        for step in range(1, _steps_number + 1):
+            file.write(format_g09_orientation('Input', _atoms_number, step))
+            file.write(format_g09_orientation('Standard', _atoms_number, step))
+            file.write(' SCF Done:  E(RB3LYP) =  {:.9f}     A.U. after   12 cycles\n'
+                       .format(-100.0 * _atoms_number - 0.001 / step))
+            file.write(' Step number {:3d} out of a maximum of  {:3d}\n'
+                       .format(step, max(_steps_number, 100)))
+
+        if _stationary and _steps_number:
+            file.write('    -- Stationary point found.\n')
+            file.write(format_g09_orientation('Input', _atoms_number, _steps_number))
+            file.write(format_g09_orientation('Standard', _atoms_number, _steps_number))
+
+        file.write(' Normal termination of Gaussian 09.\n')
+
+def get_g09_excited_state(_state):
+    """Function to build the values of a synthetic g09 excited state
+
+    Arguments:
+        _state {int} -- state number
+
+    Returns:
+        float:energy -- transition energy (eV)
+        float:oscillator_strength -- oscillator strength
+        list:excitations -- (from, to, coefficient) orbital excitations, in file order
+    """
+    return 2.5 + 0.25 * _state, 0.05 * _state, [(G09_HOMO - 1, G09_HOMO + 1, -0.1 * _state),
+                                                 (G09_HOMO, G09_HOMO + _state, 0.65)]
+
+def write_g09_td_log(_filename, _states_number, _atoms_number=3, _mo_lines=10):
+    """Function to write a synthetic g09 TD Log File (gfinput Pop=Full)
+
+    The geometry is followed by the excited states, the 'Molecular Orbital Coefficients' section
+    and the 'Density Matrix' section. Values of excited states follow get_g09_excited_state.
+
+    Arguments:
+        _filename {str} -- g09 Log File name
+        _states_number {int} -- number of excited states
+        _atoms_number {int} -- number of atoms
+        _mo_lines {int} -- number of lines of the orbitals section
+    """
+    with open(_filename, 'w') as file:
+        file.write(' Entering Gaussian System, Link 0=g09\n')
+        file.write(' #p td(nstates={}) b3lyp/6-31g(d) gfinput pop=full\n'.format(_states_number))
+        file.write(' NAtoms=    {} NQM=    {} NQMF=       0 NMMI=      0\n'
+                   .format(_atoms_number, _atoms_number))
+        file.write(format_g09_orientation('Input', _atoms_number, 0))
+        file.write(format_g09_orientation('Standard', _atoms_number, 0))
+
+        file.write(' Excitation energies and oscillator strengths:\n')
+        for state in range(1, _states_number + 1):
+            energy, oscillator_strength, excitations = get_g09_excited_state(state)
+            file.write('\n Excited State {:3d}:      Singlet-A {:11.4f} eV {:7.2f} nm  f={:.4f}'
+                       '  <S**2>=0.000\n'.format(state, energy, G09_EV_NM / energy,
+                                                 oscillator_strength))
+            file.write(''.join('     {:3d} -> {:<3d}     {:9.5f}\n'.format(*excitation)
+                               for excitation in excitations))
+
+        file.write('\n SavETr:  write IOETrn=   770 NScale= 10 NData=  16 NLR=1 LETran=    '
+                   '64.\n')
+        file.write('     Molecular Orbital Coefficients:\n')
+        file.write(''.join(' mo line {}\n'.format(line) for line in range(_mo_lines)))
+        file.write('     Density Matrix:\n')
+        file.write(''.join(' density line {}\n'.format(line) for line in range(_mo_lines)))
+        file.write(' Normal termination of Gaussian 09.\n')
+
+def write_g09_nto_log(_filename, _states, _nto_lines=6):
+    """Function to write a synthetic g09 NTO Log File (gfinput Pop=Minimal)
+
+    Each state holds an 'Alpha spin Natural Transition Orbitals' block closed by two lines and
+    the 'Populations using transition density' line, as g09 writes them.
+
+    Arguments:
+        _filename {str} -- g09 Log File name
+        _states {list} -- state number of each NTO block
+        _nto_lines {int} -- number of orbital lines of NTO blocks
+    """
+    with open(_filename, 'w') as file:
+        file.write(' Entering Gaussian System, Link 0=g09\n')
+        file.write(' #p b3lyp/6-31g(d) guess=(read,only) density=(check,transition=1) '
+                   'pop=(minimal,nto,savento) gfinput\n')
+        for state in _states:
+            file.write(' Alpha spin Natural Transition Orbitals for state {:2d}:\n'.format(state))
+            file.write(''.join(' nto {} line {}\n'.format(state, line)
+                               for line in range(_nto_lines)))
+            file.write('     Density Matrix:\n Condensed to atoms (all electrons):\n')
+            file.write(' Populations using transition density between ground and state {:2d}:\n'
+                       .format(state))
+            file.write(' Mulliken charges:\n')
+        file.write(' Normal termination of Gaussian 09.\n')
+
+def get_molden_occupations(_orbitals_number, _occupation_profile):
+    """Function to build the occupations of synthetic molecular orbitals
+
+    Arguments:
+        _orbitals_number {int} -- number of molecular orbitals
+        _occupation_profile {str} -- occupation profile ('closed', 'cas' or 'nto')
+
+    Returns:
+        list:occupations -- occupation of each molecular orbital
+    """
+    if _occupation_profile == 'nto':
+        # Hole/particle pairs, occupations of 0.9, 0.27, 0.081, ... down to numerical zero
+        return [0.9 * 0.3 ** (orbital // 2) for orbital in range(_orbitals_number)]
+
+    occupied_number = _orbitals_number // 2
+    occupations = [2.0] * occupied_number + [0.0] * (_orbitals_number - occupied_number)
+
+    if _occupation_profile == 'cas':
+        active_start = max(occupied_number - MOLDEN_ACTIVE_ORBITALS // 2, 0)
+        active_end = min(active_start + MOLDEN_ACTIVE_ORBITALS, _orbitals_number)
+        for orbital in range(active_start, active_end):
+            occupations[orbital] = 1.98 - 1.96 * (orbital - active_start) \
+                / max(active_end - active_start - 1, 1)
+
+    return occupations
+
+def format_molden_gto(_atoms_number, _basis_size):
+    """Function to format a '[GTO]' section with the requested number of basis functions
+
+    Basis functions are shared among atoms as 'p' shells (3 functions) and 's' shells.
+
+    Arguments:
+        _atoms_number {int} -- number of atoms
+        _basis_size {int} -- number of basis functions
+
+    Returns:
+        str:gto_section -- '[GTO]' section lines
+    """
+    gto_lines = ['[GTO]\n']
+
+    for atom in range(_atoms_number):
+        atom_functions = _basis_size // _atoms_number + (atom < _basis_size % _atoms_number)
+
+        gto_lines.append('  {} 0\n'.format(atom + 1))
+        for _ in range(atom_functions // 3):
+            gto_lines.append('p   1 1.00\n      2.9412494000      1.0000000000\n')
+        for _ in range(atom_functions % 3):
+            gto_lines.append('s   2 1.00\n     71.6168370000      0.1543289673\n'
+                             '     13.0450960000      0.5353281423\n')
+        gto_lines.append('\n')
+
+    return ''.join(gto_lines)
+
+def write_molden_file(_filename, _atoms_number, _basis_size, _orbitals_number,
+                      _occupation_profile='closed', _seed=0):
+    """Function to write a synthetic ORCA-like Molden File
+
+    Arguments:
+        _filename {str} -- Molden File name
+        _atoms_number {int} -- number of atoms
+        _basis_size {int} -- number of basis functions
+        _orbitals_number {int} -- number of molecular orbitals
+        _occupation_profile {str} -- occupation profile ('closed', 'cas' or 'nto')
+        _seed {int} -- seed of the pseudo-random coefficients
+    """
+    random_generator = random.Random(_seed)
+    occupations = get_molden_occupations(_orbitals_number, _occupation_profile)
+
+    with open(_filename, 'w') as file:
+        file.write('[Molden Format]\n[Title]\n Molden file created by orca_2mkl for '
+                   'BaseName=synthetic\n\n[Atoms] AU\n')
+        for atom in range(_atoms_number):
+            atomic_number = SYNTHETIC_ATOMIC_NUMBERS[atom % len(SYNTHETIC_ATOMIC_NUMBERS)]
+            file.write('  {:<2}   {:4d} {:3d}   {:14.6f} {:14.6f} {:14.6f}\n'.format(
+                'CHON'[atom % 4], atom + 1, atomic_number,
+                2.6 * (atom % 10), 2.6 * (atom // 10 % 10), 2.6 * (atom // 100)))
+
+        file.write(format_molden_gto(_atoms_number, _basis_size))
+
+        file.write('[MO]\n')
+        for orbital in range(_orbitals_number):
+            file.write(' Sym=     {}a\n Ene= {:.4f}\n Spin= Alpha\n Occup= {:.6f}\n'.format(
+                orbital + 1, -1.0 + 2.0 * orbital / max(_orbitals_number, 1),
+                occupations[orbital]))
+            file.write(''.join('{:4d}   {:12.6f}\n'.format(basis_function + 1,
+                                                           random_generator.uniform(-1.0, 1.0))
+                               for basis_function in range(_basis_size)))
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Writing synthetic file
+    if arguments.file_type == 'g09':
+        write_g09_optimization_log(arguments.filename, arguments.atoms_number,
+                                   arguments.steps_number, arguments.stationary)
+    else:
+        write_molden_file(arguments.filename, arguments.atoms_number, arguments.basis_size,
+                          arguments.orbitals_number, arguments.occupation_profile)
+
+    # End of synthetic_files.py execution
+    print('\033[92m> Synthetic {} file {} sucessfully written!\033[m'
+          .format(arguments.file_type, arguments.filename))
@@ -0,0 +1,71 @@
+####################################################################################################
+#                                                                                                  #
+#                                          compchemtools                                           #
+#              Python library shared by CompChemTools post-processing scripts                      #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Modules:                                                                                         #
+#               . compressed: Transparent reading of gzip, bzip2, xz and zstd compressed files     #
+#               . g09: Gaussian09 Log File reader (geometries, excited states and NTOs)            #
+#               . molden: Molden file reader ([Atoms], [GTO] and [MO] sections)                    #
+#               . scanner: Single-pass log scanner with pluggable section handlers                 #
+#               . spectrum: Gaussian/Lorentzian broadening of stick spectra into cross sections    #
+#               . stats: Per-phase throughput statistics and profiling of post-processing scripts  #
+#                                                                                                  #
+# Library functions, returning in-memory objects for file names, file objects or bytes buffers:    #
+#               . get_g09_geometry: Optimized, step or trajectory geometries of g09 Log Files      #
+#               . read_g09_log: Geometry, excited states and NTO blocks of g09 Log Files, one pass #
+#               . read_molden: Atoms, basis shells and orbitals (with coefficients) of Molden files#
+#               . format_molden_file: Active space orbitals of CAS Molden files                    #
+#               . format_nto_molden_file: NTOs above occupation thresholds of ORCA Molden files    #
+#                                                                                                  #
+# Modules are imported on first use of their functions, so 'import compchemtools' does not load    #
+# NumPy and batch pipelines process many files in a single Python process:                         #
+#               >>> import compchemtools                                                           #
+#               >>> geometry = compchemtools.get_g09_geometry('mol.log.gz', _step='opt')           #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##   Import modules programmatically Module    ##
+import importlib
+#################################################
+
+## Library functions, keyed by function name, and the modules defining them
+COMPCHEMTOOLS_API = {
+    'get_g09_geometry': 'g09',
+    'read_g09_log': 'g09',
+    'read_molden': 'molden',
+    'format_molden_file': 'molden',
+    'format_nto_molden_file': 'molden'
+}
+
+__all__ = list(COMPCHEMTOOLS_API)
+
+def __getattr__(_name):
+    """Function to import library functions lazily, on first attribute access (PEP 562)
+
+    Arguments:
+        _name {str} -- attribute name
+
+    Returns:
+        function:api_function -- library function
+    """
+    if _name not in COMPCHEMTOOLS_API:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, _name))
+
+    return getattr(importlib.import_module('.' + COMPCHEMTOOLS_API[_name], __name__), _name)
+
+def __dir__():
+    """Function to list the module attributes, including library functions not imported yet
+
+    Returns:
+        list:attributes -- attribute names
+    """
+    return sorted(set(globals()) | set(COMPCHEMTOOLS_API))
@@ -0,0 +1,357 @@
+####################################################################################################
+#                                                                                                  #
+#                                          compressed.py                                           #
+#        Transparent reading of gzip, bzip2, xz and zstd compressed log and Molden files           #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Compression is chosen by the magic bytes of the file, whatever its extension:                    #
+#               . 'gzip', 'bzip2', 'xz': streaming decompression (Python gzip, bz2 and lzma)       #
+#               . 'bgzf':                blocked gzip (bgzip), random access through its blocks    #
+#               . 'zstd':                streaming decompression (zstandard package)               #
+#               . 'zstd-seekable':       zstd seekable format, random access through its frames    #
+#                                        (zstandard package)                                       #
+#                                                                                                  #
+# Files open as binary readers with the usual read, readline, seek and tell methods, so offsets    #
+# are uncompressed byte offsets. Seeking backwards in a stream restarts its decompression, so      #
+# readers search streams forwards only, random access formats behave as plain files.               #
+# Readers returned by open_file keep their compression, so has_random_access checks them without   #
+# detecting the compression, or walking the BGZF block headers, again.                             #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Core tools for working with streams    ##
+import io
+##   Support for gzip, bzip2 and xz files      ##
+import gzip
+import bz2
+import lzma
+##        Compression compatible with gzip     ##
+import zlib
+##      Interpret bytes as packed binary data  ##
+import struct
+##       Array bisection algorithm Module      ##
+from bisect import bisect_right
+#################################################
+
+## Magic bytes of compressed files
+COMPRESSED_MAGIC = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bzip2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd')
+]
+
+## Extensions of compressed files, searched in folders and removed from output file names
+COMPRESSED_EXTENSIONS = ['.gz', '.bgz', '.bz2', '.xz', '.zst']
+
+## Compressions keeping random access to uncompressed offsets
+RANDOM_ACCESS_COMPRESSIONS = [None, 'bgzf', 'zstd-seekable']
+
+## Magic number closing zstd seekable files and skippable frame holding their seek table
+ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A5E
+
+## Size of the buffers of compressed file readers (bytes)
+COMPRESSED_BUFFER_SIZE = 1024 * 1024
+
+def get_compression(_filename):
+    """Function to detect the compression of a file from its magic bytes
+
+    Readers returned by open_file keep the compression detected when they were opened, so it is
+    not detected again. Other file objects are taken as plain files.
+
+    Arguments:
+        _filename {obj} -- file name, or file object (e.g. a reader returned by open_file)
+
+    Returns:
+        str:compression -- 'gzip', 'bgzf', 'bzip2', 'xz', 'zstd', 'zstd-seekable', or None
+    """
+    if hasattr(_filename, 'read'):
+        return getattr(_filename, 'compression', None)
+
+    with open(_filename, 'rb') as file:
+        head = file.read(18)
+
+        compression = next((name for magic, name in COMPRESSED_MAGIC if head.startswith(magic)),
+                           None)
+
+        # BGZF: gzip member with a 'BC' extra subfield
+        if compression == 'gzip' and len(head) == 18 and head[3] & 4 and head[12:14] == b'BC':
+            compression = 'bgzf'
+
+        # Seekable zstd: seek table closed by its magic number
+        elif compression == 'zstd':
+            file.seek(max(file.seek(0, 2) - 4, 0))
+            if struct.unpack('<I', file.read(4).rjust(4, b'\x00'))[0] == ZSTD_SEEKABLE_MAGIC:
+                compression = 'zstd-seekable'
+
+    return compression
+
+def has_random_access(_filename):
+    """Function to check whether a file is read at any offset without decompressing it all
+
+    Arguments:
+        _filename {obj} -- file name, or file object (e.g. a reader returned by open_file)
+
+    Returns:
+        bool:random_access -- True for plain, BGZF and seekable zstd files
+    """
+    return get_compression(_filename) in RANDOM_ACCESS_COMPRESSIONS
+
+def strip_compressed_extension(_filename):
+    """Function to remove a compression extension from a file name ('mol.log.gz' -> 'mol.log')
+
+    Arguments:
+        _filename {str} -- file name
+
+    Returns:
+        str:filename -- file name without compression extension
+    """
+    for extension in COMPRESSED_EXTENSIONS:
+        if _filename.endswith(extension):
+            return _filename[:-len(extension)]
+    return _filename
+
+def import_zstandard():
+    """Function to import the optional zstandard package
+
+    Returns:
+        module:zstandard -- zstandard package
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise OSError('zstd compressed files need the zstandard package (pip install zstandard)')
+    return zstandard
+
+class BlockReader(io.RawIOBase):
+    """Random access reader of files made of independently compressed blocks
+
+    Blocks are given as (compressed offset, compressed size, uncompressed offset) lists, and
+    each read decompresses only the blocks holding the requested bytes.
+    """
+
+    def __init__(self, _filename, _blocks, _decompress_block):
+        super().__init__()
+        self._file = open(_filename, 'rb')
+        self._blocks = _blocks
+        self._uncompressed_offsets = [block[2] for block in _blocks]
+        self._decompress_block = _decompress_block
+        self._position = 0
+        self._block_index = None
+        self._block_data = b''
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, _offset, _whence=io.SEEK_SET):
+        if _whence == io.SEEK_CUR:
+            _offset += self._position
+        elif _whence == io.SEEK_END:
+            _offset += self._blocks[-1][2] + len(self._read_block(len(self._blocks) - 1)) \
+                if self._blocks else 0
+        self._position = max(_offset, 0)
+        return self._position
+
+    def _read_block(self, _block_index):
+        if _block_index != self._block_index:
+            compressed_offset, compressed_size, _ = self._blocks[_block_index]
+            self._file.seek(compressed_offset)
+            self._block_data = self._decompress_block(self._file.read(compressed_size))
+            self._block_index = _block_index
+        return self._block_data
+
+    def readinto(self, _buffer):
+        block_index = bisect_right(self._uncompressed_offsets, self._position) - 1
+        while block_index >= 0 and block_index < len(self._blocks):
+            block_data = self._read_block(block_index)
+            block_position = self._position - self._blocks[block_index][2]
+            if block_position < len(block_data):
+                size = min(len(_buffer), len(block_data) - block_position)
+                _buffer[:size] = block_data[block_position:block_position + size]
+                self._position += size
+                return size
+            block_index += 1
+        return 0
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+class ZstdStreamReader(io.RawIOBase):
+    """Streaming reader of zstd files, seeking backwards by restarting decompression"""
+
+    def __init__(self, _filename):
+        super().__init__()
+        self._filename = _filename
+        self._reader = None
+        self._position = 0
+        self._restart()
+
+    def _restart(self):
+        if self._reader is not None:
+            self._reader.close()
+        self._reader = import_zstandard().ZstdDecompressor().stream_reader(
+            open(self._filename, 'rb'), closefd=True)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, _offset, _whence=io.SEEK_SET):
+        if _whence == io.SEEK_CUR:
+            _offset += self._position
+        elif _whence == io.SEEK_END:
+            while self.read(COMPRESSED_BUFFER_SIZE):
+                pass
+            _offset += self._position
+        if _offset < self._position:
+            self._restart()
+        while self._position < _offset:
+            if not self.read(min(_offset - self._position, COMPRESSED_BUFFER_SIZE)):
+                break
+        return self._position
+
+    def readinto(self, _buffer):
+        size = self._reader.readinto(_buffer)
+        self._position += size
+        return size
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+        super().close()
+
+def get_bgzf_blocks(_filename):
+    """Function to index the blocks of a BGZF file from their headers
+
+    Arguments:
+        _filename {str} -- BGZF file name
+
+    Returns:
+        list:blocks -- (compressed offset, compressed size, uncompressed offset) of each block
+    """
+    blocks = []
+    compressed_offset = uncompressed_offset = 0
+
+    with open(_filename, 'rb') as file:
+        while True:
+            header = file.read(12)
+            if len(header) < 12:
+                break
+            extra = file.read(struct.unpack('<H', header[10:12])[0])
+
+            # 'BC' subfield holds the block size minus one
+            block_size = None
+            position = 0
+            while position + 4 <= len(extra):
+                subfield_length = struct.unpack('<H', extra[position + 2:position + 4])[0]
+                if extra[position:position + 2] == b'BC':
+                    block_size = struct.unpack('<H', extra[position + 4:position + 6])[0] + 1
+                position += 4 + subfield_length
+            if block_size is None:
+                raise OSError('{} is not a BGZF file'.format(_filename))
+
+            file.seek(compressed_offset + block_size - 4)
+            uncompressed_size = struct.unpack('<I', file.read(4))[0]
+            if uncompressed_size:
+                blocks.append((compressed_offset, block_size, uncompressed_offset))
+
+            compressed_offset += block_size
+            uncompressed_offset += uncompressed_size
+            file.seek(compressed_offset)
+
+    return blocks
+
+def get_zstd_seekable_frames(_filename):
+    """Function to read the seek table of a zstd seekable file
+
+    Arguments:
+        _filename {str} -- zstd seekable file name
+
+    Returns:
+        list:frames -- (compressed offset, compressed size, uncompressed offset) of each frame
+    """
+    with open(_filename, 'rb') as file:
+        file_size = file.seek(0, 2)
+        file.seek(file_size - 9)
+        frames_number, descriptor, _ = struct.unpack('<IBI', file.read(9))
+
+        entry_size = 12 if descriptor & 0x80 else 8
+        file.seek(file_size - 9 - frames_number * entry_size)
+        seek_table = file.read(frames_number * entry_size)
+
+    frames = []
+    compressed_offset = uncompressed_offset = 0
+    for frame_index in range(frames_number):
+        compressed_size, uncompressed_size = struct.unpack_from(
+            '<II', seek_table, frame_index * entry_size)
+        if uncompressed_size:
+            frames.append((compressed_offset, compressed_size, uncompressed_offset))
+        compressed_offset += compressed_size
+        uncompressed_offset += uncompressed_size
+
+    return frames
+
+def open_file(_filename, _mode='rb'):
+    """Function to open a plain or compressed file for reading
+
+    Arguments:
+        _filename {str} -- file name
+        _mode {str} -- 'rb' (binary) or 'rt' (text)
+
+    Returns:
+        file:file -- binary or text reader of the uncompressed content, with the detected
+                     compression as its 'compression' attribute (None for plain files)
+    """
+    compression = get_compression(_filename)
+
+    if compression is None:
+        file = open(_filename, _mode)
+        file.compression = compression
+        return file
+
+    if compression == 'gzip':
+        file = gzip.open(_filename, 'rb')
+    elif compression == 'bzip2':
+        file = bz2.open(_filename, 'rb')
+    elif compression == 'xz':
+        file = lzma.open(_filename, 'rb')
+    elif compression == 'bgzf':
+        file = io.BufferedReader(
+            BlockReader(_filename, get_bgzf_blocks(_filename),
+                        lambda _block: zlib.decompress(_block, 31)),
+            COMPRESSED_BUFFER_SIZE)
+    elif compression == 'zstd-seekable':
+        decompressor = import_zstandard().ZstdDecompressor()
+        file = io.BufferedReader(
+            BlockReader(_filename, get_zstd_seekable_frames(_filename),
+                        lambda _frame: decompressor.decompressobj().decompress(_frame)),
+            COMPRESSED_BUFFER_SIZE)
+    else:
+        file = io.BufferedReader(ZstdStreamReader(_filename), COMPRESSED_BUFFER_SIZE)
+
+    if _mode == 'rt':
+        file = io.TextIOWrapper(file)
+    file.compression = compression
+
+    return file
@@ -0,0 +1,834 @@
+####################################################################################################
+#                                                                                                  #
+#                                              g09.py                                              #
+#     Gaussian09 Log File reader (geometries, excited states and NTOs) shared by the g09 scripts   #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Log Files may be given as file names (plain or compressed), binary or text file objects, or      #
+# bytes buffers. Marker lines are located by compchemtools.scanner and orientation blocks are read #
+# at their byte offsets, the optimized ('opt') and last step ('-1') geometries being found reading #
+# backwards from the end of the Log File when it has random access.                                #
+#                                                                                                  #
+# Step options:                                                                                    #
+#               . 'opt': Optimized geometry, the first orientation block after the last            #
+#                        'Stationary point found' line (or the last block before it)               #
+#               . N:     Geometry of the N-th orientation block (0-based)                          #
+#               . -N:    Geometry of the N-th 'Step number' line counted from the end, i.e. the    #
+#                        last orientation block before it (-1: last optimization step)             #
+#               . slice: Slice of orientation blocks as a trajectory ('all' is slice(None))        #
+#                                                                                                  #
+# Reading backwards from the end of the Log File only speeds up 'opt' and -1, both paths select    #
+# the same orientation block (e.g. in scans and IRCs, where step numbers restart).                 #
+#                                                                                                  #
+# read_g09_log reads the geometry, excited states and NTO blocks of TD and NTO Log Files in one    #
+# pass, registering the compchemtools.scanner handlers of every requested artifact.                #
+#                                                                                                  #
+# NumPy is only imported when geometries are formatted, so importing this module stays fast.       #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Core tools for working with streams    ##
+import io
+##     Regular expression operations Module    ##
+import re
+##      Operating System Interfaces Module     ##
+from os import fspath
+##        Container datatypes Module           ##
+from collections import namedtuple
+##   Context managers utilities Module         ##
+from contextlib import contextmanager
+##       Array bisection algorithm Module      ##
+from bisect import bisect_left, bisect_right
+##     CompChemTools log scanner Module        ##
+from . import scanner, compressed, stats
+#################################################
+
+## Markers indexed in g09 Log Files (orientation keys match '-f' choices of get_g09_geom.py)
+G09_INDEX_MARKERS = {
+    'natoms': b'NAtoms',
+    'stationary': b'Stationary point found',
+    'step': b'Step number',
+    'input': b'Input orientation:',
+    'standard': b'Standard orientation:',
+    'zmat': b'Z-Matrix orientation:'
+}
+
+## Orientations of g09 geometries
+G09_ORIENTATIONS = ['input', 'standard', 'zmat']
+
+## Atomic Symbols indexed by Atomic Numbers (0: ghost atom, -1: dummy atom, -2: translation vector)
+ATOMIC_SYMBOLS = [
+    'Bq',
+    'H',   'He',  'Li',  'Be',  'B',   'C',   'N',   'O',   'F',   'Ne',  'Na',  'Mg',
+    'Al',  'Si',  'P',   'S',   'Cl',  'Ar',  'K',   'Ca',  'Sc',  'Ti',  'V',   'Cr',
+    'Mn',  'Fe',  'Co',  'Ni',  'Cu',  'Zn',  'Ga',  'Ge',  'As',  'Se',  'Br',  'Kr',
+    'Rb',  'Sr',  'Y',   'Zr',  'Nb',  'Mo',  'Tc',  'Ru',  'Rh',  'Pd',  'Ag',  'Cd',
+    'In',  'Sn',  'Sb',  'Te',  'I',   'Xe',  'Cs',  'Ba',  'La',  'Ce',  'Pr',  'Nd',
+    'Pm',  'Sm',  'Eu',  'Gd',  'Tb',  'Dy',  'Ho',  'Er',  'Tm',  'Yb',  'Lu',  'Hf',
+    'Ta',  'W',   'Re',  'Os',  'Ir',  'Pt',  'Au',  'Hg',  'Tl',  'Pb',  'Bi',  'Po',
+    'At',  'Rn',  'Fr',  'Ra',  'Ac',  'Th',  'Pa',  'U',   'Np',  'Pu',  'Am',  'Cm',
+    'Bk',  'Cf',  'Es',  'Fm',  'Md',  'No',  'Lr',  'Rf',  'Db',  'Sg',  'Bh',  'Hs',
+    'Mt',  'Ds',  'Rg',  'Cn',  'Uut', 'Fl',  'Uup', 'Lv',  'Uus', 'Uuo',
+    'Tv',  'X']
+
+## Geometry: atomic numbers (atoms,) and cartesian coordinates (atoms, 3) or (frames, atoms, 3)
+Geometry = namedtuple('Geometry', ['atomic_numbers', 'coordinates'])
+
+## Excited state: state number, spin/symmetry label (e.g. 'Singlet-A'), energy (eV), wavelength
+## (nm), oscillator strength, <S**2> and orbital excitations ((from, arrow, to, coefficient) tuples)
+ExcitedState = namedtuple('ExcitedState', ['state', 'label', 'energy', 'wavelength',
+                                           'oscillator_strength', 's2', 'excitations'])
+
+## NTO block: state number, NTO Log File name and byte span of the block
+NTOBlock = namedtuple('NTOBlock', ['state', 'g09_nto_file', 'start', 'end'])
+
+## Artifacts of g09 Log File read in a single pass (None when not requested): geometry (Geometry),
+## excited states (ExcitedState list), NTO blocks (NTOBlock list) and byte span of the last
+## orbitals section ((start, end) tuple, or None if it was not found)
+G09Log = namedtuple('G09Log', ['geometry', 'excited_states', 'nto_blocks', 'mo_span'])
+
+## Artifacts read by read_g09_log
+G09_ARTIFACTS = ['geometry', 'excited_states', 'ntos']
+
+## State number of NTO blocks, e.g. 'Alpha spin Natural Transition Orbitals for state  2'
+G09_NTO_STATE = re.compile(rb'for state\s+(\d+)')
+
+## Size of the chunks read from g09 Log Files (bytes)
+G09_CHUNK_SIZE = 4 * 1024 * 1024
+
+## Lines of orientation blocks before the first atom (marker, dashed and column title lines)
+G09_BLOCK_HEADER_LINES = 5
+
+class G09LogError(Exception):
+    """Error raised when the requested data cannot be obtained from a g09 Log File"""
+
+def parse_g09_step(_step):
+    """Function to convert a step option ('opt', 'all', 'N' or 'start:stop:stride')
+
+    Arguments:
+        _step {str} -- step option (integers and slices are returned unchanged)
+
+    Returns:
+        obj:step -- 'opt', step number (int) or slice of steps
+    """
+    if isinstance(_step, (int, slice)):
+        return _step
+
+    if _step.lower() == 'opt':
+        return 'opt'
+    if _step.lower() == 'all':
+        return slice(None)
+    if ':' in _step:
+        return slice(*[int(value) if value else None for value in _step.split(':')])
+
+    return int(_step)
+
+def get_g09_name(_g09_source):
+    """Function to name a g09 Log File source in error messages
+
+    Arguments:
+        _g09_source {obj} -- file name, file object or bytes buffer
+
+    Returns:
+        str:g09_name -- file name, or a description of the file object or buffer
+    """
+    if isinstance(_g09_source, (bytes, bytearray, memoryview)):
+        return '<bytes buffer>'
+    if hasattr(_g09_source, 'read'):
+        return str(getattr(_g09_source, 'name', '<file object>'))
+
+    return fspath(_g09_source)
+
+@contextmanager
+def open_g09_source(_g09_source):
+    """Function to open a g09 Log File source as a seekable binary reader ('with' statement)
+
+    File names are opened by compchemtools.compressed (and closed afterwards). Bytes buffers,
+    text file objects and non-seekable file objects are read into memory, seekable binary file
+    objects are used as given, from their beginning, and left open.
+
+    Arguments:
+        _g09_source {obj} -- file name, file object or bytes buffer
+
+    Yields:
+        file:file -- binary reader of g09 Log File
+    """
+    if isinstance(_g09_source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(_g09_source)
+
+    elif hasattr(_g09_source, 'read'):
+        if isinstance(_g09_source, io.TextIOBase):
+            yield io.BytesIO(_g09_source.read().encode('ascii', 'replace'))
+        elif not _g09_source.seekable():
+            yield io.BytesIO(_g09_source.read())
+        else:
+            yield _g09_source
+
+    else:
+        with compressed.open_file(fspath(_g09_source), 'rb') as file:
+            yield file
+
+def keep_g09_count_line(_count_lines, _marker_key, _line, _offset):
+    """Function to keep the first 'natoms' and the last 'step' marker lines met by the scanner
+
+    Arguments:
+        _count_lines {dict} -- (offset, line) of the kept marker lines, keyed by marker key
+        _marker_key {str} -- 'natoms' or 'step'
+        _line {bytes} -- marker line
+        _offset {int} -- byte offset of the marker line
+    """
+    if _marker_key == 'step' or _marker_key not in _count_lines:
+        _count_lines[_marker_key] = (_offset, _line)
+
+def scan_g09_file(_g09_log_file, _start_offset=0, _count_lines=None, _stats=None):
+    """Function to scan g09 Log File for marker lines in a single streaming pass
+
+    The Log File is read in binary chunks by compchemtools.scanner, searching all markers of
+    G09_INDEX_MARKERS at once, and only the byte offsets of marker lines are kept, so memory use
+    does not depend on file size.
+
+    Arguments:
+        _g09_log_file {obj} -- g09 Log File name, or seekable binary file object
+        _start_offset {int} -- byte offset of the line where the scan starts
+        _count_lines {dict} -- dict receiving the first 'natoms' and the last 'step' marker lines
+                               as (offset, line) pairs, so get_g09_counts reads them without
+                               seeking back in compressed streams, or None
+        _stats {dict} -- phase records of compchemtools.stats counting the scanned bytes, lines
+                         and markers in the 'index' phase, or None
+
+    Returns:
+        dict:marker_offsets -- byte offsets of marker lines, keyed by G09_INDEX_MARKERS keys
+        int:scanned_size -- byte offset after the last complete (newline ended) line
+    """
+    marker_offsets = {marker_key: [] for marker_key in G09_INDEX_MARKERS}
+
+    g09_handlers = {}
+    for marker_key, marker in G09_INDEX_MARKERS.items():
+        scanner.register_handler(
+            g09_handlers, marker,
+            lambda _line, _offset, _offsets=marker_offsets[marker_key]: _offsets.append(_offset))
+
+    if _count_lines is not None:
+        for marker_key in ('natoms', 'step'):
+            scanner.register_handler(
+                g09_handlers, G09_INDEX_MARKERS[marker_key],
+                lambda _line, _offset, _marker_key=marker_key:
+                    keep_g09_count_line(_count_lines, _marker_key, _line, _offset))
+
+    index_record = stats.get_phase_record(_stats, 'index')
+    scanned_size = scanner.scan_log_file(_g09_log_file, g09_handlers, _start_offset,
+                                         G09_CHUNK_SIZE, index_record)
+    stats.add_counts(index_record,
+                     _items=sum(len(offsets) for offsets in marker_offsets.values()))
+
+    return marker_offsets, scanned_size
+
+def read_g09_lines(_file, _offset, _lines_number):
+    """Function to read lines of g09 Log File starting at a byte offset
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _offset {int} -- byte offset of the first line
+        _lines_number {int} -- number of lines to be read
+
+    Returns:
+        list:g09_lines -- lines of g09 Log File as strings
+    """
+    g09_lines = []
+
+    _file.seek(_offset)
+    for _ in range(_lines_number):
+        line = _file.readline()
+        if not line:
+            break
+        g09_lines.append(line.decode('ascii', 'replace'))
+
+    return g09_lines
+
+def get_g09_count_line(_file, _offset, _count_lines, _marker_key):
+    """Function to obtain a marker line kept by scan_g09_file, or to read it from g09 Log File
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _offset {int} -- byte offset of the marker line
+        _count_lines {dict} -- marker lines kept by scan_g09_file, or None
+        _marker_key {str} -- 'natoms' or 'step'
+
+    Returns:
+        str:g09_line -- marker line
+    """
+    if _count_lines is not None and _count_lines.get(_marker_key, (None,))[0] == _offset:
+        return _count_lines[_marker_key][1].decode('ascii', 'replace')
+
+    return read_g09_lines(_file, _offset, 1)[0]
+
+def get_g09_counts(_file, _marker_offsets, _count_lines=None):
+    """Function to read the number of atoms and of optimization steps of g09 Log File
+
+    Marker lines kept by scan_g09_file are used instead of being read again, which would
+    restart the decompression of compressed streams.
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _marker_offsets {dict} -- byte offsets of marker lines (scan_g09_file)
+        _count_lines {dict} -- marker lines kept by scan_g09_file, or None
+
+    Returns:
+        int:atoms_number -- number of atoms, or None if 'NAtoms' was not found
+        int:total_steps -- number of the last optimization step, or None if no step was found
+    """
+    atoms_number, total_steps = None, None
+
+    if _marker_offsets['natoms']:
+        atoms_number = int(get_g09_count_line(_file, _marker_offsets['natoms'][0], _count_lines,
+                                              'natoms').strip().split()[1])
+
+    if _marker_offsets['step']:
+        total_steps = int(get_g09_count_line(_file, _marker_offsets['step'][-1], _count_lines,
+                                             'step').strip().split()[2])
+
+    return atoms_number, total_steps
+
+def select_g09_block(_g09_index, _step, _orientation, _g09_name):
+    """Function to select the orientation block of a g09 geometry
+
+    Arguments:
+        _g09_index {dict} -- byte offsets of g09 Log File marker lines ('offsets'), atoms and
+                             steps numbers
+        _step {obj} -- 'opt' or step number (negative numbers count from the last step)
+        _orientation {str} -- orientation ('input', 'standard' or 'zmat')
+        _g09_name {str} -- g09 Log File name (error messages)
+
+    Returns:
+        int:block_offset -- byte offset of the orientation header line
+    """
+    orientation_offsets = _g09_index['offsets'][_orientation]
+
+    if _g09_index['atoms_number'] is None:
+        raise G09LogError(
+            '> Number of atoms was not found in {} Gaussian09 output.'.format(_g09_name))
+
+    if _step == 'opt':
+        stationary_offsets = _g09_index['offsets']['stationary']
+
+        if not stationary_offsets:
+            raise G09LogError(
+                '> Stationary point was not found in {} Gaussian09 output.'.format(_g09_name))
+
+        # First block after the last stationary point, or the last block before it
+        block_index = bisect_right(orientation_offsets, stationary_offsets[-1])
+        if block_index == len(orientation_offsets):
+            block_index -= 1
+
+        if block_index < 0:
+            raise G09LogError(
+                '> Optimized geometry was not found in {} Gaussian09 output.'.format(_g09_name))
+
+        return orientation_offsets[block_index]
+
+    if _step >= 0:
+        if _step >= len(orientation_offsets):
+            raise G09LogError(
+                '> Step {} was not found in {} Gaussian09 output.'.format(_step, _g09_name))
+
+        return orientation_offsets[_step]
+
+    step_offsets = _g09_index['offsets']['step']
+
+    if not step_offsets:
+        raise G09LogError(
+            '> Step number was not found in {} Gaussian09 output.'.format(_g09_name))
+
+    if -_step > len(step_offsets):
+        raise G09LogError(
+            '> Step {} was not found in {} steps of {} Gaussian09 output.'
+                .format(_step, len(step_offsets), _g09_name))
+
+    # Last block before the selected 'Step number' line
+    block_index = bisect_left(orientation_offsets, step_offsets[_step]) - 1
+
+    if block_index < 0:
+        raise G09LogError(
+            '> Step {} was not found in {} Gaussian09 output.'.format(_step, _g09_name))
+
+    return orientation_offsets[block_index]
+
+def read_g09_trajectory(_file, _block_offsets, _atoms_number, _g09_name):
+    """Function to read the atom lines of several orientation blocks
+
+    The blocks are read in file order by a single forward pass over g09 Log File, seeking from
+    one block to the next.
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _block_offsets {list} -- byte offsets of the orientation header lines
+        _atoms_number {int} -- number of atoms
+        _g09_name {str} -- g09 Log File name (error messages)
+
+    Returns:
+        str:g09_raw_trajectory -- lines of chosen geometries
+    """
+    if _atoms_number is None:
+        raise G09LogError(
+            '> Number of atoms was not found in {} Gaussian09 output.'.format(_g09_name))
+
+    if not _block_offsets:
+        raise G09LogError('> No steps were found in {} Gaussian09 output.'.format(_g09_name))
+
+    raw_blocks = []
+    for block_offset in _block_offsets:
+        _file.seek(block_offset)
+        for _ in range(G09_BLOCK_HEADER_LINES):
+            _file.readline()
+        raw_blocks.extend(_file.readline() for _ in range(_atoms_number))
+
+    return b''.join(raw_blocks).decode('ascii', 'replace')
+
+def rfind_g09_line(_file, _marker, _end_offset):
+    """Function to find the last g09 Log File line containing a marker, reading backwards
+
+    The Log File is read in chunks from the end offset towards its beginning, so only the
+    region after the found line is read.
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _marker {bytes} -- marker to be found
+        _end_offset {int} -- byte offset where the backward search starts
+
+    Returns:
+        int:line_offset -- byte offset of the found line, or None if the marker was not found
+    """
+    chunk_end = _end_offset
+    carry = b''
+
+    while chunk_end > 0:
+        chunk_start = max(chunk_end - G09_CHUNK_SIZE, 0)
+        _file.seek(chunk_start)
+        buffer = _file.read(chunk_end - chunk_start) + carry
+
+        # The first (partial) line of the buffer goes to the next chunk
+        scan_start = 0
+        if chunk_start > 0:
+            scan_start = buffer.find(b'\n') + 1
+            if scan_start == 0:
+                carry = buffer
+                chunk_end = chunk_start
+                continue
+
+        position = buffer.rfind(_marker, scan_start)
+        if position != -1:
+            return chunk_start + buffer.rfind(b'\n', 0, position) + 1
+
+        carry = buffer[:scan_start]
+        chunk_end = chunk_start
+
+    return None
+
+def find_g09_line(_file, _marker, _start_offset):
+    """Function to find the first g09 Log File line containing a marker, reading forwards
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _marker {bytes} -- marker to be found
+        _start_offset {int} -- byte offset of the line where the forward search starts
+
+    Returns:
+        int:line_offset -- byte offset of the found line, or None if the marker was not found
+    """
+    _file.seek(_start_offset)
+    chunk_start = _start_offset
+    carry = b''
+
+    for chunk in iter(lambda: _file.read(G09_CHUNK_SIZE), b''):
+        # The buffer starts at a line start, its last (partial) line goes to the next chunk
+        buffer = carry + chunk
+        buffer_start = chunk_start - len(carry)
+
+        position = buffer.find(_marker)
+        if position != -1:
+            return buffer_start + buffer.rfind(b'\n', 0, position) + 1
+
+        carry = buffer[buffer.rfind(b'\n') + 1:]
+        chunk_start += len(chunk)
+
+    return None
+
+def read_g09_block(_file, _block_offset, _g09_name):
+    """Function to read an orientation block of g09 Log File up to its closing dashed line
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode
+        _block_offset {int} -- byte offset of the orientation header line
+        _g09_name {str} -- g09 Log File name (error messages)
+
+    Returns:
+        str:g09_raw_geometry -- lines of the geometry
+        int:atoms_number -- number of atoms
+    """
+    _file.seek(_block_offset)
+    for _ in range(G09_BLOCK_HEADER_LINES):
+        _file.readline()
+
+    raw_block = []
+    for line in iter(_file.readline, b''):
+        if line.lstrip().startswith(b'---'):
+            return b''.join(raw_block).decode('ascii', 'replace'), len(raw_block)
+        raw_block.append(line)
+
+    raise G09LogError(
+        '> Geometry in {} Gaussian09 output is truncated or malformed.'.format(_g09_name))
+
+def get_g09_tail_geometry(_file, _step, _orientation, _g09_name):
+    """Function to obtaining the optimized ('opt') or last step (-1) geometry from file end
+
+    The optimized geometry is the first orientation block after the last 'Stationary point found'
+    line (or the last block before it), the last step geometry is the last orientation block
+    before the last 'Step number' line, as select_g09_block selects them. Both are found reading
+    g09 Log File backwards from its end, without indexing the whole file.
+
+    Arguments:
+        _file {obj} -- g09 Log File opened in binary mode (with random access)
+        _step {obj} -- 'opt' or -1
+        _orientation {str} -- orientation ('input', 'standard' or 'zmat')
+        _g09_name {str} -- g09 Log File name (error messages)
+
+    Returns:
+        str:g09_raw_geometry -- lines of chosen geometry
+        int:atoms_number -- number of atoms
+    """
+    orientation_marker = G09_INDEX_MARKERS[_orientation]
+    file_size = _file.seek(0, 2)
+
+    if _step == 'opt':
+        stationary_offset = rfind_g09_line(_file, G09_INDEX_MARKERS['stationary'], file_size)
+
+        if stationary_offset is None:
+            raise G09LogError(
+                '> Stationary point was not found in {} Gaussian09 output.'.format(_g09_name))
+
+        block_offset = find_g09_line(_file, orientation_marker, stationary_offset)
+        if block_offset is None:
+            block_offset = rfind_g09_line(_file, orientation_marker, stationary_offset)
+
+        if block_offset is None:
+            raise G09LogError(
+                '> Optimized geometry was not found in {} Gaussian09 output.'.format(_g09_name))
+
+    else:
+        step_offset = rfind_g09_line(_file, G09_INDEX_MARKERS['step'], file_size)
+
+        if step_offset is None:
+            raise G09LogError(
+                '> Step number was not found in {} Gaussian09 output.'.format(_g09_name))
+
+        block_offset = rfind_g09_line(_file, orientation_marker, step_offset)
+
+        if block_offset is None:
+            raise G09LogError(
+                '> Step {} was not found in {} Gaussian09 output.'.format(_step, _g09_name))
+
+    return read_g09_block(_file, block_offset, _g09_name)
+
+def format_g09_geometry(_g09_raw_geometry, _atoms_number, _trajectory, _g09_name):
+    """Function to format g09 geometry, or trajectory, parsing all lines in bulk
+
+    Arguments:
+        _g09_raw_geometry {str} -- chosen geometry (or geometries) read from g09 log file
+        _atoms_number {int} -- number of atoms
+        _trajectory {bool} -- keep the frames axis of coordinates
+        _g09_name {str} -- g09 Log File name (error messages)
+
+    Returns:
+        Geometry:geometry -- atomic numbers and cartesian coordinates
+    """
+    import numpy as np
+
+    # Columns: center, atomic number, atomic type, x, y, z
+    raw_geometry = np.fromstring(_g09_raw_geometry, dtype=float, sep=' ')
+
+    if raw_geometry.size == 0 or raw_geometry.size % (6 * _atoms_number) != 0:
+        raise G09LogError(
+            '> Geometry in {} Gaussian09 output is truncated or malformed.'.format(_g09_name))
+
+    raw_geometry = raw_geometry.reshape(-1, _atoms_number, 6)
+
+    coordinates = raw_geometry[:, :, 3:]
+    if not _trajectory:
+        coordinates = coordinates[0]
+
+    return Geometry(atomic_numbers=raw_geometry[0, :, 1].astype(int),
+                    coordinates=np.ascontiguousarray(coordinates))
+
+def format_xyz_geometry(_g09_geometry, _title=''):
+    """Function to format the '.xyz' text, with one frame per geometry, in a single operation
+
+    Arguments:
+        _g09_geometry {Geometry} -- formatted geometry (or trajectory)
+        _title {str} -- comment line of each frame
+
+    Returns:
+        str:xyz_text -- geometry in XYZ format
+    """
+    import numpy as np
+
+    atoms_number = len(_g09_geometry.atomic_numbers)
+    coordinates = _g09_geometry.coordinates.reshape(-1, atoms_number, 3)
+    frames_number = len(coordinates)
+
+    xyz_columns = np.empty((frames_number, atoms_number, 4), dtype=object)
+    xyz_columns[:, :, 0] = np.array(ATOMIC_SYMBOLS)[_g09_geometry.atomic_numbers]
+    xyz_columns[:, :, 1:] = coordinates
+
+    frame_format = '{}\n{}\n'.format(atoms_number, _title.replace('%', '%%')) \
+        + '%s\t%10.6f\t%10.6f\t%10.6f\n' * atoms_number
+
+    return (frame_format * frames_number) % tuple(xyz_columns.ravel())
+
+def get_g09_geometry(_g09_log, _step='opt', _orientation='input'):
+    """Function to obtain a geometry, or trajectory, from a g09 Optimization Log File in memory
+
+    Optimized and last step geometries are read backwards from the end of Log Files with random
+    access (plain files, BGZF and seekable zstd files, bytes buffers and seekable file objects),
+    other steps are read after indexing the marker lines of the Log File.
+
+    Arguments:
+        _g09_log {obj} -- g09 Log File name (plain or compressed), binary or text file object,
+                          or bytes buffer
+        _step {obj} -- 'opt', step number, slice of steps, or their get_g09_geom.py options
+                       ('N', 'all' or 'start:stop:stride')
+        _orientation {str} -- orientation ('input', 'standard' or 'zmat')
+
+    Returns:
+        Geometry:geometry -- atomic numbers (atoms,) and cartesian coordinates, (atoms, 3) or
+                             (frames, atoms, 3) for slices of steps
+    """
+    step = parse_g09_step(_step)
+    g09_name = get_g09_name(_g09_log)
+
+    if _orientation not in G09_ORIENTATIONS:
+        raise ValueError('invalid orientation {}'.format(_orientation))
+
+    with open_g09_source(_g09_log) as file:
+        if (step == 'opt' or step == -1) and compressed.has_random_access(file):
+            g09_raw_geometry, atoms_number = get_g09_tail_geometry(file, step, _orientation,
+                                                                   g09_name)
+
+        else:
+            count_lines = {}
+            marker_offsets, _ = scan_g09_file(file, _count_lines=count_lines)
+            atoms_number, total_steps = get_g09_counts(file, marker_offsets, count_lines)
+            g09_index = {'offsets': marker_offsets,
+                         'atoms_number': atoms_number,
+                         'total_steps': total_steps}
+
+            if isinstance(step, slice):
+                g09_raw_geometry = read_g09_trajectory(
+                    file, marker_offsets[_orientation][step], atoms_number, g09_name)
+            else:
+                block_offset = select_g09_block(g09_index, step, _orientation, g09_name)
+                g09_lines = read_g09_lines(file, block_offset,
+                                           G09_BLOCK_HEADER_LINES + atoms_number)
+                g09_raw_geometry = ''.join(g09_lines[G09_BLOCK_HEADER_LINES:])
+
+    return format_g09_geometry(g09_raw_geometry, atoms_number, isinstance(step, slice), g09_name)
+
+def parse_excited_state_line(_line):
+    """Function to parse an 'Excited State' line of g09 Log File
+
+    Arguments:
+        _line {str} -- 'Excited State   1:      Singlet-A      5.7050 eV  217.33 nm  f=0.1021 ...'
+
+    Returns:
+        ExcitedState:excited_state -- excited state without orbital excitations
+    """
+    fields = _line.split()
+
+    oscillator_strength = float('nan')
+    s2 = float('nan')
+    for field in fields[8:]:
+        if field.startswith('f='):
+            oscillator_strength = float(field[2:])
+        elif field.startswith('<S**2>='):
+            s2 = float(field[7:])
+
+    return ExcitedState(state=int(fields[2].rstrip(':')),
+                        label=fields[3],
+                        energy=float(fields[4]),
+                        wavelength=float(fields[6]),
+                        oscillator_strength=oscillator_strength,
+                        s2=s2,
+                        excitations=[])
+
+def parse_g09_excited_states(_sections):
+    """Function to parse the excited states sections found by compchemtools.scanner
+
+    Malformed 'Excited State' lines are skipped, orbital excitations are sorted by decreasing
+    coefficient magnitude (dominant excitations first).
+
+    Arguments:
+        _sections {list} -- (offset, lines) of each excited state ('g09_excited_states' result of
+                            scanner.add_g09_td_handlers)
+
+    Returns:
+        list:excited_states -- excited states (ExcitedState) in file order
+    """
+    excited_states = []
+
+    for _, section_lines in _sections:
+        try:
+            excited_state = parse_excited_state_line(section_lines[0].decode('ascii', 'replace'))
+        except (IndexError, ValueError):
+            continue
+        for line in section_lines[1:]:
+            excitation = scanner.G09_EXCITATION.match(line)
+            excited_state.excitations.append(
+                (excitation.group(1).decode('ascii'), excitation.group(2).decode('ascii'),
+                 excitation.group(3).decode('ascii'), float(excitation.group(4))))
+        excited_state.excitations.sort(key=lambda excitation: -abs(excitation[3]))
+        excited_states.append(excited_state)
+
+    return excited_states
+
+def get_g09_nto_blocks(_g09_results, _g09_name):
+    """Function to pair the NTO blocks found by compchemtools.scanner with their states
+
+    Arguments:
+        _g09_results {dict} -- scanner results ('g09_nto_blocks' of scanner.add_g09_nto_handlers)
+        _g09_name {str} -- g09 Log File name
+
+    Returns:
+        list:nto_blocks -- NTO blocks (NTOBlock) in file order
+    """
+    nto_blocks = []
+
+    for block_index, (start, end, line) in enumerate(_g09_results['g09_nto_blocks']):
+        state = G09_NTO_STATE.search(line)
+        nto_blocks.append(NTOBlock(state=int(state.group(1)) if state else block_index + 1,
+                                   g09_nto_file=_g09_name,
+                                   start=start,
+                                   end=end))
+
+    return nto_blocks
+
+def get_g09_mo_span(_g09_results):
+    """Function to obtain the last orbitals section found by compchemtools.scanner
+
+    Arguments:
+        _g09_results {dict} -- scanner results ('g09_mo_start' and 'g09_mo_end' of
+                               scanner.add_g09_nto_handlers)
+
+    Returns:
+        tuple:mo_span -- (end offset of the last 'Molecular Orbital Coefficients' line, start
+                         offset of the following 'Density Matrix' line), or None if either line
+                         was not found
+    """
+    if not _g09_results['g09_mo_start']:
+        return None
+
+    mo_start = _g09_results['g09_mo_start'][-1]
+    mo_end = next((offset for offset in _g09_results['g09_mo_end'] if offset >= mo_start), None)
+
+    return None if mo_end is None else (mo_start, mo_end)
+
+def select_g09_geometry(_g09_results, _step, _orientation, _g09_name):
+    """Function to select a geometry, or trajectory, among the orientation blocks found by
+    compchemtools.scanner
+
+    Steps are selected as get_g09_geometry selects them, from the kept blocks instead of reading
+    them again from g09 Log File.
+
+    Arguments:
+        _g09_results {dict} -- scanner results (scanner.add_g09_geometry_handlers)
+        _step {obj} -- 'opt', step number or slice of steps
+        _orientation {str} -- orientation ('input', 'standard' or 'zmat')
+        _g09_name {str} -- g09 Log File name (error messages)
+
+    Returns:
+        Geometry:geometry -- atomic numbers and cartesian coordinates
+    """
+    g09_blocks = _g09_results['g09_geometries']
+
+    if not g09_blocks:
+        raise G09LogError('> No steps were found in {} Gaussian09 output.'.format(_g09_name))
+
+    # Atom lines follow the header lines of orientation blocks
+    atoms_number = len(g09_blocks[0][1]) - G09_BLOCK_HEADER_LINES
+
+    if isinstance(_step, slice):
+        block_lines = [lines for _, lines in g09_blocks[_step]]
+        if not block_lines:
+            raise G09LogError('> No steps were found in {} Gaussian09 output.'.format(_g09_name))
+    else:
+        g09_index = {'offsets': {'stationary': _g09_results['g09_stationary'],
+                                 'step': _g09_results['g09_step'],
+                                 _orientation: [offset for offset, _ in g09_blocks]},
+                     'atoms_number': atoms_number}
+        block_offset = select_g09_block(g09_index, _step, _orientation, _g09_name)
+        block_lines = [dict(g09_blocks)[block_offset]]
+
+    g09_raw_geometry = b''.join(line for lines in block_lines
+                                for line in lines[G09_BLOCK_HEADER_LINES:])
+
+    return format_g09_geometry(g09_raw_geometry.decode('ascii', 'replace'), atoms_number,
+                               isinstance(_step, slice), _g09_name)
+
+def read_g09_log(_g09_log, _artifacts=G09_ARTIFACTS, _step='opt', _orientation='input'):
+    """Function to read geometry, excited states and NTO blocks of g09 Log File in a single pass
+
+    The compchemtools.scanner handlers of all requested artifacts are registered on one streaming
+    pass over the Log File, so TD and NTO outputs are not read once per artifact. Orientation
+    blocks are kept in memory until the geometry is selected, get_g09_geometry remains the
+    faster reader of geometries alone.
+
+    Arguments:
+        _g09_log {obj} -- g09 Log File name (plain or compressed), binary or text file object,
+                          or bytes buffer
+        _artifacts {list} -- artifacts to be read ('geometry', 'excited_states' and 'ntos')
+        _step {obj} -- step of the geometry, as in get_g09_geometry
+        _orientation {str} -- orientation of the geometry ('input', 'standard' or 'zmat')
+
+    Returns:
+        G09Log:g09_log -- geometry, excited states, NTO blocks and last orbitals section, None
+                          for artifacts not requested
+    """
+    step = parse_g09_step(_step)
+    g09_name = get_g09_name(_g09_log)
+
+    if _orientation not in G09_ORIENTATIONS:
+        raise ValueError('invalid orientation {}'.format(_orientation))
+    invalid_artifacts = sorted(set(_artifacts) - set(G09_ARTIFACTS))
+    if invalid_artifacts:
+        raise ValueError('invalid artifacts {}'.format(', '.join(invalid_artifacts)))
+
+    g09_results = {}
+    g09_handlers = {}
+    if 'geometry' in _artifacts:
+        scanner.add_g09_geometry_handlers(g09_handlers, g09_results, _orientation)
+    if 'excited_states' in _artifacts:
+        scanner.add_g09_td_handlers(g09_handlers, g09_results)
+    if 'ntos' in _artifacts:
+        scanner.add_g09_nto_handlers(g09_handlers, g09_results)
+
+    with open_g09_source(_g09_log) as file:
+        scanner.scan_log_file(file, g09_handlers, _chunk_size=G09_CHUNK_SIZE)
+
+    g09_geometry, excited_states, nto_blocks, mo_span = None, None, None, None
+    if 'geometry' in _artifacts:
+        g09_geometry = select_g09_geometry(g09_results, step, _orientation, g09_name)
+    if 'excited_states' in _artifacts:
+        excited_states = parse_g09_excited_states(g09_results['g09_excited_states'])
+    if 'ntos' in _artifacts:
+        nto_blocks = get_g09_nto_blocks(g09_results, g09_name)
+        mo_span = get_g09_mo_span(g09_results)
+
+    return G09Log(geometry=g09_geometry,
+                  excited_states=excited_states,
+                  nto_blocks=nto_blocks,
+                  mo_span=mo_span)
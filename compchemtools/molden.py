@@ -0,0 +1,943 @@
+####################################################################################################
+#                                                                                                  #
+#                                            molden.py                                             #
+#          Molden file reader shared by clean_orca_nto.py and get_molden_active_space.py           #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Sections:                                                                                        #
+#               . '[Atoms]': Atomic symbols, atomic numbers and coordinates                        #
+#               . '[GTO]':   Contracted gaussian shells of each atom                               #
+#               . '[MO]':    Molecular orbitals (Sym, Ene, Spin, Occup and coefficients)           #
+#                                                                                                  #
+# NumPy archive output: selected orbitals may be exported as a '.npz' archive holding an           #
+# (orbitals, basis) 'coefficients' matrix and 'energies', 'occupations', 'spins' and 'symmetries'  #
+# vectors. Uncompressed archives are memory-mapped by load_molden_npz.                             #
+#                                                                                                  #
+# Molecular orbitals keep the character span of their block in the Molden text, so filtered        #
+# Molden files are written by copying the original blocks. Molden files may also be memory-mapped  #
+# and indexed as bytes, giving random access to orbital blocks without decoding the whole file.    #
+# Orbital block spans are kept in '<MOLDEN-FILE>.moldenidx' by get_molden_index, validated by file #
+# size and modification time, so later runs skip the scan of the '[MO]' section.                   #
+#                                                                                                  #
+# Shared header output: sets of Molden files with the same header (everything up to '[MO]') are    #
+# written as a single 'molden.<HASH>.header' file plus compact '<MOLDEN-FILE>.mos' files, whose    #
+# first line ('[Header] molden.<HASH>.header') refers to the header, followed by orbital blocks.   #
+#                                                                                                  #
+# In-memory selection: format_molden_file (active space) and format_nto_molden_file (NTOs) read    #
+# Molden files given as file names, file objects or bytes buffers and return the selected orbitals #
+# with their coefficients, as get_molden_active_space.py and clean_orca_nto.py select them.        #
+# read_molden parses whole Molden files ('[Atoms]', '[GTO]' and coefficients of every orbital);    #
+# parsed headers are cached by hash, for the last MOLDEN_HEADER_CACHE_SIZE headers.                #
+#                                                                                                  #
+# NumPy is only imported when coefficients are parsed, orbitals are selected or archives are       #
+# written and loaded, so indexing Molden files and copying raw orbital blocks stay fast.           #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##     Regular expression operations Module    ##
+import re
+##        Container datatypes Module           ##
+from collections import namedtuple
+##      Operating System Interfaces Module     ##
+from os import path, replace, remove, getpid, fspath, stat
+##      Secure hashes and digests Module       ##
+import hashlib
+##     Memory-mapped file support Module       ##
+import mmap
+##           JSON encoder and decoder          ##
+import json
+##       Work with ZIP archives Module         ##
+import zipfile
+##  CompChemTools compressed files Module      ##
+from . import compressed, stats
+#################################################
+
+## Section title lines, e.g. '[Atoms] AU'
+MOLDEN_SECTION = r'^[ \t]*\[([^\]]+)\][^\n]*\n?'
+
+## Header lines of a molecular orbital block ('Sym=', 'Ene=', 'Spin=' and 'Occup=')
+MOLDEN_MO_HEADER = r'(?:^[ \t]*(?:Sym|Ene|Spin|Occup)[ \t]*=[^\n]*\n?)+'
+MOLDEN_MO_KEY = r'^[ \t]*(\w+)[ \t]*=[ \t]*(\S*)'
+
+## Coefficient lines of a molecular orbital block ('<BASIS-FUNCTION> <COEFFICIENT>')
+MOLDEN_COEFFICIENT_LINE = re.compile(r'^\s*\d+\s+[-+]?(\d+\.?\d*|\.\d+)([EeDd][-+]?\d+)?\s*$')
+
+## Compiled patterns for Molden texts (str) and for Molden bytes (bytes or mmap)
+MOLDEN_PATTERNS = {
+    str: {
+        'section': re.compile(MOLDEN_SECTION, re.M),
+        'mo_header': re.compile(MOLDEN_MO_HEADER, re.M | re.I),
+        'mo_key': re.compile(MOLDEN_MO_KEY, re.M)
+    },
+    bytes: {
+        'section': re.compile(MOLDEN_SECTION.encode('ascii'), re.M),
+        'mo_header': re.compile(MOLDEN_MO_HEADER.encode('ascii'), re.M | re.I),
+        'mo_key': re.compile(MOLDEN_MO_KEY.encode('ascii'), re.M)
+    }
+}
+
+## Parsed '[Atoms]' and '[GTO]' sections, keyed by header hash, of the last headers parsed
+MOLDEN_HEADER_CACHE = {}
+MOLDEN_HEADER_CACHE_SIZE = 16
+
+## Shared header files ('molden.<HASH>.header') and compact orbital files ('<MOLDEN-FILE>.mos')
+MOLDEN_SHARED_HEADER = 'molden.{}.header'
+MOLDEN_SHARED_EXTENSION = '.mos'
+MOLDEN_SHARED_REFERENCE = '[Header]'
+
+## Occupation tolerance of empty and fully occupied orbitals (active space detection)
+CAS_OCCUPATION_TOLERANCE = 0.000001
+
+## On-disk index of orbital blocks ('<MOLDEN-FILE>.moldenidx'), keyed on file size and mtime
+MOLDEN_INDEX_EXTENSION = '.moldenidx'
+MOLDEN_INDEX_VERSION = 1
+
+## Arrays of Molden NumPy archives ('<MOLDEN-FILE>.npz')
+MOLDEN_NPZ_ARRAYS = ['coefficients', 'energies', 'occupations', 'spins', 'symmetries']
+
+## Molden file: header text (up to the '[MO]' line), atoms, basis shells and molecular orbitals
+Molden = namedtuple('Molden', ['header', 'atoms', 'shells', 'orbitals'])
+
+## Atoms: symbols (list), atomic numbers (atoms,), coordinates (atoms, 3) and units ('AU'/'Angs')
+MoldenAtoms = namedtuple('MoldenAtoms', ['symbols', 'atomic_numbers', 'coordinates', 'units'])
+
+## Contracted shell: atom number, shell type ('s', 'p', 'sp', ...), exponents (primitives,)
+## and contraction coefficients (primitives, 1), or (primitives, 2) for 'sp' shells
+MoldenShell = namedtuple('MoldenShell', ['atom', 'shell_type', 'exponents', 'contraction'])
+
+## Molecular orbital: Sym, Ene, Spin and Occup values, coefficients (basis,) or None when only
+## metadata was scanned, and (start, end) character span of the block in the Molden text
+MolecularOrbital = namedtuple('MolecularOrbital',
+                              ['symmetry', 'energy', 'spin', 'occupation', 'coefficients', 'span'])
+
+def read_molden_file(_molden_filename):
+    """Function to read a Molden File
+
+    Arguments:
+        _molden_filename {str} -- Molden File name (plain or compressed)
+
+    Returns:
+        str:molden_text -- Molden File text
+    """
+    with compressed.open_file(_molden_filename, 'rt') as file:
+        return file.read()
+
+def read_molden_source(_molden_source):
+    """Function to read a Molden File given as file name, file object or bytes buffer
+
+    Arguments:
+        _molden_source {obj} -- Molden File name (plain or compressed), binary or text file
+                                object, or bytes buffer
+
+    Returns:
+        str:molden_text -- Molden File text
+    """
+    if isinstance(_molden_source, (bytes, bytearray, memoryview)):
+        return bytes(_molden_source).decode('utf-8', 'replace')
+
+    if hasattr(_molden_source, 'read'):
+        molden_text = _molden_source.read()
+        if isinstance(molden_text, str):
+            return molden_text
+        return molden_text.decode('utf-8', 'replace')
+
+    return read_molden_file(fspath(_molden_source))
+
+def open_molden_mmap(_molden_filename):
+    """Function to memory-map a Molden File (read-only)
+
+    Compressed Molden Files cannot be memory-mapped, their decompressed bytes are returned.
+
+    Arguments:
+        _molden_filename {str} -- Molden File name (plain or compressed)
+
+    Returns:
+        mmap:molden_map -- Molden File bytes, accepted by the parsing functions as Molden text
+    """
+    if compressed.get_compression(_molden_filename) is not None:
+        with compressed.open_file(_molden_filename, 'rb') as file:
+            return file.read()
+
+    with open(_molden_filename, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def get_molden_patterns(_molden_text):
+    """Function to select the compiled patterns for a Molden text (str) or bytes (bytes, mmap)
+
+    Arguments:
+        _molden_text {str} -- Molden File text or bytes
+
+    Returns:
+        dict:molden_patterns -- compiled regular expressions
+    """
+    return MOLDEN_PATTERNS[str if isinstance(_molden_text, str) else bytes]
+
+def decode_molden_text(_molden_text):
+    """Function to decode Molden bytes into text (str is returned unchanged)
+
+    Arguments:
+        _molden_text {str} -- Molden File text or bytes
+
+    Returns:
+        str:molden_text -- Molden File text
+    """
+    if isinstance(_molden_text, str):
+        return _molden_text
+    return bytes(_molden_text).decode('ascii', 'replace')
+
+def find_molden_sections(_molden_text):
+    """Function to find the sections of a Molden File
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+
+    Returns:
+        dict:molden_sections -- (title start, body start, end) offsets of each section,
+                                keyed by lower case section name
+    """
+    molden_sections = {}
+
+    section_matches = list(get_molden_patterns(_molden_text)['section'].finditer(_molden_text))
+    section_ends = [match.start() for match in section_matches[1:]] + [len(_molden_text)]
+
+    for match, section_end in zip(section_matches, section_ends):
+        section_name = decode_molden_text(match.group(1)).strip().lower()
+        molden_sections[section_name] = (match.start(), match.end(), section_end)
+
+    return molden_sections
+
+def parse_molden_atoms(_molden_text, _molden_section):
+    """Function to parse the '[Atoms]' section of a Molden File
+
+    Arguments:
+        _molden_text {str} -- Molden File text
+        _molden_section {tuple} -- character offsets of '[Atoms]' section
+
+    Returns:
+        MoldenAtoms:molden_atoms -- atomic symbols, numbers and coordinates
+    """
+    import numpy as np
+
+    section_start, body_start, section_end = _molden_section
+
+    title_line = decode_molden_text(_molden_text[section_start:body_start]).lower()
+    units = 'AU' if 'au' in title_line.split(']')[-1] else 'Angs'
+
+    # Columns: symbol, atom number, atomic number, x, y, z
+    atoms_fields = decode_molden_text(_molden_text[body_start:section_end]).split()
+    atoms_fields = np.array(atoms_fields, dtype=object)
+    atoms_fields = atoms_fields.reshape(-1, 6)
+
+    return MoldenAtoms(symbols=list(atoms_fields[:, 0]),
+                       atomic_numbers=atoms_fields[:, 2].astype(int),
+                       coordinates=atoms_fields[:, 3:].astype(float),
+                       units=units)
+
+def parse_molden_gto(_molden_text, _molden_section):
+    """Function to parse the '[GTO]' section of a Molden File
+
+    Arguments:
+        _molden_text {str} -- Molden File text
+        _molden_section {tuple} -- character offsets of '[GTO]' section
+
+    Returns:
+        list:molden_shells -- contracted shells (MoldenShell) in file order
+    """
+    import numpy as np
+
+    _, body_start, section_end = _molden_section
+    gto_lines = decode_molden_text(_molden_text[body_start:section_end]).splitlines()
+
+    molden_shells = []
+    atom = None
+    line_number = 0
+
+    while line_number < len(gto_lines):
+        fields = gto_lines[line_number].split()
+        line_number += 1
+
+        # Blank line (end of atom) or atom line ('<ATOM-NUMBER> 0')
+        if not fields:
+            continue
+        if fields[0].isdigit():
+            atom = int(fields[0])
+            continue
+
+        # Shell line ('<SHELL-TYPE> <PRIMITIVES> <SCALE>') followed by its primitives
+        primitives_number = int(fields[1])
+        primitives = ' '.join(gto_lines[line_number:line_number + primitives_number])
+        primitives = np.array(primitives.replace('D', 'E').split(), dtype=float)
+        primitives = primitives.reshape(primitives_number, -1)
+        line_number += primitives_number
+
+        molden_shells.append(MoldenShell(atom=atom,
+                                         shell_type=fields[0].lower(),
+                                         exponents=primitives[:, 0],
+                                         contraction=primitives[:, 1:]))
+
+    return molden_shells
+
+def parse_molden_coefficients(_coefficients_text):
+    """Function to parse the coefficient lines of a molecular orbital in bulk
+
+    Arguments:
+        _coefficients_text {str} -- '<BASIS-FUNCTION> <COEFFICIENT>' lines
+
+    Returns:
+        array:coefficients -- coefficients indexed by basis function (omitted ones are zero)
+    """
+    import numpy as np
+
+    _coefficients_text = decode_molden_text(_coefficients_text)
+
+    if 'D' in _coefficients_text:
+        _coefficients_text = _coefficients_text.replace('D', 'E')
+
+    try:
+        coefficient_pairs = np.fromstring(_coefficients_text, dtype=float, sep=' ')
+    except ValueError:
+        coefficient_pairs = None
+
+    if coefficient_pairs is None or coefficient_pairs.size % 2:
+        raise ValueError('malformed molecular orbital coefficient line {!r}'.format(
+            next((line.strip() for line in _coefficients_text.splitlines()
+                  if line.strip() and not MOLDEN_COEFFICIENT_LINE.match(line)), '')))
+
+    basis_functions = coefficient_pairs[0::2].astype(int) - 1
+
+    coefficients = np.zeros(basis_functions.max() + 1 if basis_functions.size else 0)
+    coefficients[basis_functions] = coefficient_pairs[1::2]
+
+    return coefficients
+
+def parse_molden_orbitals(_molden_text, _molden_section, _metadata_only=False):
+    """Function to parse the '[MO]' section of a Molden File
+
+    Orbital blocks are found with a single compiled regular expression over the section, and
+    coefficients are parsed in bulk for each block (skipped when only metadata is needed).
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+        _molden_section {tuple} -- offsets of '[MO]' section
+        _metadata_only {bool} -- skip coefficients parsing
+
+    Returns:
+        list:molecular_orbitals -- molecular orbitals (MolecularOrbital) in file order
+    """
+    _, body_start, section_end = _molden_section
+    molden_patterns = get_molden_patterns(_molden_text)
+
+    header_matches = list(
+        molden_patterns['mo_header'].finditer(_molden_text, body_start, section_end))
+    block_ends = [match.start() for match in header_matches[1:]] + [section_end]
+
+    molecular_orbitals = []
+    for match, block_end in zip(header_matches, block_ends):
+        mo_header = decode_molden_text(match.group(0))
+        mo_keys = {key.lower(): value
+                   for key, value in MOLDEN_PATTERNS[str]['mo_key'].findall(mo_header)}
+
+        coefficients = None
+        if not _metadata_only:
+            coefficients = parse_molden_coefficients(_molden_text[match.end():block_end])
+
+        molecular_orbitals.append(MolecularOrbital(
+            symmetry=mo_keys.get('sym', ''),
+            energy=float(mo_keys.get('ene', 'nan').replace('D', 'E')),
+            spin=mo_keys.get('spin', 'Alpha'),
+            occupation=float(mo_keys.get('occup', '0').replace('D', 'E')),
+            coefficients=coefficients,
+            span=(match.start(), block_end)))
+
+    return molecular_orbitals
+
+def get_molden_header_hash(_molden_header):
+    """Function to compute the hash identifying a Molden File header
+
+    Arguments:
+        _molden_header {str} -- Molden File header text (or bytes)
+
+    Returns:
+        str:header_hash -- SHA-1 hex digest (first 16 characters) of the header
+    """
+    if isinstance(_molden_header, str):
+        _molden_header = _molden_header.encode('ascii', 'replace')
+
+    return hashlib.sha1(_molden_header).hexdigest()[:16]
+
+def parse_molden_file(_molden_text, _metadata_only=False):
+    """Function to parse a Molden File
+
+    Arguments:
+        _molden_text {str} -- Molden File text, or bytes (e.g. from open_molden_mmap)
+        _metadata_only {bool} -- only scan orbitals metadata (Sym, Ene, Spin and Occup), skipping
+                                 '[Atoms]', '[GTO]' and coefficients parsing
+
+    Returns:
+        Molden:molden -- Molden File header, atoms, shells and molecular orbitals (header and
+                         orbital spans are bytes and byte offsets for Molden bytes)
+    """
+    molden_sections = find_molden_sections(_molden_text)
+
+    if 'mo' not in molden_sections:
+        raise ValueError('[MO] section was not found in Molden file')
+
+    molden_header = _molden_text[:molden_sections['mo'][1]]
+
+    atoms = None
+    shells = None
+    if not _metadata_only:
+        # Identical headers (e.g. NTO files of the same job) are parsed only once
+        header_hash = get_molden_header_hash(molden_header)
+
+        if header_hash not in MOLDEN_HEADER_CACHE:
+            if 'atoms' in molden_sections:
+                atoms = parse_molden_atoms(_molden_text, molden_sections['atoms'])
+            if 'gto' in molden_sections:
+                shells = parse_molden_gto(_molden_text, molden_sections['gto'])
+
+            # Oldest header first out, so long-running pipelines keep a bounded cache
+            if len(MOLDEN_HEADER_CACHE) >= MOLDEN_HEADER_CACHE_SIZE:
+                del MOLDEN_HEADER_CACHE[next(iter(MOLDEN_HEADER_CACHE))]
+            MOLDEN_HEADER_CACHE[header_hash] = (atoms, shells)
+
+        atoms, shells = MOLDEN_HEADER_CACHE[header_hash]
+
+    return Molden(header=molden_header,
+                  atoms=atoms,
+                  shells=shells,
+                  orbitals=parse_molden_orbitals(_molden_text, molden_sections['mo'],
+                                                 _metadata_only))
+
+def load_molden_index(_molden_filename, _molden_map):
+    """Function to load the on-disk orbitals index of a Molden File
+
+    The index is only used if the Molden File size and modification time are unchanged.
+
+    Arguments:
+        _molden_filename {str} -- Molden File name
+        _molden_map {mmap} -- Molden File bytes (from open_molden_mmap)
+
+    Returns:
+        Molden:molden_index -- Molden header and orbitals metadata with byte spans, or None if
+                               the index does not exist, is unreadable or is outdated
+    """
+    try:
+        with open(_molden_filename + MOLDEN_INDEX_EXTENSION, 'rt') as file:
+            molden_index = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    file_stat = stat(_molden_filename)
+    if (molden_index.get('version') != MOLDEN_INDEX_VERSION
+            or molden_index.get('size') != file_stat.st_size
+            or molden_index.get('mtime') != file_stat.st_mtime):
+        return None
+
+    return Molden(header=_molden_map[:molden_index['header_size']],
+                  atoms=None,
+                  shells=None,
+                  orbitals=[MolecularOrbital(symmetry=symmetry,
+                                             energy=energy,
+                                             spin=spin,
+                                             occupation=occupation,
+                                             coefficients=None,
+                                             span=(start, end))
+                            for symmetry, energy, spin, occupation, start, end
+                            in molden_index['orbitals']])
+
+def write_molden_index(_molden_filename, _molden_index):
+    """Function to write the on-disk orbitals index of a Molden File
+
+    The index is silently not written when the Molden File folder is read-only.
+
+    Arguments:
+        _molden_filename {str} -- Molden File name
+        _molden_index {Molden} -- Molden header and orbitals metadata with byte spans
+    """
+    file_stat = stat(_molden_filename)
+    molden_index = {
+        'version': MOLDEN_INDEX_VERSION,
+        'size': file_stat.st_size,
+        'mtime': file_stat.st_mtime,
+        'header_size': len(_molden_index.header),
+        'orbitals': [[orbital.symmetry, orbital.energy, orbital.spin, orbital.occupation,
+                      orbital.span[0], orbital.span[1]] for orbital in _molden_index.orbitals]
+    }
+
+    try:
+        with open(_molden_filename + MOLDEN_INDEX_EXTENSION, 'wt') as file:
+            json.dump(molden_index, file)
+    except OSError:
+        pass
+
+def get_molden_index(_molden_filename, _molden_map, _use_cache=True):
+    """Function to index the orbital blocks of a Molden File
+
+    The index is kept in a '<MOLDEN-FILE>.moldenidx' file, so later runs on the same Molden File
+    skip the metadata-only parse of parse_molden_file.
+
+    Arguments:
+        _molden_filename {str} -- Molden File name (plain or compressed)
+        _molden_map {mmap} -- Molden File bytes (from open_molden_mmap)
+        _use_cache {bool} -- read and write the '<MOLDEN-FILE>.moldenidx' index file
+
+    Returns:
+        Molden:molden_index -- Molden header and orbitals metadata with byte spans
+    """
+    molden_index = None
+    if _use_cache:
+        molden_index = load_molden_index(_molden_filename, _molden_map)
+
+    if molden_index is None:
+        molden_index = parse_molden_file(_molden_map, _metadata_only=True)
+        if _use_cache:
+            write_molden_index(_molden_filename, molden_index)
+
+    return molden_index
+
+def get_molden_orbitals_text(_molden_text, _molecular_orbitals):
+    """Function to obtain the original text of molecular orbital blocks
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+
+    Returns:
+        list:orbitals_text -- text (or raw bytes) of each molecular orbital block
+    """
+    return [_molden_text[start:end] for start, end in
+            (molecular_orbital.span for molecular_orbital in _molecular_orbitals)]
+
+def get_molden_orbitals_arrays(_molecular_orbitals):
+    """Function to collect orbital energies, occupations and spins as arrays
+
+    Arguments:
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+
+    Returns:
+        array:energies -- orbital energies, shape (orbitals,)
+        array:occupations -- orbital occupations, shape (orbitals,)
+        array:spins -- lower case orbital spins ('alpha' or 'beta'), shape (orbitals,)
+    """
+    import numpy as np
+
+    energies = np.fromiter((orbital.energy for orbital in _molecular_orbitals), dtype=float,
+                           count=len(_molecular_orbitals))
+    occupations = np.fromiter((orbital.occupation for orbital in _molecular_orbitals),
+                              dtype=float, count=len(_molecular_orbitals))
+    spins = np.array([orbital.spin.lower() for orbital in _molecular_orbitals], dtype=str)
+
+    return energies, occupations, spins
+
+def get_window_mask(_values, _window):
+    """Function to compute the mask of values inside an open window
+
+    Arguments:
+        _values {array} -- values
+        _window {tuple} -- (minimum, maximum) exclusive bounds, None for an unbounded side
+
+    Returns:
+        array:window_mask -- True for values inside the window
+    """
+    import numpy as np
+
+    window_mask = np.ones(len(_values), dtype=bool)
+
+    if _window is not None:
+        minimum, maximum = _window
+        if minimum is not None:
+            window_mask &= _values > minimum
+        if maximum is not None:
+            window_mask &= _values < maximum
+
+    return window_mask
+
+def select_molden_orbitals(_molecular_orbitals, _indices=None, _energy_window=None,
+                           _occupation_window=None, _spin=None, _top=None, _cumulative=None):
+    """Function to select molecular orbitals with a vectorized mask
+
+    Indices, windows and spin are combined in a single mask (every given criterion must be
+    satisfied). Top-K and cumulative occupation cutoffs are then applied to the remaining
+    orbitals of each spin separately, keeping orbitals from the largest occupation down.
+
+    Arguments:
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+        _indices {list} -- orbital indices (0-based, in file order)
+        _energy_window {tuple} -- (minimum, maximum) exclusive orbital energy bounds
+        _occupation_window {tuple} -- (minimum, maximum) exclusive occupation bounds
+        _spin {str} -- only orbitals of this spin ('alpha' or 'beta')
+        _top {int} -- keep the K orbitals of largest occupation of each spin
+        _cumulative {float} -- keep orbitals until this fraction of the occupation of each spin
+                               is covered (e.g. 0.99)
+
+    Returns:
+        list:selected_orbitals -- selected molecular orbitals, in file order
+    """
+    import numpy as np
+
+    energies, occupations, spins = get_molden_orbitals_arrays(_molecular_orbitals)
+
+    selection_mask = get_window_mask(energies, _energy_window)
+    selection_mask &= get_window_mask(occupations, _occupation_window)
+
+    if _indices is not None:
+        indices_mask = np.zeros(len(_molecular_orbitals), dtype=bool)
+        indices_mask[np.asarray(_indices, dtype=int)] = True
+        selection_mask &= indices_mask
+
+    if _spin is not None:
+        selection_mask &= spins == _spin.lower()
+
+    if _top is not None or _cumulative is not None:
+        for spin in np.unique(spins[selection_mask]):
+            spin_indices = np.flatnonzero(selection_mask & (spins == spin))
+            spin_indices = spin_indices[np.argsort(-occupations[spin_indices], kind='stable')]
+
+            kept_number = len(spin_indices)
+            if _cumulative is not None:
+                cumulative_occupations = np.cumsum(occupations[spin_indices])
+                target_occupation = _cumulative * cumulative_occupations[-1]
+                kept_number = min(kept_number, int(np.searchsorted(
+                    cumulative_occupations, target_occupation * (1.0 - 1e-12))) + 1)
+            if _top is not None:
+                kept_number = min(kept_number, _top)
+
+            selection_mask[spin_indices[kept_number:]] = False
+
+    return [_molecular_orbitals[index] for index in np.flatnonzero(selection_mask)]
+
+def get_active_occupation_window(_unrestricted=False):
+    """Function to build the default fractional occupation window of active orbitals
+
+    Arguments:
+        _unrestricted {bool} -- orbitals are fully occupied by a single electron (unrestricted
+                                calculations), instead of two
+
+    Returns:
+        tuple:occupation_window -- (minimum, maximum) exclusive occupation bounds
+    """
+    full_occupation = 1.0 if _unrestricted else 2.0
+
+    return (CAS_OCCUPATION_TOLERANCE, full_occupation - CAS_OCCUPATION_TOLERANCE)
+
+def select_active_orbitals(_molden_text, _occupation_window=None, _spin=None, _top=None,
+                           _unrestricted=False):
+    """Function to select the active space orbitals, removing unoccupied and full-occupied ones
+
+    Only orbitals metadata is scanned, selected orbitals keep coefficients as None.
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+        _occupation_window {tuple} -- (minimum, maximum) exclusive occupation bounds, fractional
+                                      occupations (get_active_occupation_window) when None
+        _spin {str} -- only orbitals of this spin ('alpha' or 'beta')
+        _top {int} -- keep the K orbitals of largest occupation of each spin
+        _unrestricted {bool} -- default window of unrestricted orbitals (between 0 and 1)
+
+    Returns:
+        str:molden_header -- Molden file header
+        list:cas_orbitals -- active space orbitals (MolecularOrbital)
+    """
+    cas_molden = parse_molden_file(_molden_text, _metadata_only=True)
+
+    occupation_window = _occupation_window
+    if occupation_window is None:
+        occupation_window = get_active_occupation_window(_unrestricted)
+
+    return cas_molden.header, select_molden_orbitals(cas_molden.orbitals,
+                                                     _occupation_window=occupation_window,
+                                                     _spin=_spin, _top=_top)
+
+def select_nto_orbitals(_molden_text, _occupation_thresholds, _spin=None, _top=None,
+                        _cumulative=None, _stats=None):
+    """Function to select the NTOs above each occupation threshold
+
+    Only orbitals metadata is scanned, selected orbitals keep coefficients as None. Scanning and
+    selection are measured as the 'index' and 'select' phases of compchemtools.stats records,
+    when they are given.
+
+    Arguments:
+        _molden_text {str} -- NTO Molden File text (or bytes)
+        _occupation_thresholds {list} -- NTO occupation thresholds
+        _spin {str} -- only NTOs of this spin ('alpha' or 'beta')
+        _top {int} -- keep the K NTOs of largest occupation of each spin
+        _cumulative {float} -- keep NTOs until this fraction of the occupation of each spin is
+                               covered (e.g. 0.99)
+        _stats {dict} -- phase records of compchemtools.stats (new_stats), or None
+
+    Returns:
+        str:molden_header -- Molden file header
+        dict:ntos_data -- NTOs (MolecularOrbital) above each occupation threshold
+    """
+    with stats.measure_phase(_stats, 'index') as index_record:
+        nto_molden = parse_molden_file(_molden_text, _metadata_only=True)
+    stats.count_text(index_record, _molden_text, len(nto_molden.orbitals))
+
+    ntos_data = {}
+    with stats.measure_phase(_stats, 'select') as select_record:
+        for occupation_threshold in _occupation_thresholds:
+            ntos_data[occupation_threshold] = select_molden_orbitals(
+                nto_molden.orbitals, _occupation_window=(occupation_threshold, None),
+                _spin=_spin, _top=_top, _cumulative=_cumulative)
+    stats.add_counts(select_record, _items=sum(len(ntos) for ntos in ntos_data.values()))
+
+    return nto_molden.header, ntos_data
+
+def write_molden_shared(_molden_filename, _molden_header, _orbitals_text):
+    """Function to write orbitals as a compact '.mos' file referring to a shared header file
+
+    The header file is written only if no file with the same header hash exists in the folder.
+
+    Arguments:
+        _molden_filename {str} -- standard Molden File name ('.mos' is appended)
+        _molden_header {str} -- Molden File header text (or bytes)
+        _orbitals_text {list} -- text (or bytes) of each molecular orbital block
+
+    Returns:
+        str:shared_filename -- name of the compact orbitals file
+    """
+    if isinstance(_molden_header, str):
+        _molden_header = _molden_header.encode('ascii', 'replace')
+
+    header_filename = MOLDEN_SHARED_HEADER.format(get_molden_header_hash(_molden_header))
+    header_path = path.join(path.dirname(_molden_filename), header_filename)
+
+    # Written to a temporary file first, as parallel processes may share the header
+    if not path.isfile(header_path):
+        temporary_path = '{}.{}.tmp'.format(header_path, getpid())
+        with open(temporary_path, 'wb') as file:
+            file.write(_molden_header)
+        replace(temporary_path, header_path)
+
+    shared_filename = _molden_filename + MOLDEN_SHARED_EXTENSION
+    with open(shared_filename, 'wb') as file:
+        file.write('{} {}\n'.format(MOLDEN_SHARED_REFERENCE, header_filename).encode('ascii'))
+        file.writelines(orbital_text if isinstance(orbital_text, bytes)
+                        else orbital_text.encode('ascii', 'replace')
+                        for orbital_text in _orbitals_text)
+
+    return shared_filename
+
+def expand_molden_shared(_shared_filename):
+    """Function to rebuild a standard Molden File from a compact '.mos' file
+
+    Arguments:
+        _shared_filename {str} -- compact orbitals file name
+
+    Returns:
+        bytes:molden_text -- standard Molden File bytes (shared header and orbital blocks)
+    """
+    with open(_shared_filename, 'rb') as file:
+        reference_line = file.readline().decode('ascii', 'replace').split()
+        orbitals_text = file.read()
+
+    if len(reference_line) != 2 or reference_line[0] != MOLDEN_SHARED_REFERENCE:
+        raise ValueError('{} is not a compact Molden orbitals file'.format(_shared_filename))
+
+    with open(path.join(path.dirname(_shared_filename), reference_line[1]), 'rb') as file:
+        return file.read() + orbitals_text
+
+def get_orbital_coefficients(_molden_text, _molecular_orbital):
+    """Function to obtain the coefficients of a molecular orbital, parsing its block if needed
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+        _molecular_orbital {MolecularOrbital} -- molecular orbital
+
+    Returns:
+        array:coefficients -- coefficients, shape (basis,)
+    """
+    if _molecular_orbital.coefficients is not None:
+        return _molecular_orbital.coefficients
+
+    block_start, block_end = _molecular_orbital.span
+    header_end = get_molden_patterns(_molden_text)['mo_header'].match(
+        _molden_text, block_start, block_end).end()
+
+    return parse_molden_coefficients(_molden_text[header_end:block_end])
+
+def get_molden_coefficients(_molden_text, _molecular_orbitals):
+    """Function to obtain the coefficient matrix of molecular orbitals
+
+    Coefficients not parsed yet (metadata-only scans) are parsed from the orbital blocks, so only
+    the selected orbitals are converted to numbers.
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+
+    Returns:
+        array:coefficients -- coefficients, shape (orbitals, basis), zero padded
+    """
+    import numpy as np
+
+    orbitals_coefficients = [get_orbital_coefficients(_molden_text, molecular_orbital)
+                             for molecular_orbital in _molecular_orbitals]
+
+    basis_size = max((len(coefficients) for coefficients in orbitals_coefficients), default=0)
+    coefficients = np.zeros((len(orbitals_coefficients), basis_size))
+    for orbital_index, orbital_coefficients in enumerate(orbitals_coefficients):
+        coefficients[orbital_index, :len(orbital_coefficients)] = orbital_coefficients
+
+    return coefficients
+
+def write_molden_npz(_npz_filename, _molden_text, _molecular_orbitals, _compress=False):
+    """Function to export molecular orbitals as a NumPy archive
+
+    The archive is written to a temporary file renamed on success, so malformed coefficients
+    (ValueError) leave no archive behind.
+
+    Arguments:
+        _npz_filename {str} -- NumPy archive file name
+        _molden_text {str} -- Molden File text (or bytes)
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+        _compress {bool} -- compress the archive (it can no longer be memory-mapped)
+    """
+    import numpy as np
+
+    savez = np.savez_compressed if _compress else np.savez
+
+    npz_arrays = {
+        'coefficients': get_molden_coefficients(_molden_text, _molecular_orbitals),
+        'energies': np.array([orbital.energy for orbital in _molecular_orbitals], dtype=float),
+        'occupations': np.array([orbital.occupation for orbital in _molecular_orbitals],
+                                dtype=float),
+        'spins': np.array([orbital.spin for orbital in _molecular_orbitals], dtype=str),
+        'symmetries': np.array([orbital.symmetry for orbital in _molecular_orbitals], dtype=str)
+    }
+
+    temporary_filename = '{}.{}.tmp'.format(_npz_filename, getpid())
+    try:
+        with open(temporary_filename, 'wb') as file:
+            savez(file, **npz_arrays)
+        replace(temporary_filename, _npz_filename)
+    finally:
+        if path.exists(temporary_filename):
+            remove(temporary_filename)
+
+def load_molden_npz(_npz_filename):
+    """Function to load a Molden NumPy archive, memory-mapping uncompressed arrays
+
+    Arguments:
+        _npz_filename {str} -- NumPy archive file name
+
+    Returns:
+        dict:molden_arrays -- arrays of MOLDEN_NPZ_ARRAYS (read-only memory maps when the
+                              archive is uncompressed)
+    """
+    import numpy as np
+
+    molden_arrays = {}
+
+    with zipfile.ZipFile(_npz_filename) as archive, open(_npz_filename, 'rb') as file:
+        for member in archive.infolist():
+            array_name = member.filename[:-len('.npy')]
+
+            if member.compress_type != zipfile.ZIP_STORED:
+                with archive.open(member) as member_file:
+                    molden_arrays[array_name] = np.lib.format.read_array(member_file)
+                continue
+
+            # Member data starts after the local file header (30 bytes, name and extra field)
+            file.seek(member.header_offset + 26)
+            name_length, extra_length = np.frombuffer(file.read(4), dtype='<u2')
+            file.seek(member.header_offset + 30 + int(name_length) + int(extra_length))
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            if dtype.hasobject or 0 in shape:
+                file.seek(member.header_offset + 30 + int(name_length) + int(extra_length))
+                molden_arrays[array_name] = np.lib.format.read_array(file)
+            else:
+                molden_arrays[array_name] = np.memmap(
+                    _npz_filename, dtype=dtype, mode='r', offset=file.tell(), shape=shape,
+                    order='F' if fortran_order else 'C')
+
+    return molden_arrays
+
+def add_molden_coefficients(_molden_text, _molecular_orbitals):
+    """Function to fill the coefficients of molecular orbitals scanned for metadata only
+
+    Arguments:
+        _molden_text {str} -- Molden File text (or bytes)
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+
+    Returns:
+        list:molecular_orbitals -- molecular orbitals with coefficients, shape (basis,)
+    """
+    return [molecular_orbital._replace(
+                coefficients=get_orbital_coefficients(_molden_text, molecular_orbital))
+            for molecular_orbital in _molecular_orbitals]
+
+def read_molden(_molden_source):
+    """Function to parse a whole Molden File in memory
+
+    Arguments:
+        _molden_source {obj} -- Molden File name (plain or compressed), binary or text file
+                                object, or bytes buffer
+
+    Returns:
+        Molden:molden -- Molden File header, atoms (MoldenAtoms), shells (MoldenShell) and
+                         molecular orbitals (MolecularOrbital) with coefficients
+    """
+    return parse_molden_file(read_molden_source(_molden_source))
+
+def format_molden_file(_molden_source, _occupation_window=None, _spin=None, _top=None,
+                       _unrestricted=False):
+    """Function to obtain the active space orbitals of a CAS Molden File in memory
+
+    Arguments:
+        _molden_source {obj} -- Molden File name (plain or compressed), binary or text file
+                                object, or bytes buffer
+        _occupation_window {tuple} -- (minimum, maximum) exclusive occupation bounds, fractional
+                                      occupations when None
+        _spin {str} -- only orbitals of this spin ('alpha' or 'beta')
+        _top {int} -- keep the K orbitals of largest occupation of each spin
+        _unrestricted {bool} -- default window of unrestricted orbitals (between 0 and 1)
+
+    Returns:
+        str:molden_header -- Molden file header (everything up to the '[MO]' line)
+        list:cas_orbitals -- active space orbitals (MolecularOrbital) with coefficients
+    """
+    molden_text = read_molden_source(_molden_source)
+    molden_header, cas_orbitals = select_active_orbitals(molden_text, _occupation_window,
+                                                         _spin, _top, _unrestricted)
+
+    return molden_header, add_molden_coefficients(molden_text, cas_orbitals)
+
+def format_nto_molden_file(_molden_source, _occupation_thresholds=(0.01,), _spin=None, _top=None,
+                           _cumulative=None):
+    """Function to obtain the NTOs of an ORCA NTO Molden File in memory
+
+    Arguments:
+        _molden_source {obj} -- NTO Molden File name (plain or compressed), binary or text file
+                                object, or bytes buffer
+        _occupation_thresholds {list} -- NTO occupation thresholds
+        _spin {str} -- only NTOs of this spin ('alpha' or 'beta')
+        _top {int} -- keep the K NTOs of largest occupation of each spin
+        _cumulative {float} -- keep NTOs until this fraction of the occupation of each spin is
+                               covered (e.g. 0.99)
+
+    Returns:
+        str:molden_header -- Molden file header (everything up to the '[MO]' line)
+        dict:ntos_data -- NTOs (MolecularOrbital) with coefficients above each occupation
+                          threshold
+    """
+    molden_text = read_molden_source(_molden_source)
+    molden_header, ntos_data = select_nto_orbitals(molden_text, _occupation_thresholds, _spin,
+                                                   _top, _cumulative)
+
+    return molden_header, {occupation_threshold: add_molden_coefficients(molden_text, ntos)
+                           for occupation_threshold, ntos in ntos_data.items()}
@@ -0,0 +1,328 @@
+####################################################################################################
+#                                                                                                  #
+#                                           scanner.py                                             #
+#          Single-pass log file scanner dispatching marker lines to registered handlers            #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Log files are read once, in binary chunks. Marker lines are located with bytes searches and the  #
+# markers of each line are told apart by a single precompiled regular expression alternation of    #
+# all registered markers. Handlers are registered per marker in a dictionary (marker bytes -> list #
+# of handlers):                                                                                    #
+#               . handler(line, offset): called with each marker line and its byte offset, may     #
+#                 return a consumer to receive the following lines of the section                  #
+#               . consumer(line, offset): called with each following line, returns False once the  #
+#                 section is over                                                                  #
+#                                                                                                  #
+# Lines given to consumers are also searched for markers, so consecutive sections (e.g. excited    #
+# states) are all found. Handlers for the sections used by the CompChemTools scripts are built by  #
+# the add_*_handlers functions, which store their results in a dictionary, so several artifacts    #
+# (geometries, excited states, NTO blocks) are obtained from a single pass over a log file.        #
+# compchemtools.g09.read_g09_log registers them together on a single pass over g09 Log Files.      #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##     Regular expression operations Module    ##
+import re
+##        Container datatypes Module           ##
+from collections import deque
+##       Array bisection algorithm Module      ##
+from bisect import bisect_left
+##   Context managers utilities Module         ##
+from contextlib import nullcontext
+##  CompChemTools compressed files Module      ##
+from . import compressed
+#################################################
+
+## Size of the chunks read from log files (bytes)
+SCANNER_CHUNK_SIZE = 4 * 1024 * 1024
+
+## Markers of the sections used by CompChemTools scripts
+SCANNER_MARKERS = {
+    'g09_natoms': b'NAtoms',
+    'g09_stationary': b'Stationary point found',
+    'g09_step': b'Step number',
+    'g09_input': b'Input orientation:',
+    'g09_standard': b'Standard orientation:',
+    'g09_zmat': b'Z-Matrix orientation:',
+    'g09_termination': b'Normal termination of Gaussian',
+    'g09_excited_state': b'Excited State',
+    'g09_mo_start': b'Molecular Orbital Coefficients',
+    'g09_mo_end': b'Density Matrix',
+    'g09_nto_start': b'Alpha spin Natural Transition Orbitals for state',
+    'g09_nto_end': b'Populations using transition density between ground and state',
+    'orca_termination': b'ORCA TERMINATED NORMALLY'
+}
+
+## Orbital excitation lines of a g09 excited state, e.g. '     18 -> 20         0.70467'
+G09_EXCITATION = re.compile(rb'^\s*(\d+[AB]?)\s*(->|<-)\s*(\d+[AB]?)\s+(-?\d+\.\d+)')
+
+## Header lines between g09 orientation markers and the first atom
+G09_ORIENTATION_HEADER_LINES = 4
+
+## Number of lines before 'Populations using transition density' left out of g09 NTO blocks
+G09_NTO_END_LINES = 2
+
+## Compiled marker alternations, keyed by sorted marker tuples
+SCANNER_PATTERNS = {}
+
+def get_scanner_pattern(_markers):
+    """Function to compile (once) the regular expression alternation of markers
+
+    Arguments:
+        _markers {iterable} -- markers (bytes)
+
+    Returns:
+        obj:pattern -- compiled regular expression matching any marker
+    """
+    # Longest markers first, so markers that are prefixes of others do not hide them
+    markers_key = tuple(sorted(set(_markers), key=lambda marker: (-len(marker), marker)))
+
+    if markers_key not in SCANNER_PATTERNS:
+        SCANNER_PATTERNS[markers_key] = re.compile(b'|'.join(re.escape(marker)
+                                                             for marker in markers_key))
+
+    return SCANNER_PATTERNS[markers_key]
+
+def register_handler(_handlers, _marker, _handler):
+    """Function to register a handler for the lines containing a marker
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _marker {bytes} -- marker
+        _handler {callable} -- handler(line, offset), may return a consumer(line, offset)
+    """
+    _handlers.setdefault(_marker, []).append(_handler)
+
+def find_marker_lines(_buffer, _end, _markers):
+    """Function to find the lines of a buffer containing any marker
+
+    Each marker is searched with bytes.find, which is much faster than a regular expression over
+    a whole buffer, the alternation is then only applied to the few marker lines.
+
+    Arguments:
+        _buffer {bytes} -- buffer read from log file
+        _end {int} -- end of the lines to be searched in buffer
+        _markers {iterable} -- markers (bytes)
+
+    Returns:
+        list:marker_lines -- sorted start positions of marker lines in buffer
+    """
+    marker_lines = set()
+
+    for marker in _markers:
+        position = _buffer.find(marker, 0, _end)
+        while position != -1:
+            marker_lines.add(_buffer.rfind(b'\n', 0, position) + 1)
+            line_end = _buffer.find(b'\n', position, _end)
+            if line_end == -1:
+                break
+            position = _buffer.find(marker, line_end, _end)
+
+    return sorted(marker_lines)
+
+def scan_lines(_buffer, _buffer_offset, _end, _pattern, _handlers, _consumers):
+    """Function to dispatch the complete lines of a buffer to handlers and consumers
+
+    Arguments:
+        _buffer {bytes} -- buffer read from log file
+        _buffer_offset {int} -- byte offset of the buffer in log file
+        _end {int} -- end of the lines to be scanned in buffer
+        _pattern {obj} -- compiled alternation of the markers
+        _handlers {dict} -- marker -> list of handlers
+        _consumers {list} -- active consumers, updated in place
+    """
+    marker_lines = find_marker_lines(_buffer, _end, _handlers)
+    marker_index = 0
+    position = 0
+
+    while position < _end:
+        # Without active consumers, jump to the next marker line
+        if not _consumers:
+            marker_index = bisect_left(marker_lines, position, marker_index)
+            if marker_index == len(marker_lines):
+                return
+            position = marker_lines[marker_index]
+
+        line_end = _buffer.find(b'\n', position, _end) + 1 or _end
+        line = _buffer[position:line_end]
+
+        if _consumers:
+            _consumers[:] = [consumer for consumer in _consumers
+                             if consumer(line, _buffer_offset + position)]
+
+        marker_index = bisect_left(marker_lines, position, marker_index)
+        if marker_index < len(marker_lines) and marker_lines[marker_index] == position:
+            for marker in {match.group() for match in _pattern.finditer(line)}:
+                for handler in _handlers[marker]:
+                    consumer = handler(line, _buffer_offset + position)
+                    if consumer is not None:
+                        _consumers.append(consumer)
+
+        position = line_end
+
+def scan_log_file(_log_file, _handlers, _start_offset=0, _chunk_size=SCANNER_CHUNK_SIZE,
+                  _counts=None):
+    """Function to scan a log file in a single streaming pass, dispatching marker lines
+
+    Arguments:
+        _log_file {obj} -- log file name (plain or compressed), or seekable binary file object
+                           (left open)
+        _handlers {dict} -- marker -> list of handlers
+        _start_offset {int} -- byte offset of the line where the scan starts
+        _chunk_size {int} -- size of the chunks read from log file (bytes)
+        _counts {dict} -- counters receiving scanned 'bytes' and 'lines' (e.g. a
+                          compchemtools.stats phase record), or None
+
+    Returns:
+        int:scanned_size -- byte offset after the last complete (newline ended) line
+    """
+    pattern = get_scanner_pattern(_handlers)
+    consumers = []
+
+    if hasattr(_log_file, 'read'):
+        log_file = nullcontext(_log_file)
+    else:
+        log_file = compressed.open_file(_log_file, 'rb')
+
+    with log_file as file:
+        file.seek(_start_offset)
+        buffer_offset = _start_offset
+        remainder = b''
+
+        while True:
+            chunk = file.read(_chunk_size)
+            buffer = remainder + chunk
+
+            # Only complete lines are scanned, the last partial line goes to the next chunk
+            buffer_end = buffer.rfind(b'\n') + 1 if chunk else len(buffer)
+            scan_lines(buffer, buffer_offset, buffer_end, pattern, _handlers, consumers)
+
+            if _counts is not None:
+                _counts['bytes'] += buffer_end
+                _counts['lines'] += buffer.count(b'\n', 0, buffer_end)
+
+            if not chunk:
+                break
+
+            buffer_offset += buffer_end
+            remainder = buffer[buffer_end:]
+
+    return buffer_offset
+
+def add_offset_handlers(_handlers, _results, _markers):
+    """Function to register handlers keeping the byte offsets of marker lines
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _results {dict} -- results, each marker name gets a list of line offsets
+        _markers {list} -- names of SCANNER_MARKERS
+    """
+    for marker_name in _markers:
+        offsets = _results.setdefault(marker_name, [])
+        register_handler(_handlers, SCANNER_MARKERS[marker_name],
+                         lambda _line, _offset, _offsets=offsets: _offsets.append(_offset))
+
+def add_section_handler(_handlers, _marker, _sections, _is_section_line, _skip=0):
+    """Function to register a handler collecting the lines of the sections started by a marker
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _marker {bytes} -- marker starting the sections
+        _sections {list} -- list receiving (offset, lines) of each section, lines being the
+                            marker line and the following section lines
+        _is_section_line {callable} -- is_section_line(line), False for the first line after
+                                       the section
+        _skip {int} -- number of lines after the marker line always kept in the section
+    """
+    def handler(_line, _offset):
+        section_lines = [_line]
+        _sections.append((_offset, section_lines))
+        skipped = [0]
+
+        def consumer(_section_line, _section_offset):
+            if skipped[0] < _skip:
+                skipped[0] += 1
+            elif not _is_section_line(_section_line):
+                return False
+            section_lines.append(_section_line)
+            return True
+
+        return consumer
+
+    register_handler(_handlers, _marker, handler)
+
+def add_g09_geometry_handlers(_handlers, _results, _orientation='input'):
+    """Function to register handlers for g09 geometries ('g09_geometries' result)
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _results {dict} -- results, 'g09_geometries' gets (offset, lines) of each orientation
+                           block (atom lines follow the header lines) and 'g09_natoms',
+                           'g09_stationary' and 'g09_step' get line offsets
+        _orientation {str} -- orientation ('input', 'standard' or 'zmat')
+    """
+    add_offset_handlers(_handlers, _results, ['g09_natoms', 'g09_stationary', 'g09_step'])
+    add_section_handler(_handlers, SCANNER_MARKERS['g09_' + _orientation],
+                        _results.setdefault('g09_geometries', []),
+                        lambda _line: not _line.lstrip().startswith(b'---'),
+                        _skip=G09_ORIENTATION_HEADER_LINES)
+
+def add_g09_td_handlers(_handlers, _results):
+    """Function to register handlers for g09 excited states ('g09_excited_states' result)
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _results {dict} -- results, 'g09_excited_states' gets (offset, lines) of each excited
+                           state ('Excited State' line followed by its orbital excitations)
+    """
+    add_section_handler(_handlers, SCANNER_MARKERS['g09_excited_state'],
+                        _results.setdefault('g09_excited_states', []),
+                        lambda _line: G09_EXCITATION.match(_line) is not None)
+
+def add_g09_nto_handlers(_handlers, _results):
+    """Function to register handlers for g09 orbital sections ('g09_nto_blocks' result)
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _results {dict} -- results, 'g09_nto_blocks' gets (offset, end offset, line) of each NTO
+                           block, the block ending G09_NTO_END_LINES lines before 'Populations
+                           using transition density', and 'g09_mo_start' (offsets after the line)
+                           and 'g09_mo_end' get line offsets
+    """
+    add_offset_handlers(_handlers, _results, ['g09_mo_end'])
+    mo_starts = _results.setdefault('g09_mo_start', [])
+    register_handler(_handlers, SCANNER_MARKERS['g09_mo_start'],
+                     lambda _line, _offset: mo_starts.append(_offset + len(_line)))
+
+    nto_blocks = _results.setdefault('g09_nto_blocks', [])
+    nto_end = SCANNER_MARKERS['g09_nto_end']
+
+    def handler(_line, _offset):
+        line_offsets = deque([_offset] * (G09_NTO_END_LINES + 1), maxlen=G09_NTO_END_LINES + 1)
+
+        def consumer(_block_line, _block_offset):
+            line_offsets.append(_block_offset)
+            if nto_end in _block_line:
+                nto_blocks.append((_offset, max(line_offsets[0], _offset), _line))
+                return False
+            return True
+
+        return consumer
+
+    register_handler(_handlers, SCANNER_MARKERS['g09_nto_start'], handler)
+
+def add_termination_handlers(_handlers, _results):
+    """Function to register handlers for normal termination of g09 and ORCA jobs
+
+    Arguments:
+        _handlers {dict} -- marker -> list of handlers
+        _results {dict} -- results, 'g09_termination' and 'orca_termination' get line offsets
+    """
+    add_offset_handlers(_handlers, _results, ['g09_termination', 'orca_termination'])
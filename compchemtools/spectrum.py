@@ -0,0 +1,187 @@
+####################################################################################################
+#                                                                                                  #
+#                                           spectrum.py                                            #
+#          Broadening of stick spectra (transition energies and oscillator strengths)              #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Stick spectra are CSV tables whose first two columns are transition energies (eV) and            #
+# oscillator strengths, as written by get_g09_td.py and g09td2csv.bash. Tables combining several   #
+# geometries (nuclear ensembles) name the geometry of each transition in a last 'Log File' column. #
+#                                                                                                  #
+# Line shapes (as getGaussPeak and getLorentzPeak of graphics/PlotSpectrum.nb):                    #
+#               . 'gauss':   f * exp(-(E - E0)^2 / (2 * width^2))                                  #
+#               . 'lorentz': f * width^2 / ((E - E0)^2 + width^2)                                  #
+#                                                                                                  #
+# Cross sections (atomic units) are 2 * pi^2 * alpha times the broadened oscillator strengths,     #
+# computed as (sticks) x (sticks, grid) matrix products over chunks of sticks, so memory is        #
+# bounded by the chunk size whatever the number of geometries.                                     #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##        Functions creating iterators         ##
+from itertools import islice
+##  CompChemTools compressed files Module      ##
+from . import compressed
+##     Fundamental package for array computing ##
+import numpy as np
+#################################################
+
+## Fine-structure constant and conversion from oscillator strength to cross section (a.u.)
+FINE_STRUCTURE = 0.0072973525693
+CROSS_SECTION_FACTOR = 2 * np.pi**2 * FINE_STRUCTURE
+
+## Line shapes of broadened sticks
+SPECTRUM_SHAPES = ['gauss', 'lorentz']
+
+## Default broadening width (eV, standard deviation for 'gauss', half width for 'lorentz')
+SPECTRUM_WIDTH = 0.35
+
+## Default energy grid step (eV) and margin around transition energies (eV)
+SPECTRUM_STEP = 0.01
+SPECTRUM_MARGIN = 1.0
+
+## Number of sticks read and broadened at once
+SPECTRUM_CHUNK_SIZE = 4096
+
+## Last column of stick tables combining several geometries
+SPECTRUM_GEOMETRY_COLUMN = 'Log File'
+
+def iter_stick_spectrum(_stick_filename, _chunk_size=SPECTRUM_CHUNK_SIZE):
+    """Function to read a stick spectrum table in chunks
+
+    Arguments:
+        _stick_filename {str} -- stick spectrum CSV file name (header line is skipped)
+        _chunk_size {int} -- number of sticks of each chunk
+
+    Returns:
+        generator:chunks -- (energies, oscillator strengths, geometries) tuples, geometries are
+                            the 'Log File' column values, or None if the table has no such column
+    """
+    with compressed.open_file(_stick_filename, 'rt') as file:
+        header = file.readline().rstrip('\n').split(',')
+        has_geometries = header[-1] == SPECTRUM_GEOMETRY_COLUMN
+
+        while True:
+            lines = [line for line in islice(file, _chunk_size) if line.strip()]
+            if not lines:
+                break
+
+            sticks = np.loadtxt(lines, delimiter=',', usecols=(0, 1), ndmin=2)
+            geometries = [line.rstrip('\n').rsplit(',', 1)[1] for line in lines] \
+                if has_geometries else None
+
+            yield sticks[:, 0], sticks[:, 1], geometries
+
+def get_energy_range(_stick_filenames):
+    """Function to obtain the minimum and maximum transition energies of stick spectra
+
+    Arguments:
+        _stick_filenames {list} -- stick spectrum CSV file names
+
+    Returns:
+        tuple:energy_range -- (minimum, maximum) transition energies (eV)
+    """
+    minimum, maximum = np.inf, -np.inf
+
+    for stick_filename in _stick_filenames:
+        for energies, _, _ in iter_stick_spectrum(stick_filename):
+            if energies.size:
+                minimum = min(minimum, energies.min())
+                maximum = max(maximum, energies.max())
+
+    return minimum, maximum
+
+def get_energy_grid(_minimum, _maximum, _step=SPECTRUM_STEP):
+    """Function to build an energy grid
+
+    Arguments:
+        _minimum {float} -- first grid energy (eV)
+        _maximum {float} -- last grid energy (eV, included)
+        _step {float} -- grid step (eV)
+
+    Returns:
+        ndarray:energy_grid -- grid energies (eV)
+    """
+    points = int(round((_maximum - _minimum) / _step)) + 1
+    return _minimum + _step * np.arange(points)
+
+def broaden_sticks(_energy_grid, _energies, _oscillator_strengths, _width=SPECTRUM_WIDTH,
+                   _shape='gauss'):
+    """Function to broaden sticks on an energy grid as a single matrix product
+
+    Arguments:
+        _energy_grid {ndarray} -- grid energies (eV)
+        _energies {ndarray} -- transition energies (eV)
+        _oscillator_strengths {ndarray} -- oscillator strengths
+        _width {float} -- broadening width (eV)
+        _shape {str} -- line shape ('gauss' or 'lorentz')
+
+    Returns:
+        ndarray:spectrum -- summed broadened oscillator strengths on the grid
+    """
+    deviations = (_energy_grid[np.newaxis, :] - _energies[:, np.newaxis]) / _width
+
+    if _shape == 'gauss':
+        profiles = np.exp(-0.5 * deviations**2)
+    elif _shape == 'lorentz':
+        profiles = 1.0 / (1.0 + deviations**2)
+    else:
+        raise ValueError('unknown line shape {}'.format(_shape))
+
+    return _oscillator_strengths @ profiles
+
+def get_cross_section(_stick_filename, _energy_grid, _width=SPECTRUM_WIDTH, _shape='gauss',
+                      _chunk_size=SPECTRUM_CHUNK_SIZE):
+    """Function to compute the summed cross section of a stick spectrum table, chunk by chunk
+
+    Arguments:
+        _stick_filename {str} -- stick spectrum CSV file name
+        _energy_grid {ndarray} -- grid energies (eV)
+        _width {float} -- broadening width (eV)
+        _shape {str} -- line shape ('gauss' or 'lorentz')
+        _chunk_size {int} -- number of sticks broadened at once
+
+    Returns:
+        ndarray:cross_section -- cross section (a.u.) summed over all geometries of the table
+        int:geometries_number -- number of geometries of the table (1 without 'Log File' column)
+    """
+    cross_section = np.zeros_like(_energy_grid)
+    geometries = set()
+    has_geometries = False
+
+    for energies, oscillator_strengths, chunk_geometries in \
+            iter_stick_spectrum(_stick_filename, _chunk_size):
+        cross_section += broaden_sticks(_energy_grid, energies, oscillator_strengths,
+                                        _width, _shape)
+        if chunk_geometries is not None:
+            has_geometries = True
+            geometries.update(chunk_geometries)
+
+    return CROSS_SECTION_FACTOR * cross_section, len(geometries) if has_geometries else 1
+
+def write_spectrum(_spectrum_filename, _energy_grid, _cross_section, _error=None):
+    """Function to write a spectrum as CSV table or NumPy array ('.npy' extension)
+
+    Arguments:
+        _spectrum_filename {str} -- spectrum file name
+        _energy_grid {ndarray} -- grid energies (eV)
+        _cross_section {ndarray} -- cross section on the grid
+        _error {ndarray} -- cross section error on the grid, written as third column if given
+    """
+    columns = [_energy_grid, _cross_section] + ([_error] if _error is not None else [])
+    spectrum = np.column_stack(columns)
+
+    if _spectrum_filename.endswith('.npy'):
+        np.save(_spectrum_filename, spectrum)
+        return
+
+    header = 'Energy (eV),Cross Section (a.u.)' + (',Error (a.u.)' if _error is not None else '')
+    np.savetxt(_spectrum_filename, spectrum, fmt=['%.4f'] + ['%.6e'] * (len(columns) - 1),
+               delimiter=',', header=header, comments='')
@@ -0,0 +1,294 @@
+####################################################################################################
+#                                                                                                  #
+#                                             stats.py                                             #
+#        Per-phase throughput statistics and profiling of the post-processing scripts              #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Phases of processing one file:                                                                   #
+#               . 'read':   Reading the input file (or the needed part of it)                      #
+#               . 'index':  Scanning or parsing the file structure (markers, orbital blocks)       #
+#               . 'select': Selecting geometries or orbitals                                       #
+#               . 'format': Converting selected data to the output format                          #
+#               . 'write':  Writing output files                                                   #
+#                                                                                                  #
+# Each phase records its wall time, bytes, lines and items (geometries, orbitals, markers)         #
+# processed, and the peak resident memory (RSS) of the process when it ends. Statistics are        #
+# recorded per process, so each file is measured in the worker process handling it, and phase      #
+# times of parallel runs are summed over processes (they may exceed the wall time of the run).     #
+#                                                                                                  #
+# Statistics of a file are a dict of phase records, created by new_stats when the script measures  #
+# phases and passed to the library functions counting inside a phase (e.g. g09.scan_g09_file). No  #
+# state is kept by this module: without statistics (None), measure_phase only yields None.         #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##   System-specific parameters and functions  ##
+import sys
+##           Time access Module                ##
+import time
+##       JSON encoder and decoder Module       ##
+import json
+##      Deterministic profiling Module         ##
+import cProfile
+##   Context managers utilities Module         ##
+from contextlib import contextmanager
+##   Resource usage information (Unix only)    ##
+try:
+    import resource
+except ImportError:
+    resource = None
+#################################################
+
+## Phases of processing one file, in report order
+STATS_PHASES = ['read', 'index', 'select', 'format', 'write']
+
+## Counters of each phase record
+STATS_COUNTERS = ['time', 'bytes', 'lines', 'items', 'calls']
+
+def new_stats(_enabled):
+    """Function to start the statistics of a new file
+
+    Arguments:
+        _enabled {bool} -- whether phases are measured
+
+    Returns:
+        dict:file_stats -- empty phase records keyed by phase, or None if phases are not measured
+    """
+    return {} if _enabled else None
+
+def get_phase_record(_file_stats, _phase):
+    """Function to obtain the record of a phase, for counters added inside the phase
+
+    Arguments:
+        _file_stats {dict} -- phase records of the file (new_stats), or None
+        _phase {str} -- phase name (STATS_PHASES)
+
+    Returns:
+        dict:record -- phase counters, or None if phases are not measured
+    """
+    if _file_stats is None:
+        return None
+
+    return _file_stats.setdefault(
+        _phase, dict({counter: 0 for counter in STATS_COUNTERS}, time=0.0, peak_rss=None))
+
+@contextmanager
+def measure_phase(_file_stats, _phase):
+    """Function to measure the wall time and peak memory of a phase ('with' statement)
+
+    Arguments:
+        _file_stats {dict} -- phase records of the file (new_stats), or None
+        _phase {str} -- phase name (STATS_PHASES)
+
+    Yields:
+        dict:record -- phase counters, or None if phases are not measured
+    """
+    record = get_phase_record(_file_stats, _phase)
+
+    if record is None:
+        yield None
+        return
+
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['time'] += time.perf_counter() - start
+        record['calls'] += 1
+        record['peak_rss'] = get_peak_rss()
+
+def add_counts(_record, _bytes=0, _lines=0, _items=0):
+    """Function to add processed bytes, lines and items to a phase record
+
+    Arguments:
+        _record {dict} -- phase counters (nothing is done for None)
+        _bytes {int} -- number of bytes
+        _lines {int} -- number of lines
+        _items {int} -- number of items (geometries, orbitals, markers)
+    """
+    if _record is None:
+        return
+
+    _record['bytes'] += _bytes
+    _record['lines'] += _lines
+    _record['items'] += _items
+
+def count_text(_record, _text, _items=0):
+    """Function to add the bytes and lines of a text to a phase record
+
+    Texts (str) are counted by characters, which are bytes for the ASCII log and Molden files.
+
+    Arguments:
+        _record {dict} -- phase counters (nothing is done for None)
+        _text {str} -- processed text (or bytes), or list of texts
+        _items {int} -- number of items (geometries, orbitals, markers)
+    """
+    if _record is None:
+        return
+
+    texts = _text if isinstance(_text, list) else [_text]
+    add_counts(_record,
+               sum(len(text) for text in texts),
+               sum(text.count('\n' if isinstance(text, str) else b'\n') for text in texts),
+               _items)
+
+def get_peak_rss(_children=False):
+    """Function to obtain the peak resident memory of this process
+
+    Arguments:
+        _children {bool} -- also consider finished child processes (e.g. parallel workers)
+
+    Returns:
+        int:peak_rss -- peak resident memory (bytes), or None where it is not available
+    """
+    if resource is None:
+        return None
+
+    # ru_maxrss is given in bytes on macOS and in kilobytes elsewhere
+    scale = 1 if sys.platform == 'darwin' else 1024
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if _children:
+        peak_rss = max(peak_rss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+    return peak_rss * scale
+
+def merge_stats(_stats_list):
+    """Function to sum the phase records of several files
+
+    Arguments:
+        _stats_list {list} -- phase records of each file (None entries are skipped)
+
+    Returns:
+        dict:total_stats -- summed phase records keyed by phase (peak RSS is the largest one)
+    """
+    total_stats = {}
+
+    for file_stats in _stats_list:
+        for phase, record in (file_stats or {}).items():
+            total_record = total_stats.setdefault(
+                phase, dict({counter: 0 for counter in STATS_COUNTERS}, time=0.0, peak_rss=None))
+            for counter in STATS_COUNTERS:
+                total_record[counter] += record[counter]
+            if record['peak_rss'] is not None:
+                total_record['peak_rss'] = max(total_record['peak_rss'] or 0, record['peak_rss'])
+
+    return total_stats
+
+def get_throughput(_record):
+    """Function to compute the throughput of a phase
+
+    Arguments:
+        _record {dict} -- phase counters
+
+    Returns:
+        float:throughput -- processed megabytes per second, or None for untimed phases
+    """
+    if _record['time'] <= 0.0:
+        return None
+
+    return _record['bytes'] / _record['time'] / 1e6
+
+def format_stats(_total_stats, _wall_time, _peak_rss):
+    """Function to format the phase statistics as a terminal table
+
+    Arguments:
+        _total_stats {dict} -- phase records keyed by phase (merge_stats)
+        _wall_time {float} -- wall time of the whole run (s)
+        _peak_rss {int} -- peak resident memory of the whole run (bytes), or None
+
+    Returns:
+        str:stats_table -- table of phases and run totals
+    """
+    def format_megabytes(_value):
+        return '-' if _value is None else '{:.1f}'.format(_value / 1e6)
+
+    table_lines = ['> {:<7} {:>10} {:>12} {:>10} {:>8} {:>9} {:>9}'.format(
+        'Phase', 'Time (s)', 'Bytes', 'Lines', 'Items', 'MB/s', 'RSS (MB)')]
+
+    for phase in STATS_PHASES:
+        if phase not in _total_stats:
+            continue
+        record = _total_stats[phase]
+        throughput = get_throughput(record)
+        table_lines.append('> {:<7} {:>10.4f} {:>12} {:>10} {:>8} {:>9} {:>9}'.format(
+            phase, record['time'], record['bytes'], record['lines'], record['items'],
+            '-' if throughput is None else '{:.1f}'.format(throughput),
+            format_megabytes(record['peak_rss'])))
+
+    table_lines.append('> {:<7} {:>10.4f} {:>12} {:>10} {:>8} {:>9} {:>9}'.format(
+        'run', _wall_time, '', '', '', '', format_megabytes(_peak_rss)))
+
+    return '\n'.join(table_lines)
+
+def write_stats_json(_json_filename, _metrics):
+    """Function to write the run metrics as JSON
+
+    Arguments:
+        _json_filename {str} -- JSON file name
+        _metrics {dict} -- run metrics
+    """
+    with open(_json_filename, 'wt') as file:
+        json.dump(_metrics, file, indent=2)
+
+def get_run_metrics(_script_name, _file_results, _wall_time, _peak_rss):
+    """Function to build the machine-readable metrics of a run
+
+    Arguments:
+        _script_name {str} -- name of the post-processing script
+        _file_results {list} -- (file name, phase records, error message) of each file
+        _wall_time {float} -- wall time of the whole run (s)
+        _peak_rss {int} -- peak resident memory of the whole run (bytes), or None
+
+    Returns:
+        dict:metrics -- run totals, phase totals with throughputs and per-file phase records
+    """
+    total_stats = merge_stats([file_stats for _, file_stats, _ in _file_results])
+    for record in total_stats.values():
+        record['throughput'] = get_throughput(record)
+
+    return {'script': _script_name,
+            'wall_time': _wall_time,
+            'peak_rss': _peak_rss,
+            'files_number': len(_file_results),
+            'errors_number': sum(error is not None for _, _, error in _file_results),
+            'phases': total_stats,
+            'files': [{'file': filename, 'phases': file_stats, 'error': error}
+                      for filename, file_stats, error in _file_results]}
+
+def start_profile(_profile_filename):
+    """Function to start profiling this process with cProfile
+
+    Arguments:
+        _profile_filename {str} -- cProfile output file name, or None to skip profiling
+
+    Returns:
+        obj:profiler -- running profiler, or None
+    """
+    if _profile_filename is None:
+        return None
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    return profiler
+
+def stop_profile(_profiler, _profile_filename):
+    """Function to stop profiling and dump the statistics (readable by pstats or snakeviz)
+
+    Arguments:
+        _profiler {obj} -- running profiler, or None
+        _profile_filename {str} -- cProfile output file name
+    """
+    if _profiler is None:
+        return
+
+    _profiler.disable()
+    _profiler.dump_stats(_profile_filename)
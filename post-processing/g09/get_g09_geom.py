@@ -10,30 +10,88 @@
 ### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
 ####################################################################################################
 #                                                                                                  #
-# Usage: get_g09_geom.py <LOG-FILE> -n <STEP> -f <ORIENTATION>                                     #
+# Usage: get_g09_geom.py <LOG-FILE> [<LOG-FILE> ...] -n <STEP> -f <ORIENTATION> [--no-cache]       #
+#                        [-j <JOBS>] [--combine <XYZ-FILE>] [--follow [--interval <SECONDS>]]      #
+#                        [--stats] [--stats-json <JSON-FILE>] [--profile <PROF-FILE>]              #
 #                                                                                                  #
 # Step options:                                                                                    #
 #               . 'N':   Get geometry from step number N (positive integer number)                 #
 #               . 'opt': Get the optimized geometry (default)                                      #
 #               . '-1':  Get the geometry of last optimization step                                #
+#                        ('opt' and '-1' are read backwards from the end of the log file)          #
+#               . 'all': Get all geometries as a multi-frame XYZ trajectory                        #
+#               . 'start:stop:stride': Get a slice of steps as a multi-frame XYZ trajectory        #
 #                                                                                                  #
 # Orientation options:                                                                             #
 #               . 'input' (default)                                                                #
 #               . 'standard'                                                                       #
 #               . 'zmat'                                                                           #
+#                                                                                                  #
+# Index cache:                                                                                     #
+#               . Marker offsets are kept in '<LOG-FILE>.g09idx' to be reused by later runs        #
+#               . '--no-cache': do not read or write the index file                                #
+#                                                                                                  #
+# Batch options:                                                                                   #
+#               . Log files may be given as several names, glob patterns or folders                #
+#               . '-j': Number of parallel processes (default: 1)                                  #
+#               . '--combine': Write all geometries to a single multi-structure XYZ file           #
+#                                                                                                  #
+# Follow options:                                                                                  #
+#               . '--follow': Append new geometries of a running job to '<LOG>.all.xyz'            #
+#               . '--interval': Seconds between checks of the log file (default: 2)                #
+#               . Following ends once the log file stays unchanged after a termination line,       #
+#                 and goes on through the sub-jobs of Link1 jobs (e.g. opt+freq)                   #
+#                                                                                                  #
+# Statistics options:                                                                              #
+#               . '--stats':      Report wall time, bytes, lines, MB/s and peak memory of each     #
+#                                 phase (index, read, format, write)                               #
+#               . '--stats-json': Write these statistics, per file and in total, to a JSON file    #
+#               . '--profile':    Dump cProfile statistics (files run in a single process)         #
 ####################################################################################################
 
 #################################################
 ###              Loading modules              ###
 #################################################
 ##      Operating System Interfaces Module     ##
-from os import path
+from os import path, stat
 ##   System-specific parameters and functions  ##
 import sys
 ##       Parser for command-line options       ##
 import argparse
+##           Time access Module                ##
+import time
+##     Unix style pathname pattern expansion   ##
+from glob import glob
+##      Launching parallel tasks Module        ##
+from concurrent.futures import ProcessPoolExecutor
+##       JSON encoder and decoder Module       ##
+import json
+##      Secure hashes and digests Module       ##
+import hashlib
+##   CompChemTools g09 geometry reader Module  ##
+try:
+    from compchemtools import g09, compressed, stats
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import g09, compressed, stats
 #################################################
 
+## Extensions of g09 Log Files searched in folders
+G09_LOG_EXTENSIONS = ['.log', '.out']
+
+## Markers of finished g09 jobs, which end follow mode
+G09_TERMINATION_MARKERS = ['Normal termination', 'Error termination']
+
+## Markers of the next sub-job of Link1 jobs, which resume follow mode after a termination
+G09_LINK1_MARKERS = ['Link1:', 'Initial command:']
+
+## On-disk index of g09 Log Files ('<LOG-FILE>.g09idx')
+G09_INDEX_EXTENSION = '.g09idx'
+G09_INDEX_VERSION = 1
+
+## Size of the head and tail regions of g09 Log Files used as index key (bytes)
+G09_CHECKSUM_SIZE = 64 * 1024
+
 def print_script_output(_text, _type):
     """Function to print colored terminal messages
 
@@ -54,216 +112,641 @@ def get_arguments():
     """
     parser = argparse.ArgumentParser()
 
-    parser.add_argument('g09_log_file',
+    parser.add_argument('g09_log_files',
                         type=str,
-                        help='gaussian09 output filename (usually .log extension)')
+                        nargs='+',
+                        help='gaussian09 output filenames (usually .log extension), '
+                             'glob patterns or folders')
 
     parser.add_argument('-n', dest='step',
                         type=str,
                         default='opt',
-                        help='number of the optimization step to be extracted')
+                        help='number of the optimization step to be extracted '
+                             '(\'all\' or \'start:stop:stride\' for trajectories)')
 
     parser.add_argument('-f', dest='format',
                         type=str,
                         default='input',
-                        choices=['input', 'standard', 'zmat'],
+                        choices=g09.G09_ORIENTATIONS,
                         help='cartesian coordinates format from gaussian09')
 
+    parser.add_argument('--no-cache', dest='use_cache',
+                        action='store_false',
+                        help='do not read or write the \'.g09idx\' index file')
+
+    parser.add_argument('-j', dest='jobs',
+                        type=int,
+                        default=1,
+                        help='number of parallel processes used for several output files')
+
+    parser.add_argument('--combine', dest='combined_xyz_file',
+                        type=str,
+                        default=None,
+                        help='write all geometries to a single multi-structure XYZ file')
+
+    parser.add_argument('--follow', dest='follow',
+                        action='store_true',
+                        help='follow a running job, appending each new geometry to the '
+                             'trajectory XYZ file')
+
+    parser.add_argument('--interval', dest='follow_interval',
+                        type=float,
+                        default=2.0,
+                        help='seconds between checks of the log file in follow mode')
+
+    parser.add_argument('--stats', dest='stats',
+                        action='store_true',
+                        help='report time, bytes, lines, throughput and peak memory of each phase')
+
+    parser.add_argument('--stats-json', dest='stats_json_file',
+                        type=str,
+                        default=None,
+                        help='write phase statistics to a JSON file')
+
+    parser.add_argument('--profile', dest='profile_file',
+                        type=str,
+                        default=None,
+                        help='dump cProfile statistics of the run (files run in a single process)')
+
     args = parser.parse_args()
 
-    # Convert the number of steps to integers
-    if args.step.lower() != 'opt':
-        args.step = int(args.step)
+    # Convert the number of steps to integers, or to a slice of steps for trajectories
+    try:
+        args.step = g09.parse_g09_step(args.step)
+    except (TypeError, ValueError):
+        parser.error('invalid step option: {}'.format(args.step))
+
+    if args.jobs < 1:
+        parser.error('number of parallel processes must be positive')
+
+    # Follow mode writes every geometry, as the 'all' step option
+    if args.follow:
+        if len(args.g09_log_files) > 1:
+            parser.error('follow mode accepts a single gaussian09 output file')
+        args.step = slice(None)
+
+    # JSON statistics are measured as '--stats' ones
+    args.stats = args.stats or args.stats_json_file is not None
 
     return args
 
-def open_g09_file(_arguments):
-    """Function to read g09 Log File
+def get_g09_log_files(_arguments):
+    """Function to expand folders and glob patterns given by user into g09 Log File names
 
     Arguments:
         _arguments {obj} -- arguments given by user
 
     Returns:
-        list:g09_log -- list containing g09 Log File as strings in lines
+        list:g09_log_files -- g09 Log File names
     """
-    if path.isfile(_arguments.g09_log_file):
-        with open(_arguments.g09_log_file, 'rt') as file:
-            g09_log = file.readlines()
-            return g09_log
+    g09_log_files = []
+
+    for g09_log_pattern in _arguments.g09_log_files:
+        if path.isdir(g09_log_pattern):
+            for extension in G09_LOG_EXTENSIONS:
+                for compressed_extension in [''] + compressed.COMPRESSED_EXTENSIONS:
+                    g09_log_files.extend(sorted(glob(
+                        path.join(g09_log_pattern, '*' + extension + compressed_extension))))
+        elif any(character in g09_log_pattern for character in '*?['):
+            g09_log_files.extend(sorted(glob(g09_log_pattern)))
+        else:
+            g09_log_files.append(g09_log_pattern)
+
+    return g09_log_files
+
+def get_g09_checksum(_g09_log_file, _offset, _size):
+    """Function to compute the checksum of a region of g09 Log File
+
+    Arguments:
+        _g09_log_file {str} -- g09 Log File name
+        _offset {int} -- byte offset of the region
+        _size {int} -- size of the region (bytes)
+
+    Returns:
+        str:checksum -- MD5 hex digest of the region
+    """
+    with open(_g09_log_file, 'rb') as file:
+        file.seek(_offset)
+        return hashlib.md5(file.read(_size)).hexdigest()
+
+def load_g09_index_cache(_g09_log_file):
+    """Function to load the on-disk index of g09 Log File
+
+    Arguments:
+        _g09_log_file {str} -- g09 Log File name
+
+    Returns:
+        dict:g09_index -- cached index, or None if it does not exist or is unreadable
+    """
+    try:
+        with open(_g09_log_file + G09_INDEX_EXTENSION, 'rt') as file:
+            g09_index = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if g09_index.get('version') != G09_INDEX_VERSION:
+        return None
+
+    return g09_index
+
+def write_g09_index_cache(_g09_log_file, _g09_index):
+    """Function to write the on-disk index of g09 Log File
+
+    The index is silently not written when the Log File folder is read-only.
+
+    Arguments:
+        _g09_log_file {str} -- g09 Log File name
+        _g09_index {dict} -- index of g09 Log File
+    """
+    try:
+        with open(_g09_log_file + G09_INDEX_EXTENSION, 'wt') as file:
+            json.dump(_g09_index, file)
+    except OSError:
+        pass
+
+def index_g09_file(_arguments, _file=None, _g09_stats=None):
+    """Function to index g09 Log File
+
+    The index is kept in a '<LOG-FILE>.g09idx' file, keyed on file size, modification time and
+    head/tail checksums. A Log File grown since the last run (e.g. a running job) only has its
+    new bytes scanned, any other change rebuilds the index from the beginning.
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _file {obj} -- g09 Log File reader (compchemtools.compressed.open_file), or None to open
+                       it here
+        _g09_stats {dict} -- phase statistics counting the scanned bytes, or None
+
+    Returns:
+        dict:g09_index -- byte offsets of marker lines ('offsets'), atoms and steps numbers
+    """
+    g09_log_file = _arguments.g09_log_file
+    g09_source = g09_log_file if _file is None else _file
+
+    if not path.isfile(g09_log_file):
+        raise g09.G09LogError(
+            '> Gaussian09 output file {} was not found.'.format(g09_log_file))
+
+    file_stat = stat(g09_log_file)
+    g09_index = None
+    if _arguments.use_cache:
+        g09_index = load_g09_index_cache(g09_log_file)
+
+    if g09_index is not None:
+        scanned_size = g09_index['scanned_size']
+        # Checksums only cover the scanned bytes, which a grown Log File keeps unchanged
+        tail_offset = max(scanned_size - G09_CHECKSUM_SIZE, 0)
+        unchanged_prefix = (
+            file_stat.st_size >= g09_index['size']
+            and g09_index['head_checksum'] == get_g09_checksum(
+                g09_log_file, 0, min(scanned_size, G09_CHECKSUM_SIZE))
+            and g09_index['tail_checksum'] == get_g09_checksum(
+                g09_log_file, tail_offset, scanned_size - tail_offset))
+
+        if not unchanged_prefix:
+            g09_index = None
+        elif (file_stat.st_size == g09_index['size']
+                and file_stat.st_mtime == g09_index['mtime']):
+            return g09_index
+        elif compressed.get_compression(g09_source) is not None:
+            # Checksums are taken on compressed bytes, so compressed Log Files are not extended
+            g09_index = None
+
+    if g09_index is None:
+        scanned_size = 0
+        marker_offsets = {marker_key: [] for marker_key in g09.G09_INDEX_MARKERS}
     else:
-        print_script_output(
-            '> Gaussian09 output file {} was not found.'.format(_arguments.g09_log_file),
-            'error')
-        sys.exit()
+        # Marker lines after the last complete line are scanned again
+        marker_offsets = {
+            marker_key: [offset for offset in offsets if offset < scanned_size]
+            for marker_key, offsets in g09_index['offsets'].items()}
+
+    # Marker lines needed by get_g09_counts are kept while scanning, so compressed streams are
+    # not read again from their beginning
+    count_lines = {}
+    with g09.open_g09_source(g09_source) as file:
+        new_marker_offsets, scanned_size = g09.scan_g09_file(file, scanned_size, count_lines,
+                                                             _g09_stats)
+        for marker_key, offsets in new_marker_offsets.items():
+            marker_offsets[marker_key].extend(offsets)
+
+        atoms_number, total_steps = g09.get_g09_counts(file, marker_offsets, count_lines)
+
+    tail_offset = max(scanned_size - G09_CHECKSUM_SIZE, 0)
+    g09_index = {
+        'version': G09_INDEX_VERSION,
+        'size': file_stat.st_size,
+        'mtime': file_stat.st_mtime,
+        'head_checksum': get_g09_checksum(g09_log_file, 0, min(scanned_size, G09_CHECKSUM_SIZE)),
+        'tail_checksum': get_g09_checksum(g09_log_file, tail_offset, scanned_size - tail_offset),
+        'scanned_size': scanned_size,
+        'offsets': marker_offsets,
+        'atoms_number': atoms_number,
+        'total_steps': total_steps
+    }
+
+    if _arguments.use_cache:
+        write_g09_index_cache(g09_log_file, g09_index)
 
-def get_g09_geometry(_arguments, _g09_log):
+    return g09_index
+
+def get_g09_geometry(_arguments, _g09_index, _file=None):
     """Function to obtaining g09 selected geometry
 
     Arguments:
         _arguments {obj} -- arguments from Terminal
-        _g09_log {list} -- variable containing g09 Log File as strings in lines
+        _g09_index {dict} -- byte offsets of g09 Log File marker lines
+        _file {obj} -- g09 Log File reader (compchemtools.compressed.open_file), or None to open
+                       it here
 
     Returns:
-        list:_g09_log[start_line: start_line + atoms_number] -- strings of chosen geometry
+        str:g09_raw_geometry -- lines of chosen geometry
     """
-    format_start_string = {
-        'input': 'Input orientation:',
-        'standard': 'Standard orientation:',
-        'zmat': 'Z-Matrix orientation:'
-    }
+    block_offset = g09.select_g09_block(_g09_index, _arguments.step, _arguments.format,
+                                        _arguments.g09_log_file)
+    lines_number = g09.G09_BLOCK_HEADER_LINES + _g09_index['atoms_number']
 
-    for line in range(len(_g09_log)):
-        if 'NAtoms' in _g09_log[line]:
-            atoms_number = _g09_log[line].strip().split()[1]
-            atoms_number = int(atoms_number)
-            break
+    with g09.open_g09_source(_arguments.g09_log_file if _file is None else _file) as file:
+        g09_lines = g09.read_g09_lines(file, block_offset, lines_number)
 
-    if 'atoms_number' not in locals():
-        print_script_output(
-            '> Number of atoms was not found in {} Gaussian09 output.'
-                .format(_arguments.g09_log_file),
-            'error')
-        sys.exit()
+    return ''.join(g09_lines[g09.G09_BLOCK_HEADER_LINES:])
+
+def get_g09_trajectory(_arguments, _g09_index, _file=None):
+    """Function to obtaining a slice of g09 geometries as a trajectory
+
+    Arguments:
+        _arguments {obj} -- arguments from Terminal
+        _g09_index {dict} -- byte offsets of g09 Log File marker lines
+        _file {obj} -- g09 Log File reader (compchemtools.compressed.open_file), or None to open
+                       it here
 
-    if _arguments.step == 'opt':
-        for line in range(len(_g09_log)):
-            if 'Stationary point found' in _g09_log[line]:
-                stationary_line = line
-                break
-
-        if 'stationary_line' not in locals():
-            print_script_output(
-                '> Stationary point was not found in {} Gaussian09 output.'
-                    .format(_arguments.g09_log_file),
-                'error')
-            sys.exit()
-
-        for line in range(stationary_line, len(_g09_log)):
-            if format_start_string[_arguments.format] in _g09_log[line]:
-                start_line = line + 5
-
-    elif _arguments.step >= 0:
-        step_count = 0
-        for line in range(len(_g09_log)):
-            if format_start_string[_arguments.format] in _g09_log[line]:
-                step_count += 1
-
-            if step_count > _arguments.step:
-                start_line = line + 5
-                break
-
-        if 'start_line' not in locals():
-            print_script_output(
-                '> Step {} was not found in {} Gaussian09 output.'
-                    .format(_arguments.step, _arguments.g09_log_file),
-                'error')
-            sys.exit()
-
-    elif _arguments.step < 0:
-        for line in reversed(range(len(_g09_log))):
-            if 'Step number' in _g09_log[line]:
-                total_steps = int(_g09_log[line].strip().split()[2])
-                break
-
-        if _arguments.step + total_steps < 0:
-            print_script_output(
-                '> Step {} was not found in {} steps of {} Gaussian09 output.'
-                    .format(_arguments.step + total_steps, total_steps, _arguments.g09_log_file),
-                'error')
-            sys.exit()
-
-        step_count = 0
-        for line in range(len(_g09_log)):
-            if format_start_string[_arguments.format] in _g09_log[line]:
-                step_count += 1
-
-            if step_count > _arguments.step + total_steps:
-                start_line = line + 5
-                break
-
-    return _g09_log[start_line: start_line + atoms_number]
-
-def format_g09_geometry(_arguments, _g09_raw_geometry):
-    """Function to format g09 geometry
+    Returns:
+        str:g09_raw_trajectory -- lines of chosen geometries
+    """
+    block_offsets = _g09_index['offsets'][_arguments.format][_arguments.step]
+
+    with g09.open_g09_source(_arguments.g09_log_file if _file is None else _file) as file:
+        return g09.read_g09_trajectory(file, block_offsets, _g09_index['atoms_number'],
+                                       _arguments.g09_log_file)
+
+def get_g09_tail_geometry(_arguments, _file=None):
+    """Function to obtaining the optimized ('opt') or last step ('-1') geometry from file end
+
+    Arguments:
+        _arguments {obj} -- arguments from Terminal
+        _file {obj} -- g09 Log File reader (compchemtools.compressed.open_file), or None to open
+                       it here
+
+    Returns:
+        str:g09_raw_geometry -- lines of chosen geometry
+        int:atoms_number -- number of atoms
+    """
+    if not path.isfile(_arguments.g09_log_file):
+        raise g09.G09LogError(
+            '> Gaussian09 output file {} was not found.'.format(_arguments.g09_log_file))
+
+    with g09.open_g09_source(_arguments.g09_log_file if _file is None else _file) as file:
+        return g09.get_g09_tail_geometry(file, _arguments.step, _arguments.format,
+                                         _arguments.g09_log_file)
+
+def format_g09_geometry(_arguments, _g09_raw_geometry, _atoms_number):
+    """Function to format g09 geometry, or trajectory, parsing all lines in bulk
 
     Arguments:
         _arguments {obj} -- arguments given by user
-        _g09_raw_geometry {list} -- chosen geometry read from g09 log file
+        _g09_raw_geometry {str} -- chosen geometry (or geometries) read from g09 log file
+        _atoms_number {int} -- number of atoms
 
     Returns:
-        list:geometry -- formatted geometry with splitted attributes
+        Geometry:geometry -- atomic numbers and cartesian coordinates
     """
-    atom = {}
-    geometry = []
+    return g09.format_g09_geometry(_g09_raw_geometry, _atoms_number,
+                                   isinstance(_arguments.step, slice), _arguments.g09_log_file)
+
+def get_frames_number(_g09_geometry):
+    """Function to count the frames of a formatted geometry (or trajectory)
+
+    Arguments:
+        _g09_geometry {Geometry} -- formatted geometry (or trajectory)
 
-    for line in range(len(_g09_raw_geometry)):
-        (atom['center'], atom['atomic_number'], atom['atomic_type'],
-            atom['x'], atom['y'], atom['z']) = _g09_raw_geometry[line].strip().split()
-        geometry.append(atom.copy())
+    Returns:
+        int:frames_number -- number of geometries
+    """
+    return _g09_geometry.coordinates.size // (3 * len(_g09_geometry.atomic_numbers))
 
-    return geometry
+def get_xyz_filename(_arguments):
+    """Function to build the '.xyz' filename from g09 Log File name and step option
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+
+    Returns:
+        str:geometry_filename -- name of the '.xyz' file
+    """
+    if _arguments.step == slice(None):
+        step_label = 'all'
+    elif isinstance(_arguments.step, slice):
+        step_label = '_'.join('' if value is None else str(value) for value in
+                              (_arguments.step.start, _arguments.step.stop, _arguments.step.step))
+    else:
+        step_label = str(_arguments.step)
+
+    geometry_filename = path.splitext(compressed.strip_compressed_extension(
+        _arguments.g09_log_file))[0] + '.' + step_label + '.xyz'
+
+    return geometry_filename
 
 def write_xyz_geometry(_arguments, _g09_geometry):
-    """Function to write the '.xyz' file
-    
+    """Function to write the '.xyz' file in a single write
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _g09_geometry {Geometry} -- formatted geometry (or trajectory)
+    """
+    with open(get_xyz_filename(_arguments), 'w') as geometry_file:
+        geometry_file.write(g09.format_xyz_geometry(_g09_geometry))
+
+def write_combined_xyz_geometry(_arguments, _g09_geometries):
+    """Function to write the geometries of several g09 Log Files to a single '.xyz' file
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _g09_geometries {list} -- pairs of g09 Log File name and formatted geometry
+    """
+    with open(_arguments.combined_xyz_file, 'w') as geometry_file:
+        geometry_file.write(''.join(g09.format_xyz_geometry(g09_geometry, g09_log_file)
+                                    for g09_log_file, g09_geometry in _g09_geometries))
+
+def process_g09_file(_arguments):
+    """Function to obtain the selected geometry of one g09 Log File
+
+    The '.xyz' file is written by this function unless geometries are combined in a single file.
+
+    Arguments:
+        _arguments {obj} -- arguments given by user, with a single 'g09_log_file'
+
+    Returns:
+        str:g09_log_file -- g09 Log File name
+        Geometry:g09_geometry -- formatted geometry, or None if it was not obtained
+        str:error_message -- error message, or None if the geometry was obtained
+        dict:g09_stats -- phase statistics, or None without '--stats'
+    """
+    g09_stats = stats.new_stats(_arguments.stats)
+
+    try:
+        if not path.isfile(_arguments.g09_log_file):
+            raise g09.G09LogError(
+                '> Gaussian09 output file {} was not found.'.format(_arguments.g09_log_file))
+
+        # g09 Log File is opened once, so its compression (and BGZF or seekable zstd block table)
+        # is only read once
+        with compressed.open_file(_arguments.g09_log_file, 'rb') as file:
+            # Obtaining g09 selected geometry (or trajectory)
+            if (_arguments.step == 'opt' or _arguments.step == -1) \
+                    and compressed.has_random_access(file):
+                # Optimized and last step geometries are read from the end of g09 Log File
+                with stats.measure_phase(g09_stats, 'read') as read_record:
+                    g09_raw_geometry, atoms_number = get_g09_tail_geometry(_arguments, file)
+
+            else:
+                # Indexing g09 Log File
+                with stats.measure_phase(g09_stats, 'index'):
+                    g09_index = index_g09_file(_arguments, file, g09_stats)
+                atoms_number = g09_index['atoms_number']
+
+                with stats.measure_phase(g09_stats, 'read') as read_record:
+                    if isinstance(_arguments.step, slice):
+                        g09_raw_geometry = get_g09_trajectory(_arguments, g09_index, file)
+                    else:
+                        g09_raw_geometry = get_g09_geometry(_arguments, g09_index, file)
+
+        # Formatting g09 geometry to output format
+        with stats.measure_phase(g09_stats, 'format') as format_record:
+            g09_geometry = format_g09_geometry(_arguments, g09_raw_geometry, atoms_number)
+        frames_number = get_frames_number(g09_geometry)
+        stats.count_text(read_record, g09_raw_geometry, frames_number)
+        stats.count_text(format_record, g09_raw_geometry, frames_number)
+
+        # Writing the '.xyz' file
+        if _arguments.combined_xyz_file is None:
+            with stats.measure_phase(g09_stats, 'write') as write_record:
+                write_xyz_geometry(_arguments, g09_geometry)
+                stats.add_counts(write_record, path.getsize(get_xyz_filename(_arguments)),
+                                 frames_number * (len(g09_geometry.atomic_numbers) + 2),
+                                 frames_number)
+
+    except (g09.G09LogError, OSError, EOFError, ValueError) as error:
+        return _arguments.g09_log_file, None, str(error), g09_stats
+
+    return _arguments.g09_log_file, g09_geometry, None, g09_stats
+
+def parse_g09_follow_lines(_arguments, _follow_state, _g09_text):
+    """Function to parse complete lines appended to g09 Log File in follow mode
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _follow_state {dict} -- incremental parser state (offset, partial line, current block)
+        _g09_text {str} -- complete (newline ended) lines
+
+    Returns:
+        list:new_geometries -- geometries (Geometry) of the orientation blocks finished
+    """
+    orientation_marker = g09.G09_INDEX_MARKERS[_arguments.format].decode('ascii')
+    new_geometries = []
+
+    for line in _g09_text.splitlines(True):
+        block = _follow_state['block']
+
+        if block is not None:
+            if block['header_lines'] < 4:
+                block['header_lines'] += 1
+            elif line.lstrip().startswith('---'):
+                new_geometries.append(format_g09_geometry(
+                    _arguments, ''.join(block['lines']), len(block['lines'])))
+                _follow_state['block'] = None
+            else:
+                block['lines'].append(line)
+
+        elif orientation_marker in line:
+            _follow_state['block'] = {'header_lines': 0, 'lines': []}
+
+        elif 'SCF Done' in line:
+            _follow_state['energy'] = line.split()[4]
+
+        elif 'Step number' in line:
+            frames_number = _follow_state['frames'] + len(new_geometries)
+            if _follow_state['energy'] is None:
+                print('> Step {} ({} geometries)'.format(line.split()[2], frames_number))
+            else:
+                print('> Step {}: E = {} Hartree ({} geometries)'.format(
+                    line.split()[2], _follow_state['energy'], frames_number))
+
+        elif 'Stationary point found' in line:
+            print('> Stationary point found.')
+
+        elif any(marker in line for marker in G09_TERMINATION_MARKERS):
+            print('> ' + line.strip())
+            _follow_state['terminated'] = True
+
+        elif any(marker in line for marker in G09_LINK1_MARKERS):
+            _follow_state['terminated'] = False
+
+    return new_geometries
+
+def update_g09_follow(_arguments, _follow_state):
+    """Function to parse the bytes appended to g09 Log File since the last update
+
+    Finished orientation blocks are appended to the trajectory '.xyz' file, and new energies,
+    steps and stationary points are reported. New bytes are read in chunks of G09_CHUNK_SIZE and
+    only complete lines are parsed, the partial last line is kept in the follow state until it is
+    finished.
+
     Arguments:
         _arguments {obj} -- arguments given by user
-        _g09_geometry {list} -- formmated geometry
+        _follow_state {dict} -- incremental parser state (offset, partial line, current block)
+
+    Returns:
+        bool:job_finished -- True if the Log File is unchanged since a termination line, which
+                             was not followed by another Link1 sub-job
     """
+    file_changed = False
+
+    with open(_arguments.g09_log_file, 'rb') as file:
+        # Log File replaced by a shorter one (e.g. job restarted)
+        if file.seek(0, 2) < _follow_state['offset']:
+            _follow_state.update(offset=0, remainder=b'', block=None, frames=0, terminated=False)
+            open(get_xyz_filename(_arguments), 'w').close()
+
+        file.seek(_follow_state['offset'])
+
+        for new_bytes in iter(lambda: file.read(g09.G09_CHUNK_SIZE), b''):
+            file_changed = True
+            _follow_state['offset'] += len(new_bytes)
+            buffer = _follow_state['remainder'] + new_bytes
+            buffer_end = buffer.rfind(b'\n') + 1
+            _follow_state['remainder'] = buffer[buffer_end:]
 
-    ## Defining dictionary from Atomic Numbers to Atomic Symbols
-    atomic_numbers_dictionary = {
-        '1': 'H',  '2': 'He',	'3': 'Li',	'4': 'Be',	'5': 'B',	'6': 'C',
-        '7': 'N',	'8': 'O',	'9': 'F',	'10': 'Ne',	'11': 'Na',	'12': 'Mg',
-        '13': 'Al',	'14': 'Si',	'15': 'P',	'16': 'S',	'17': 'Cl',	'18': 'Ar',
-        '19': 'K',	'20': 'Ca',	'21': 'Sc',	'22': 'Ti',	'23': 'V',	'24': 'Cr',
-        '25': 'Mn',	'26': 'Fe',	'27': 'Co',	'28': 'Ni',	'29': 'Cu',	'30': 'Zn',
-        '31': 'Ga',	'32': 'Ge',	'33': 'As',	'34': 'Se',	'35': 'Br',	'36': 'Kr',
-        '37': 'Rb',	'38': 'Sr',	'39': 'Y',	'40': 'Zr',	'41': 'Nb',	'42': 'Mo',
-        '43': 'Tc',	'44': 'Ru',	'45': 'Rh',	'46': 'Pd',	'47': 'Ag',	'48': 'Cd',
-        '49': 'In',	'50': 'Sn',	'51': 'Sb',	'52': 'Te',	'53': 'I',	'54': 'Xe',
-        '55': 'Cs',	'56': 'Ba',	'57': 'La',	'58': 'Ce',	'59': 'Pr',	'60': 'Nd',
-        '61': 'Pm',	'62': 'Sm',	'63': 'Eu',	'64': 'Gd',	'65': 'Tb',	'66': 'Dy',
-        '67': 'Ho',	'68': 'Er',	'69': 'Tm',	'70': 'Yb',	'71': 'Lu',	'72': 'Hf',
-        '73': 'Ta',	'74': 'W',	'75': 'Re',	'76': 'Os',	'77': 'Ir',	'78': 'Pt',
-        '79': 'Au',	'80': 'Hg',	'81': 'Tl',	'82': 'Pb',	'83': 'Bi',	'84': 'Po',
-        '85': 'At',	'86': 'Rn',	'87': 'Fe',	'88': 'Ra',	'89': 'Ac',	'90': 'Th',
-        '91': 'Pa',	'92': 'U',	'93': 'Np',	'94': 'Pu',	'95': 'Am',	'96': 'Cm',
-        '97': 'Bk',	'98': 'Cf',	'99': 'Es',	'100': 'Fm', '101': 'Md', '102': 'No',
-        '103': 'Lr', '104': 'Rf', '105': 'Db', '106': 'Sg', '107': 'Bh', '108': 'Hs',
-        '109': 'Mt', '110': 'Ds', '111': 'Rg', '112': 'Cn', '113': 'Uut', '114': 'Fl',
-        '115': 'Uup', '116': 'Lv', '117': 'Uus', '118': 'Uuo',  '-1': 'X', '-2': 'Tv' }
-
-    geometry_filename = _arguments.g09_log_file
-    geometry_filename = geometry_filename.split('.')[0:-1][0] + '.' + str(_arguments.step) + '.xyz'
-
-    with open(geometry_filename, 'w') as geometry_file:
-        geometry_file.write('{}\n\n'.format(len(_g09_geometry)))
-
-        for atom in _g09_geometry:
-            geometry_file.write('{:}\t{:>10}\t{:>10}\t{:>10}\n'
-                            .format(atomic_numbers_dictionary[atom['atomic_number']],
-                                    atom['x'], atom['y'], atom['z']))
+            new_geometries = parse_g09_follow_lines(
+                _arguments, _follow_state, buffer[:buffer_end].decode('ascii', 'replace'))
+
+            if new_geometries:
+                _follow_state['frames'] += len(new_geometries)
+                with open(get_xyz_filename(_arguments), 'a') as geometry_file:
+                    geometry_file.write(''.join(g09.format_xyz_geometry(g09_geometry)
+                                                for g09_geometry in new_geometries))
+
+    return _follow_state['terminated'] and not file_changed
+
+def follow_g09_file(_arguments):
+    """Function to follow a running g09 job, as 'tail -f', until it terminates
+
+    Arguments:
+        _arguments {obj} -- arguments given by user, with a single 'g09_log_file'
+    """
+    if not path.isfile(_arguments.g09_log_file):
+        raise g09.G09LogError(
+            '> Gaussian09 output file {} was not found.'.format(_arguments.g09_log_file))
+
+    follow_state = {'offset': 0, 'remainder': b'', 'block': None, 'energy': None, 'frames': 0,
+                    'terminated': False}
+    open(get_xyz_filename(_arguments), 'w').close()
+
+    while not update_g09_follow(_arguments, follow_state):
+        time.sleep(_arguments.follow_interval)
 
 # Main program
 if __name__ == '__main__':
 
     # Obtaining arguments from terminal
     arguments = get_arguments()
+    run_start = time.perf_counter()
+    profiler = stats.start_profile(arguments.profile_file)
+
+    # Expanding folders and glob patterns into g09 Log Files
+    g09_log_files = get_g09_log_files(arguments)
+    g09_arguments = [argparse.Namespace(**vars(arguments), g09_log_file=g09_log_file)
+                     for g09_log_file in g09_log_files]
+
+    if not g09_log_files:
+        print_script_output('> No Gaussian09 output files were found.', 'error')
+        sys.exit(1)
+
+    # Following a running g09 job
+    if arguments.follow:
+        try:
+            follow_g09_file(g09_arguments[0])
+        except g09.G09LogError as error:
+            print_script_output(str(error), 'error')
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
 
-    # Reading g09 Log File
-    g09_log = open_g09_file(arguments)
-
-    # Obtaining g09 selected geometry
-    g09_raw_geometry = get_g09_geometry(arguments, g09_log)
-
-    # Formatting g09 geometry to output format
-    g09_geometry = format_g09_geometry(arguments, g09_raw_geometry)
+        print_script_output(
+            '> Geometries from {} sucessfully exported to XYZ file!'.format(g09_log_files[0]),
+            'job_done')
+        sys.exit()
 
-    # Writing the '.xyz' file
-    write_xyz_geometry(arguments, g09_geometry)
+    # Obtaining g09 selected geometries, in parallel for several output files
+    if arguments.jobs > 1 and len(g09_log_files) > 1 and profiler is None:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            g09_results = list(executor.map(process_g09_file, g09_arguments))
+    else:
+        g09_results = [process_g09_file(g09_argument) for g09_argument in g09_arguments]
+
+    g09_errors = [(g09_log_file, error_message)
+                  for g09_log_file, _, error_message, _ in g09_results
+                  if error_message is not None]
+    g09_stats = [(g09_log_file, g09_file_stats, error_message)
+                 for g09_log_file, _, error_message, g09_file_stats in g09_results]
+
+    # Writing the combined '.xyz' file
+    if arguments.combined_xyz_file is not None:
+        combined_stats = stats.new_stats(arguments.stats)
+        g09_geometries = [(g09_log_file, g09_geometry)
+                          for g09_log_file, g09_geometry, _, _ in g09_results
+                          if g09_geometry is not None]
+        with stats.measure_phase(combined_stats, 'write') as write_record:
+            write_combined_xyz_geometry(arguments, g09_geometries)
+            stats.add_counts(write_record, path.getsize(arguments.combined_xyz_file),
+                             sum(get_frames_number(g09_geometry)
+                                 * (len(g09_geometry.atomic_numbers) + 2)
+                                 for _, g09_geometry in g09_geometries),
+                             sum(get_frames_number(g09_geometry)
+                                 for _, g09_geometry in g09_geometries))
+        g09_stats.append((arguments.combined_xyz_file, combined_stats, None))
+
+    stats.stop_profile(profiler, arguments.profile_file)
+
+    # Reporting phase statistics
+    if arguments.stats:
+        run_time = time.perf_counter() - run_start
+        peak_rss = stats.get_peak_rss(_children=True)
+        print(stats.format_stats(stats.merge_stats([g09_file_stats for _, g09_file_stats, _
+                                                    in g09_stats]),
+                                 run_time, peak_rss))
+        if arguments.stats_json_file is not None:
+            stats.write_stats_json(arguments.stats_json_file, stats.get_run_metrics(
+                path.basename(__file__), g09_stats, run_time, peak_rss))
+
+    # Summary of errors
+    if len(g09_results) > 1 and g09_errors:
+        print_script_output(
+            '> Geometries were not obtained from {} of {} Gaussian09 outputs:'
+                .format(len(g09_errors), len(g09_results)),
+            'error')
+    for _, error_message in g09_errors:
+        print_script_output(error_message, 'error')
 
     # End of get_g09_geom.py execution
-    print_script_output(
-        '> Geometry from {} sucessfully exported to XYZ file!'.format(arguments.g09_log_file),
-        'job_done')
+    if len(g09_results) == 1 and not g09_errors:
+        print_script_output(
+            '> Geometry from {} sucessfully exported to XYZ file!'.format(g09_log_files[0]),
+            'job_done')
+    elif len(g09_results) > len(g09_errors):
+        print_script_output(
+            '> Geometries from {} Gaussian09 outputs sucessfully exported to XYZ files!'
+                .format(len(g09_results) - len(g09_errors)),
+            'job_done')
+
+    if g09_errors:
+        sys.exit(1)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                         get_g09_nto.py                                           #
+#     Python script to convert Gaussian09 NTO Log Files into MO Log Files (readable by ChemCraft)  #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: get_g09_nto.py <TD-LOG-FILE> <NTO-LOG-FILE> [<NTO-LOG-FILE> ...] [-j <JOBS>]              #
+#                                                                                                  #
+# Use in TD calculation: gfinput Pop=Full                                                          #
+# Use in NTO calculation: gfinput Pop=Minimal                                                      #
+#                                                                                                  #
+# Both log files are indexed in a single pass. Every 'Natural Transition Orbitals for state' block #
+# of the NTO log files replaces the 'Molecular Orbital Coefficients' section of the TD log file,   #
+# giving '<NTO-LOG-FILE>.nto.log', or '<NTO-LOG-FILE>.state<N>.nto.log' for several states.        #
+# Files are copied by byte ranges, so memory use does not depend on the size of log files.         #
+#                                                                                                  #
+# Batch options:                                                                                   #
+#               . '-j': Number of parallel processes used for several states (default: 1)          #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##      Launching parallel tasks Module        ##
+from concurrent.futures import ProcessPoolExecutor
+##   CompChemTools scanner and g09 Modules     ##
+try:
+    from compchemtools import scanner, compressed, g09
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import scanner, compressed, g09
+#################################################
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('g09_td_file',
+                        type=str,
+                        help='gaussian09 TD output filename (gfinput Pop=Full)')
+
+    parser.add_argument('g09_nto_files',
+                        type=str,
+                        nargs='+',
+                        help='gaussian09 NTO output filenames (gfinput Pop=Minimal)')
+
+    parser.add_argument('-j', dest='jobs',
+                        type=int,
+                        default=1,
+                        help='number of parallel processes used for several states')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('number of parallel processes must be positive')
+
+    return args
+
+def index_g09_markers(_g09_log_file):
+    """Function to index the orbital sections of g09 Log File in a single streaming pass
+
+    Arguments:
+        _g09_log_file {str} -- g09 Log File name
+
+    Returns:
+        dict:g09_results -- scanner results: 'g09_termination', 'g09_excited_state',
+                            'g09_nto_start' and 'g09_mo_end' line offsets, 'g09_mo_start' offsets
+                            after the line and 'g09_nto_blocks' (offset, end offset, line) tuples
+    """
+    if not path.isfile(_g09_log_file):
+        raise g09.G09LogError('> Gaussian09 output file {} was not found.'.format(_g09_log_file))
+
+    g09_results = {}
+    g09_handlers = {}
+    scanner.add_termination_handlers(g09_handlers, g09_results)
+    scanner.add_offset_handlers(g09_handlers, g09_results, ['g09_excited_state', 'g09_nto_start'])
+    scanner.add_g09_nto_handlers(g09_handlers, g09_results)
+    scanner.scan_log_file(_g09_log_file, g09_handlers)
+
+    return g09_results
+
+def get_mo_span(_g09_td_file):
+    """Function to obtain the 'Molecular Orbital Coefficients' section of g09 TD Log File
+
+    Arguments:
+        _g09_td_file {str} -- g09 TD Log File name
+
+    Returns:
+        tuple:mo_span -- (end offset of the 'Molecular Orbital Coefficients' line, start offset
+                         of the following 'Density Matrix' line)
+    """
+    g09_results = index_g09_markers(_g09_td_file)
+
+    if not g09_results['g09_termination'] or not g09_results['g09_excited_state']:
+        raise g09.G09LogError(
+            '> Gaussian09 output {} is not from a finished TD calculation.'.format(_g09_td_file))
+    if not g09_results['g09_mo_start']:
+        raise g09.G09LogError(
+            '> Molecular orbitals were not found in {} Gaussian09 output (gfinput Pop=Full).'
+                .format(_g09_td_file))
+
+    # Last orbitals section of the log file and the density matrix following it
+    mo_span = g09.get_g09_mo_span(g09_results)
+    if mo_span is None:
+        raise g09.G09LogError(
+            '> Density matrix was not found after molecular orbitals in {} Gaussian09 output.'
+                .format(_g09_td_file))
+
+    return mo_span
+
+def get_nto_blocks(_g09_nto_file):
+    """Function to pair the states of g09 NTO Log File with their NTO blocks
+
+    Arguments:
+        _g09_nto_file {str} -- g09 NTO Log File name
+
+    Returns:
+        list:nto_blocks -- NTO blocks (NTOBlock) in file order
+    """
+    g09_results = index_g09_markers(_g09_nto_file)
+
+    if not g09_results['g09_termination'] or not g09_results['g09_nto_start']:
+        raise g09.G09LogError(
+            '> Gaussian09 output {} is not from a finished NTO calculation.'.format(_g09_nto_file))
+    if len(g09_results['g09_nto_blocks']) < len(g09_results['g09_nto_start']):
+        raise g09.G09LogError(
+            '> End of NTO block {} was not found in {} Gaussian09 output.'
+                .format(len(g09_results['g09_nto_blocks']) + 1, _g09_nto_file))
+
+    return g09.get_g09_nto_blocks(g09_results, _g09_nto_file)
+
+def get_nto_filename(_nto_block, _several_states):
+    """Function to build the converted NTO Log File name
+
+    Arguments:
+        _nto_block {NTOBlock} -- NTO block
+        _several_states {bool} -- whether the state number is added to the file name
+
+    Returns:
+        str:nto_filename -- converted NTO Log File name
+    """
+    nto_filename = path.splitext(
+        compressed.strip_compressed_extension(_nto_block.g09_nto_file))[0]
+    if _several_states:
+        nto_filename += '.state{}'.format(_nto_block.state)
+    return nto_filename + '.nto.log'
+
+def copy_file_range(_source, _destination, _start, _end):
+    """Function to copy a byte range of a file in chunks
+
+    Arguments:
+        _source {file} -- source file (binary mode)
+        _destination {file} -- destination file (binary mode)
+        _start {int} -- first byte of the range
+        _end {int} -- end of the range (None for end of file)
+    """
+    _source.seek(_start)
+    remaining = None if _end is None else _end - _start
+
+    while remaining is None or remaining > 0:
+        chunk = _source.read(g09.G09_CHUNK_SIZE if remaining is None
+                             else min(g09.G09_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        _destination.write(chunk)
+        if remaining is not None:
+            remaining -= len(chunk)
+
+def write_nto_file(_nto_job):
+    """Function to write the TD Log File with the orbitals section replaced by one NTO block
+
+    Arguments:
+        _nto_job {tuple} -- (g09 TD Log File name, orbitals span, NTO block, output file name)
+
+    Returns:
+        str:nto_filename -- converted NTO Log File name
+        str:error_message -- error message, or None if the file was written
+    """
+    g09_td_file, (mo_start, mo_end), nto_block, nto_filename = _nto_job
+
+    try:
+        with open(nto_filename, 'wb') as nto_file:
+            with compressed.open_file(g09_td_file, 'rb') as td_file:
+                copy_file_range(td_file, nto_file, 0, mo_start)
+                with compressed.open_file(nto_block.g09_nto_file, 'rb') as g09_nto_file:
+                    copy_file_range(g09_nto_file, nto_file, nto_block.start, nto_block.end)
+                copy_file_range(td_file, nto_file, mo_end, None)
+    except (OSError, EOFError) as error:
+        return nto_filename, '> {} could not be written: {}'.format(nto_filename, error)
+
+    return nto_filename, None
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Indexing TD and NTO Log Files
+    try:
+        mo_span = get_mo_span(arguments.g09_td_file)
+        nto_blocks = [nto_block for g09_nto_file in arguments.g09_nto_files
+                      for nto_block in get_nto_blocks(g09_nto_file)]
+    except (g09.G09LogError, OSError, EOFError) as error:
+        print_script_output(str(error), 'error')
+        sys.exit(1)
+
+    # Pairing states with NTO blocks
+    blocks_per_file = {}
+    for nto_block in nto_blocks:
+        blocks_per_file[nto_block.g09_nto_file] = blocks_per_file.get(nto_block.g09_nto_file, 0) + 1
+    nto_jobs = [(arguments.g09_td_file, mo_span, nto_block,
+                 get_nto_filename(nto_block, blocks_per_file[nto_block.g09_nto_file] > 1))
+                for nto_block in nto_blocks]
+
+    # Writing converted NTO Log Files, in parallel for several states
+    if arguments.jobs > 1 and len(nto_jobs) > 1:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            nto_results = list(executor.map(write_nto_file, nto_jobs))
+    else:
+        nto_results = [write_nto_file(nto_job) for nto_job in nto_jobs]
+
+    nto_errors = [error_message for _, error_message in nto_results if error_message is not None]
+    for error_message in nto_errors:
+        print_script_output(error_message, 'error')
+
+    # End of get_g09_nto.py execution
+    for nto_filename, error_message in nto_results:
+        if error_message is None:
+            print_script_output('> {} sucessfully written!'.format(nto_filename), 'job_done')
+
+    if nto_errors:
+        sys.exit(1)
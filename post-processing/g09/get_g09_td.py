@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                          get_g09_td.py                                           #
+#        Python script to obtain excited states from Gaussian09 TD-DFT/TD-HF Log Files             #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: get_g09_td.py <LOG-FILE> [<LOG-FILE> ...] [-o <FORMAT>] [--geometry [-f <ORIENTATION>]]   #
+#                      [-j <JOBS>] [--combine <FILE>]                                              #
+#                                                                                                  #
+# Every 'Excited State' of the log file is parsed in a single streaming pass: transition energy    #
+# (eV and nm), oscillator strength, spin/symmetry label, <S**2> and orbital excitations (sorted    #
+# by decreasing coefficient magnitude).                                                            #
+#                                                                                                  #
+# Output options:                                                                                  #
+#               . 'csv': '<LOG-FILE>.td.csv' table (default), its first two columns are the        #
+#                        transition energy (eV) and oscillator strength, as in g09td2csv.bash      #
+#               . 'npz': '<LOG-FILE>.td.npz' NumPy archive                                         #
+#               . '--geometry': Also write the geometry of the excited states (last orientation    #
+#                               block, '-f' orientation, default: input) to '<LOG-FILE>.td.xyz',   #
+#                               read in the same pass as the excited states                        #
+#                                                                                                  #
+# Batch options:                                                                                   #
+#               . Log files may be given as several names, glob patterns or folders                #
+#               . '-j': Number of parallel processes (default: 1)                                  #
+#               . '--combine': Write the excited states of all log files to a single table         #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##     Unix style pathname pattern expansion   ##
+from glob import glob
+##      Launching parallel tasks Module        ##
+from concurrent.futures import ProcessPoolExecutor
+##     Fundamental package for array computing ##
+import numpy as np
+##  CompChemTools compressed and g09 Modules   ##
+try:
+    from compchemtools import compressed, g09
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import compressed, g09
+#################################################
+
+## Extensions of g09 Log Files searched in folders
+G09_LOG_EXTENSIONS = ['.log', '.out']
+
+## Columns of the excited states table
+TD_CSV_HEADER = ['Transition Energy (eV)', 'Oscillator Strength', 'Wavelength (nm)',
+                 'State', 'Label', '<S**2>', 'Excitations']
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('g09_log_files',
+                        type=str,
+                        nargs='+',
+                        help='gaussian09 TD output filenames (usually .log extension), '
+                             'glob patterns or folders')
+
+    parser.add_argument('-o', dest='output_format',
+                        type=str,
+                        default='csv',
+                        choices=['csv', 'npz'],
+                        help='excited states table format')
+
+    parser.add_argument('--geometry', dest='write_geometry',
+                        action='store_true',
+                        help='also write the geometry of the excited states (last orientation) '
+                             'read in the same pass')
+
+    parser.add_argument('-f', dest='orientation',
+                        type=str,
+                        default='input',
+                        choices=g09.G09_ORIENTATIONS,
+                        help='orientation of the geometry')
+
+    parser.add_argument('-j', dest='jobs',
+                        type=int,
+                        default=1,
+                        help='number of parallel processes used for several output files')
+
+    parser.add_argument('--combine', dest='combined_file',
+                        type=str,
+                        default=None,
+                        help='write the excited states of all output files to a single table')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('number of parallel processes must be positive')
+
+    return args
+
+def get_g09_log_files(_arguments):
+    """Function to expand folders and glob patterns given by user into g09 Log File names
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+
+    Returns:
+        list:g09_log_files -- g09 Log File names
+    """
+    g09_log_files = []
+
+    for g09_log_pattern in _arguments.g09_log_files:
+        if path.isdir(g09_log_pattern):
+            for extension in G09_LOG_EXTENSIONS:
+                for compressed_extension in [''] + compressed.COMPRESSED_EXTENSIONS:
+                    g09_log_files.extend(sorted(glob(
+                        path.join(g09_log_pattern, '*' + extension + compressed_extension))))
+        elif any(character in g09_log_pattern for character in '*?['):
+            g09_log_files.extend(sorted(glob(g09_log_pattern)))
+        else:
+            g09_log_files.append(g09_log_pattern)
+
+    return g09_log_files
+
+def get_g09_excited_states(_arguments):
+    """Function to obtain every excited state of g09 Log File, and its geometry if requested,
+    in a single streaming pass
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+
+    Returns:
+        list:excited_states -- excited states (ExcitedState) in file order, with their dominant
+                               orbital excitations first
+        Geometry:geometry -- geometry of the excited states, or None if it was not requested
+    """
+    if not path.isfile(_arguments.g09_log_file):
+        raise g09.G09LogError(
+            '> Gaussian09 output file {} was not found.'.format(_arguments.g09_log_file))
+
+    # Last orientation block, also in single point Log Files without 'Step number' lines
+    g09_log = g09.read_g09_log(
+        _arguments.g09_log_file,
+        ['excited_states'] + (['geometry'] if _arguments.write_geometry else []),
+        _step=slice(-1, None),
+        _orientation=_arguments.orientation)
+
+    if not g09_log.excited_states:
+        raise g09.G09LogError(
+            '> Excited states were not found in {} Gaussian09 output.'
+                .format(_arguments.g09_log_file))
+
+    return g09_log.excited_states, g09_log.geometry
+
+def format_excitations(_excitations):
+    """Function to format orbital excitations as text
+
+    Arguments:
+        _excitations {list} -- (from, arrow, to, coefficient) tuples
+
+    Returns:
+        str:excitations_text -- e.g. '18->20 (0.70467); 17->20 (-0.10412)'
+    """
+    return '; '.join('{}{}{} ({:.5f})'.format(*excitation) for excitation in _excitations)
+
+def format_td_table(_excited_states, _g09_log_file=None):
+    """Function to format excited states as CSV lines
+
+    Arguments:
+        _excited_states {list} -- excited states (ExcitedState)
+        _g09_log_file {str} -- g09 Log File name added as last column, if given
+
+    Returns:
+        list:table_lines -- CSV lines (without header)
+    """
+    table_lines = []
+
+    for excited_state in _excited_states:
+        table_fields = ['{:.4f}'.format(excited_state.energy),
+                        '{:.4f}'.format(excited_state.oscillator_strength),
+                        '{:.2f}'.format(excited_state.wavelength),
+                        str(excited_state.state),
+                        excited_state.label,
+                        '{:.3f}'.format(excited_state.s2),
+                        '"{}"'.format(format_excitations(excited_state.excitations))]
+        if _g09_log_file is not None:
+            table_fields.append(_g09_log_file)
+        table_lines.append(','.join(table_fields) + '\n')
+
+    return table_lines
+
+def write_td_table(_table_filename, _output_format, _g09_results):
+    """Function to write the excited states table
+
+    Arguments:
+        _table_filename {str} -- table file name
+        _output_format {str} -- table format ('csv' or 'npz')
+        _g09_results {list} -- (g09 Log File name, excited states) pairs, the Log File name is
+                               written as last column for several Log Files
+    """
+    several_files = len(_g09_results) > 1
+
+    if _output_format == 'csv':
+        table_header = TD_CSV_HEADER + (['Log File'] if several_files else [])
+        table_lines = [','.join(table_header) + '\n']
+        for g09_log_file, excited_states in _g09_results:
+            table_lines.extend(format_td_table(excited_states,
+                                               g09_log_file if several_files else None))
+
+        with open(_table_filename, 'w') as file:
+            file.writelines(table_lines)
+        return
+
+    excited_states = [(g09_log_file, excited_state)
+                      for g09_log_file, g09_excited_states in _g09_results
+                      for excited_state in g09_excited_states]
+
+    with open(_table_filename, 'wb') as file:
+        np.savez(file,
+                 energies=np.array([state.energy for _, state in excited_states]),
+                 oscillator_strengths=np.array(
+                     [state.oscillator_strength for _, state in excited_states]),
+                 wavelengths=np.array([state.wavelength for _, state in excited_states]),
+                 states=np.array([state.state for _, state in excited_states], dtype=int),
+                 labels=np.array([state.label for _, state in excited_states], dtype=str),
+                 s2=np.array([state.s2 for _, state in excited_states]),
+                 excitations=np.array([format_excitations(state.excitations)
+                                       for _, state in excited_states], dtype=str),
+                 log_files=np.array([g09_log_file for g09_log_file, _ in excited_states],
+                                    dtype=str))
+
+def get_td_filename(_arguments, _extension=None):
+    """Function to build the excited states table (or geometry) filename from g09 Log File name
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _extension {str} -- file extension, the table format if not given
+
+    Returns:
+        str:td_filename -- name of the table file
+    """
+    return path.splitext(compressed.strip_compressed_extension(_arguments.g09_log_file))[0] \
+        + '.td.' + (_extension or _arguments.output_format)
+
+def process_g09_file(_arguments):
+    """Function to obtain the excited states of one g09 Log File
+
+    The table file is written by this function unless tables are combined in a single file, the
+    '.xyz' file of the geometry is always written by it.
+
+    Arguments:
+        _arguments {obj} -- arguments given by user, with a single 'g09_log_file'
+
+    Returns:
+        str:g09_log_file -- g09 Log File name
+        list:excited_states -- excited states, or None if they were not obtained
+        str:error_message -- error message, or None if the excited states were obtained
+    """
+    try:
+        excited_states, g09_geometry = get_g09_excited_states(_arguments)
+
+        if _arguments.combined_file is None:
+            write_td_table(get_td_filename(_arguments), _arguments.output_format,
+                           [(_arguments.g09_log_file, excited_states)])
+
+        if g09_geometry is not None:
+            with open(get_td_filename(_arguments, 'xyz'), 'w') as geometry_file:
+                geometry_file.write(g09.format_xyz_geometry(g09_geometry))
+
+    except (g09.G09LogError, OSError, EOFError) as error:
+        return _arguments.g09_log_file, None, str(error)
+
+    return _arguments.g09_log_file, excited_states, None
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Expanding folders and glob patterns into g09 Log Files
+    g09_log_files = get_g09_log_files(arguments)
+    g09_arguments = [argparse.Namespace(**vars(arguments), g09_log_file=g09_log_file)
+                     for g09_log_file in g09_log_files]
+
+    if not g09_log_files:
+        print_script_output('> No Gaussian09 output files were found.', 'error')
+        sys.exit(1)
+
+    # Obtaining excited states, in parallel for several output files
+    if arguments.jobs > 1 and len(g09_log_files) > 1:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            g09_results = list(executor.map(process_g09_file, g09_arguments))
+    else:
+        g09_results = [process_g09_file(g09_argument) for g09_argument in g09_arguments]
+
+    g09_errors = [error_message for _, _, error_message in g09_results
+                  if error_message is not None]
+
+    # Writing the combined table
+    if arguments.combined_file is not None:
+        write_td_table(arguments.combined_file, arguments.output_format,
+                       [(g09_log_file, excited_states)
+                        for g09_log_file, excited_states, _ in g09_results
+                        if excited_states is not None])
+
+    # Summary of errors
+    if len(g09_results) > 1 and g09_errors:
+        print_script_output(
+            '> Excited states were not obtained from {} of {} Gaussian09 outputs:'
+                .format(len(g09_errors), len(g09_results)),
+            'error')
+    for error_message in g09_errors:
+        print_script_output(error_message, 'error')
+
+    # End of get_g09_td.py execution
+    if len(g09_results) == 1 and not g09_errors:
+        print_script_output(
+            '> Excited states from {} sucessfully exported!'.format(g09_log_files[0]),
+            'job_done')
+    elif len(g09_results) > len(g09_errors):
+        print_script_output(
+            '> Excited states from {} Gaussian09 outputs sucessfully exported!'
+                .format(len(g09_results) - len(g09_errors)),
+            'job_done')
+
+    if g09_errors:
+        sys.exit(1)
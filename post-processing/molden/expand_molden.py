@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                        expand_molden.py                                          #
+#      Python script to rebuild standard Molden files from shared-header '.mos' orbital files      #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: expand_molden.py <MOS-FILE> [<MOS-FILE> ...]                                              #
+#                                                                                                  #
+# Compact '.mos' files are written by clean_orca_nto.py and get_molden_active_space.py with the    #
+# '--shared-header' option. Each '<MOLDEN-FILE>.mos' is expanded to '<MOLDEN-FILE>', joining the   #
+# shared 'molden.<HASH>.header' file and its orbital blocks.                                       #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##     CompChemTools Molden reader Module      ##
+try:
+    from compchemtools import molden
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import molden
+#################################################
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('shared_filenames',
+                        type=str,
+                        nargs='+',
+                        help='compact Molden orbitals filenames (.mos extension)')
+
+    args = parser.parse_args()
+
+    return args
+
+def expand_molden_file(_shared_filename):
+    """Function to write the standard Molden File of a compact '.mos' file
+    Arguments:
+        _shared_filename {str} -- compact Molden orbitals file name
+    Returns:
+        str:molden_filename -- standard Molden File name
+    """
+    molden_filename = _shared_filename
+    if molden_filename.endswith(molden.MOLDEN_SHARED_EXTENSION):
+        molden_filename = molden_filename[:-len(molden.MOLDEN_SHARED_EXTENSION)]
+    else:
+        molden_filename += '.molden'
+
+    molden_text = molden.expand_molden_shared(_shared_filename)
+
+    with open(molden_filename, 'wb') as file:
+        file.write(molden_text)
+
+    return molden_filename
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Expanding compact Molden Files
+    expand_errors = 0
+    for shared_filename in arguments.shared_filenames:
+        try:
+            molden_filename = expand_molden_file(shared_filename)
+        except (OSError, ValueError) as error:
+            print_script_output('> {} could not be expanded: {}'.format(shared_filename, error),
+                                'error')
+            expand_errors += 1
+            continue
+
+        # End of expand_molden.py execution
+        print_script_output(
+            '> Molden File {} sucessfully expanded from {}!'
+                .format(molden_filename, shared_filename),
+            'job_done')
+
+    if expand_errors:
+        sys.exit(1)
@@ -10,7 +10,23 @@
 ### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
 ####################################################################################################
 #                                                                                                  #
-# Usage: get_molden_active_space.py <MOLDEN-FILE>                                                           #
+# Usage: get_molden_active_space.py <MOLDEN-FILE> [-occ <OMIN:OMAX> | --unrestricted] [--top <K>]  #
+#                                  [--spin <SPIN>] [--shared-header | --npz [--compress]]          #
+#                                                                                                  #
+# Selection options:                                                                               #
+#               . 'occ':  Active space occupation window (default: fractional occupations,         #
+#                         0.000001 < Occup < 1.999999)                                             #
+#               . '--unrestricted': Default window of unrestricted orbitals, 0.000001 < Occup <    #
+#                                   0.999999                                                       #
+#               . 'spin': Select 'alpha' or 'beta' orbitals only                                   #
+#               . 'top':  Keep the K active orbitals of largest occupation of each spin            #
+#                                                                                                  #
+# Output options:                                                                                  #
+#               . '--shared-header': Write the Molden header once ('molden.<HASH>.header') and     #
+#                                    a compact 'cas.<MOLDEN-FILE>.mos' file (see expand_molden.py) #
+#               . '--npz': Export active space orbitals as a 'cas.<MOLDEN-FILE>.npz' NumPy archive #
+#                          (coefficients matrix, energies, occupations, spins and symmetries)      #
+#               . '--compress': Compress the NumPy archive                                         #
 #                                                                                                  #
 ####################################################################################################
 
@@ -23,6 +39,12 @@
 import sys
 ##       Parser for command-line options       ##
 import argparse
+##     CompChemTools Molden reader Module      ##
+try:
+    from compchemtools import molden, compressed
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import molden, compressed
 #################################################
 
 def print_script_output(_text, _type):
@@ -47,8 +69,59 @@ def get_arguments():
                         type=str,
                         help='Molden CAS filename (usually .molden extension)')
 
+    # An explicit occupation window replaces the default windows
+    window_group = parser.add_mutually_exclusive_group()
+
+    window_group.add_argument('-occ', dest='occupation_window',
+                              type=str,
+                              default=None,
+                              help='active space occupation window, e.g. 0.02:1.98 (default: '
+                                   'fractional occupations)')
+
+    window_group.add_argument('--unrestricted', dest='unrestricted',
+                              action='store_true',
+                              help='default occupation window of unrestricted orbitals (between '
+                                   '0 and 1)')
+
+    parser.add_argument('--spin', dest='spin',
+                        type=str,
+                        default=None,
+                        choices=['alpha', 'beta'],
+                        help='select orbitals of a single spin')
+
+    parser.add_argument('--top', dest='top',
+                        type=int,
+                        default=None,
+                        help='keep the K active orbitals of largest occupation of each spin')
+
+    # Molden files with a shared header and NumPy archives are alternative outputs
+    output_group = parser.add_mutually_exclusive_group()
+
+    output_group.add_argument('--shared-header', dest='shared_header',
+                              action='store_true',
+                              help='write the Molden header once (molden.<HASH>.header) and a '
+                                   'compact \'.mos\' orbital file')
+
+    output_group.add_argument('--npz', dest='npz',
+                              action='store_true',
+                              help='export active space orbitals as a NumPy archive '
+                                   '(\'.npz\') instead of a Molden file')
+
+    parser.add_argument('--compress', dest='compress',
+                        action='store_true',
+                        help='compress the NumPy archive (it can no longer be memory-mapped)')
+
     args = parser.parse_args()
 
+    # Convert occupation window to floats
+    if args.occupation_window is not None:
+        try:
+            minimum, maximum = args.occupation_window.split(':')
+            args.occupation_window = (float(minimum) if minimum else None,
+                                      float(maximum) if maximum else None)
+        except ValueError:
+            parser.error('invalid occupation window: {}'.format(args.occupation_window))
+
     return args
 
 def open_molden_file(_arguments):
@@ -56,68 +129,63 @@ def open_molden_file(_arguments):
     Arguments:
         _arguments {obj} -- arguments given by user
     Returns:
-        list:molden_file -- list containing Molden File as strings in lines
+        str:molden_file -- Molden File text
     """
     if path.isfile(_arguments.molden_filename):
-        with open(_arguments.molden_filename, 'rt') as file:
-            molden_file = file.readlines()
-            return molden_file
+        return molden.read_molden_file(_arguments.molden_filename)
     else:
         print_script_output(
             '> Molden file {} was not found.'.format(_arguments.molden_filename),
             'error')
         sys.exit()
 
-def format_molden_file(_raw_file):
+def format_molden_file(_arguments, _raw_file):
     """Function to format CAS Molden File removing unoccupied and full-occupied orbitals
     Arguments:
         _arguments {obj} -- arguments given by user
-        _raw_file {list} -- Molden File lines
+        _raw_file {str} -- Molden File text
     Returns:
-        list:molden_header -- list containing Molden file header in lines
-        list:cas_data -- list containing active space orbitals
+        str:molden_header -- Molden file header
+        list:cas_data -- active space orbitals (MolecularOrbital)
     """
+    # Only orbitals metadata is needed to select active space orbitals
+    return molden.select_active_orbitals(_raw_file, _arguments.occupation_window,
+                                         _arguments.spin, _arguments.top, _arguments.unrestricted)
 
-    # Obtaining Molden file header
-    for line_number, line in enumerate(_raw_file):
-        if "[MO]" in line:
-            molden_header_end_line = line_number
-
-    molden_header = _raw_file[:molden_header_end_line+1].copy()
-
-    # Obtaining NTOs
-    mo_start_lines_number = []
-    for line_number, line in enumerate(_raw_file):
-        if "Sym=" in line:
-            mo_start_lines_number.append(line_number)
-
-    cas_mos_data = []
-    for mo_start_line_number, mo_end_line_number in zip(mo_start_lines_number, mo_start_lines_number[1:]):
-        mo_raw_data = _raw_file[mo_start_line_number:mo_end_line_number].copy()
-        for line_number, line in enumerate(mo_raw_data):
-            if "Occup=" in line:
-                mo_occup = float(line.strip().split()[1])
-                if (mo_occup < 1.999999) and (mo_occup > 0.000001):
-                    cas_mos_data.extend(mo_raw_data)
-
-    return molden_header, cas_mos_data
-
-def write_molden(_arguments, _molden_header, _molden_data):
-    """_summary_
+def write_molden(_arguments, _raw_file, _molden_header, _molden_data):
+    """Function to write the active space Molden File
 
     Args:
         _arguments {obj} -- arguments given by user
-        _molden_header (list): Header of original Molden file
+        _raw_file (str): Molden File text
+        _molden_header (str): Header of original Molden file
         _molden_data (list): Active space orbitals selected
     """
 
-    molden_output_filename = "cas."+_arguments.molden_filename
+    molden_output_filename = "cas." + compressed.strip_compressed_extension(
+        _arguments.molden_filename)
+
+    if _arguments.npz:
+        try:
+            molden.write_molden_npz(molden_output_filename + '.npz', _raw_file, _molden_data,
+                                    _arguments.compress)
+        except ValueError as error:
+            print_script_output(
+                '> Molden file {} could not be exported: {}.'.format(
+                    _arguments.molden_filename, error),
+                'error')
+            sys.exit(1)
+        return
+
+    molden_data_text = molden.get_molden_orbitals_text(_raw_file, _molden_data)
+
+    if _arguments.shared_header:
+        molden.write_molden_shared(molden_output_filename, _molden_header, molden_data_text)
+        return
 
     with open(molden_output_filename, 'w') as file:
-        for line in _molden_header:
-            file.write(line)
-        for line in _molden_data:
-            file.write(line)
+        file.write(_molden_header)
+        file.writelines(molden_data_text)
 
 # Main program
 if __name__ == '__main__':
@@ -129,10 +197,10 @@ def write_molden(_arguments, _molden_header, _molden_data):
     molden_raw_file = open_molden_file(arguments)
 
     # Formatting Molden File removing unoccupied and full-occupied MOs
-    molden_header, molden_cas_data = format_molden_file(molden_raw_file)
+    molden_header, molden_cas_data = format_molden_file(arguments, molden_raw_file)
 
     # Writing Molden File
-    write_molden(arguments, molden_header, molden_cas_data)
+    write_molden(arguments, molden_raw_file, molden_header, molden_cas_data)
 
     # End of get_molden_active_space.py execution
     print_script_output(
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                    get_molden_orbitals.py                                        #
+#        Python script to extract selected orbitals from a Molden file by random access            #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: get_molden_orbitals.py <MOLDEN-FILE> [-i <INDICES>] [-e <EMIN:EMAX>] [-occ <OMIN:OMAX>]   #
+#                               [--frontier <N>] [--no-cache]                                      #
+#                                                                                                  #
+# Selection options (all given options must be satisfied):                                         #
+#               . 'i':        Orbital numbers in file order, e.g. '1,5-8' (1-based)                #
+#               . 'e':        Orbital energy window, e.g. '-0.5:0.1' (bounds are exclusive and     #
+#                             may be omitted)                                                      #
+#               . 'occ':      Orbital occupation window, e.g. '0.01:' (as energy window)           #
+#               . 'frontier': Orbitals from HOMO-N to LUMO+N (alpha spin)                          #
+#                                                                                                  #
+# The Molden file is memory-mapped and only orbital headers are scanned, the selected orbital      #
+# blocks are copied to 'orb.<MOLDEN-FILE>' as raw bytes.                                           #
+#                                                                                                  #
+# Index cache:                                                                                     #
+#               . Orbital block offsets are kept in '<MOLDEN-FILE>.moldenidx' to be reused by      #
+#                 later runs (validated by file size and modification time)                        #
+#               . '--no-cache': do not read or write the index file                                #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##     CompChemTools Molden reader Module      ##
+try:
+    from compchemtools import molden, compressed
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import molden, compressed
+#################################################
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def parse_window(_window):
+    """Function to convert a 'minimum:maximum' option into a window
+    Arguments:
+        _window {str} -- window option ('minimum:maximum', bounds may be empty)
+    Returns:
+        tuple:window -- (minimum, maximum), None for open bounds
+    """
+    minimum, maximum = _window.split(':')
+    return (float(minimum) if minimum else None, float(maximum) if maximum else None)
+
+def parse_indices(_indices):
+    """Function to convert an '1,5-8' option into 0-based orbital indices
+    Arguments:
+        _indices {str} -- orbital numbers option (1-based, ranges are inclusive)
+    Returns:
+        list:indices -- orbital indices (0-based)
+    """
+    indices = []
+    for item in _indices.split(','):
+        first, _, last = item.partition('-')
+        indices.extend(range(int(first) - 1, int(last or first)))
+    return indices
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('molden_filename',
+                        type=str,
+                        help='Molden filename')
+
+    parser.add_argument('-i', dest='indices',
+                        type=str,
+                        default=None,
+                        help='orbital numbers in file order, e.g. 1,5-8')
+
+    parser.add_argument('-e', dest='energy_window',
+                        type=str,
+                        default=None,
+                        help='orbital energy window, e.g. -0.5:0.1')
+
+    parser.add_argument('-occ', dest='occupation_window',
+                        type=str,
+                        default=None,
+                        help='orbital occupation window, e.g. 0.01:')
+
+    parser.add_argument('--frontier', dest='frontier',
+                        type=int,
+                        default=None,
+                        help='select orbitals from HOMO-N to LUMO+N (alpha spin)')
+
+    parser.add_argument('--no-cache', dest='use_cache',
+                        action='store_false',
+                        help='do not read or write the \'.moldenidx\' index file')
+
+    args = parser.parse_args()
+
+    # Convert selection options
+    try:
+        if args.indices is not None:
+            args.indices = parse_indices(args.indices)
+        if args.energy_window is not None:
+            args.energy_window = parse_window(args.energy_window)
+        if args.occupation_window is not None:
+            args.occupation_window = parse_window(args.occupation_window)
+    except ValueError:
+        parser.error('invalid orbital selection option')
+
+    return args
+
+def index_molden_file(_arguments):
+    """Function to memory-map Molden File and index its orbital blocks
+    The index is read from (or written to) the '<MOLDEN-FILE>.moldenidx' file.
+    Arguments:
+        _arguments {obj} -- arguments given by user
+    Returns:
+        mmap:molden_map -- Molden File bytes
+        Molden:molden_index -- Molden header and orbitals metadata with byte spans
+    """
+    if not path.isfile(_arguments.molden_filename):
+        print_script_output(
+            '> Molden file {} was not found.'.format(_arguments.molden_filename),
+            'error')
+        sys.exit()
+
+    molden_map = molden.open_molden_mmap(_arguments.molden_filename)
+    return molden_map, molden.get_molden_index(_arguments.molden_filename, molden_map,
+                                               _arguments.use_cache)
+
+def get_frontier_indices(_molecular_orbitals, _frontier):
+    """Function to obtain the indices of orbitals from HOMO-N to LUMO+N (alpha spin)
+    Arguments:
+        _molecular_orbitals {list} -- molecular orbitals (MolecularOrbital)
+        _frontier {int} -- number N of orbitals below HOMO and above LUMO
+    Returns:
+        list:indices -- orbital indices (0-based)
+    """
+    alpha_indices = [index for index, orbital in enumerate(_molecular_orbitals)
+                     if orbital.spin.lower() == 'alpha']
+    occupied_indices = [index for index in alpha_indices
+                        if _molecular_orbitals[index].occupation > 0.0]
+    homo_position = alpha_indices.index(occupied_indices[-1]) if occupied_indices else -1
+
+    return alpha_indices[max(homo_position - _frontier, 0):homo_position + _frontier + 2]
+
+def select_orbitals(_arguments, _molden_index):
+    """Function to select orbitals according to the given options
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _molden_index {Molden} -- Molden header and orbitals metadata
+    Returns:
+        list:selected_orbitals -- selected orbitals
+    """
+    indices = _arguments.indices
+    if _arguments.frontier is not None:
+        frontier_indices = get_frontier_indices(_molden_index.orbitals, _arguments.frontier)
+        indices = frontier_indices if indices is None else \
+            sorted(set(indices) & set(frontier_indices))
+
+    if indices is not None:
+        indices = [index for index in indices if 0 <= index < len(_molden_index.orbitals)]
+
+    # Orbitals selected by number only are taken directly, without loading NumPy
+    if _arguments.energy_window is None and _arguments.occupation_window is None:
+        return [_molden_index.orbitals[index]
+                for index in (range(len(_molden_index.orbitals)) if indices is None
+                              else sorted(set(indices)))]
+
+    return molden.select_molden_orbitals(_molden_index.orbitals, indices,
+                                         _arguments.energy_window, _arguments.occupation_window)
+
+def write_molden(_arguments, _molden_map, _molden_header, _selected_orbitals):
+    """Function to write selected orbitals, copying their raw bytes
+    Args:
+        _arguments {obj} -- arguments given by user
+        _molden_map (mmap): Molden File bytes
+        _molden_header (bytes): Header of original Molden file
+        _selected_orbitals (list): Selected orbitals
+    """
+    molden_output_filename = path.join(
+        path.dirname(_arguments.molden_filename),
+        'orb.' + path.basename(compressed.strip_compressed_extension(_arguments.molden_filename)))
+
+    with open(molden_output_filename, 'wb') as file:
+        file.write(_molden_header)
+        file.writelines(molden.get_molden_orbitals_text(_molden_map, _selected_orbitals))
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Memory-mapping and indexing Molden File
+    molden_map, molden_index = index_molden_file(arguments)
+
+    # Selecting orbitals
+    selected_orbitals = select_orbitals(arguments, molden_index)
+
+    # Writing Molden File
+    write_molden(arguments, molden_map, molden_index.header, selected_orbitals)
+
+    # End of get_molden_orbitals.py execution
+    print_script_output(
+        '> {} orbitals from {} sucessfully extracted!'
+            .format(len(selected_orbitals), arguments.molden_filename),
+        'job_done')
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                       get_nx_spectrum.py                                         #
+#      Python script to average Newton-X cross sections of several nuclear ensemble calculations   #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: get_nx_spectrum.py [<CROSS-SECTION-FILE> ...] [-o <OUTPUT-FILE>] [-j <JOBS>]              #
+#                                                                                                  #
+# Cross-section files may be given as several names, glob patterns or folders, which are searched  #
+# recursively for 'cross-section.dat' files (default: current folder).                             #
+#                                                                                                  #
+# Every file must hold the Newton-X 'DE/eV lambda/nm sigma/A^2 +/-error/A^2' header line, which    #
+# may follow comment lines or start with '#' (as nxspectrum2csv.bash, it is searched anywhere).    #
+# Cross sections are averaged on the energy grid of the first file. Other grids are interpolated,  #
+# and each energy is averaged over the files whose grid covers it:                                 #
+#               . 'sigma/A^2':    Average cross section                                            #
+#               . 'error/A^2':    Newton-X errors propagated to the average                        #
+#               . 'stderr/A^2':   Standard error of the average among files                        #
+#                                                                                                  #
+# Output options:                                                                                  #
+#               . 'o': Output file, CSV table or NumPy array ('.npy' extension)                    #
+#                      (default: 'cross-section.average.csv'; the table holds the 'DE/eV',         #
+#                      'lambda/nm' and the three columns above after a header line, unlike the     #
+#                      'DE/eV,sigma/A^2' table of nxspectrum2csv.bash, named 'cross-section.csv')  #
+#               . 'j': Number of parallel processes (default: all cores)                           #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path, cpu_count
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##     Unix style pathname pattern expansion   ##
+from glob import glob
+##      Launching parallel tasks Module        ##
+from concurrent.futures import ProcessPoolExecutor
+##     Fundamental package for array computing ##
+import numpy as np
+##  CompChemTools compressed files Module      ##
+try:
+    from compchemtools import compressed
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import compressed
+#################################################
+
+## Default filename of Newton-X cross-section results
+NX_CROSS_SECTION_FILENAME = 'cross-section.dat'
+
+## Header of Newton-X cross-section files (fields separated by any whitespace)
+NX_CROSS_SECTION_HEADER = ['DE/eV', 'lambda/nm', 'sigma/A^2', '+/-error/A^2']
+
+## Default filename of the averaged cross section
+NX_SPECTRUM_FILENAME = 'cross-section.average.csv'
+
+## Columns of the averaged cross section
+NX_SPECTRUM_HEADER = ['DE/eV', 'lambda/nm', 'sigma/A^2', 'error/A^2', 'stderr/A^2']
+
+class NXCrossSectionError(Exception):
+    """Error raised when a Newton-X cross-section file cannot be read"""
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('cross_section_files',
+                        type=str,
+                        nargs='*',
+                        default=['.'],
+                        help='Newton-X cross-section filenames, glob patterns or folders')
+
+    parser.add_argument('-o', dest='output_file',
+                        type=str,
+                        default=NX_SPECTRUM_FILENAME,
+                        help='averaged cross section file (.csv or .npy)')
+
+    parser.add_argument('-j', dest='jobs',
+                        type=int,
+                        default=cpu_count() or 1,
+                        help='number of parallel processes')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('number of parallel processes must be positive')
+
+    return args
+
+def get_cross_section_files(_arguments):
+    """Function to expand folders and glob patterns given by user into cross-section files
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+
+    Returns:
+        list:cross_section_files -- Newton-X cross-section file names
+    """
+    cross_section_files = []
+
+    for cross_section_pattern in _arguments.cross_section_files:
+        if path.isdir(cross_section_pattern):
+            cross_section_files.extend(sorted(
+                cross_section_file
+                for compressed_extension in [''] + compressed.COMPRESSED_EXTENSIONS
+                for cross_section_file in glob(
+                    path.join(cross_section_pattern, '**',
+                              NX_CROSS_SECTION_FILENAME + compressed_extension),
+                    recursive=True)))
+        elif any(character in cross_section_pattern for character in '*?['):
+            cross_section_files.extend(sorted(glob(cross_section_pattern)))
+        else:
+            cross_section_files.append(cross_section_pattern)
+
+    return cross_section_files
+
+def read_cross_section_file(_cross_section_file):
+    """Function to read a Newton-X cross-section file
+
+    Arguments:
+        _cross_section_file {str} -- Newton-X cross-section file name
+
+    Returns:
+        ndarray:cross_section -- (points, 4) array of energies (eV), wavelengths (nm), cross
+                                 sections and errors (A^2)
+    """
+    if not path.isfile(_cross_section_file):
+        raise NXCrossSectionError(
+            '> Cross-section file {} was not found.'.format(_cross_section_file))
+
+    with compressed.open_file(_cross_section_file, 'rt') as file:
+        cross_section_lines = file.readlines()
+
+    # Header line searched anywhere, as 'grep' in nxspectrum2csv.bash, with or without '#'
+    data_lines = [line for line in cross_section_lines
+                  if line.lstrip().lstrip('#').split() != NX_CROSS_SECTION_HEADER]
+    if len(data_lines) == len(cross_section_lines):
+        raise NXCrossSectionError(
+            '> Cross-section file {} is not from Newton-X.'.format(_cross_section_file))
+
+    try:
+        cross_section = np.loadtxt(data_lines, usecols=(0, 1, 2, 3), comments='#', ndmin=2)
+    except ValueError as error:
+        raise NXCrossSectionError(
+            '> Cross-section file {} could not be read: {}'.format(_cross_section_file, error))
+
+    if not cross_section.size:
+        raise NXCrossSectionError(
+            '> Cross-section file {} has no data.'.format(_cross_section_file))
+
+    return cross_section
+
+def process_cross_section_file(_cross_section_file):
+    """Function to read one Newton-X cross-section file, catching its errors
+
+    Arguments:
+        _cross_section_file {str} -- Newton-X cross-section file name
+
+    Returns:
+        str:cross_section_file -- Newton-X cross-section file name
+        ndarray:cross_section -- cross-section array, or None if the file was not read
+        str:error_message -- error message, or None if the file was read
+    """
+    try:
+        return _cross_section_file, read_cross_section_file(_cross_section_file), None
+    except (NXCrossSectionError, OSError, EOFError) as error:
+        return _cross_section_file, None, str(error)
+
+def average_cross_sections(_cross_sections):
+    """Function to average cross sections on the energy grid of the first one
+
+    Energies outside the grid of a file are left out of its average, so each energy is averaged
+    over the files covering it.
+
+    Arguments:
+        _cross_sections {list} -- (points, 4) cross-section arrays
+
+    Returns:
+        ndarray:spectrum -- (points, 5) array of energies, wavelengths, average cross sections,
+                            propagated errors and standard errors among files
+    """
+    grid = _cross_sections[0][:, 0]
+    order = np.argsort(grid)
+
+    sigma = np.empty((len(_cross_sections), grid.size))
+    error = np.empty_like(sigma)
+    for index, cross_section in enumerate(_cross_sections):
+        if np.array_equal(cross_section[:, 0], grid):
+            sigma[index], error[index] = cross_section[:, 2], cross_section[:, 3]
+            continue
+        energies_order = np.argsort(cross_section[:, 0])
+        energies = cross_section[energies_order, 0]
+        sigma[index, order] = np.interp(grid[order], energies, cross_section[energies_order, 2],
+                                        left=np.nan, right=np.nan)
+        error[index, order] = np.interp(grid[order], energies, cross_section[energies_order, 3],
+                                        left=np.nan, right=np.nan)
+
+    # Number of files covering each energy (at least the first one)
+    files_number = np.isfinite(sigma).sum(axis=0)
+    average = np.nansum(sigma, axis=0) / files_number
+    variance = np.nansum((sigma - average)**2, axis=0) / np.maximum(files_number - 1, 1)
+    standard_error = np.where(files_number > 1, np.sqrt(variance / files_number), 0.0)
+
+    return np.column_stack([grid, _cross_sections[0][:, 1], average,
+                            np.sqrt(np.nansum(error**2, axis=0)) / files_number, standard_error])
+
+def write_spectrum(_output_file, _spectrum):
+    """Function to write the averaged cross section as CSV table or NumPy array
+
+    Arguments:
+        _output_file {str} -- output file name (.csv or .npy)
+        _spectrum {ndarray} -- (points, 5) averaged cross-section array
+    """
+    if _output_file.endswith('.npy'):
+        np.save(_output_file, _spectrum)
+        return
+
+    np.savetxt(_output_file, _spectrum, fmt=['%.3f', '%.2f', '%.5e', '%.5e', '%.5e'],
+               delimiter=',', header=','.join(NX_SPECTRUM_HEADER), comments='')
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Expanding folders and glob patterns into cross-section files
+    cross_section_files = get_cross_section_files(arguments)
+
+    if not cross_section_files:
+        print_script_output('> No Newton-X cross-section files were found.', 'error')
+        sys.exit(1)
+
+    # Reading cross-section files in parallel
+    if arguments.jobs > 1 and len(cross_section_files) > 1:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            nx_results = list(executor.map(process_cross_section_file, cross_section_files,
+                                           chunksize=max(1, len(cross_section_files)
+                                                         // (4 * arguments.jobs))))
+    else:
+        nx_results = [process_cross_section_file(cross_section_file)
+                      for cross_section_file in cross_section_files]
+
+    cross_sections = [cross_section for _, cross_section, _ in nx_results
+                      if cross_section is not None]
+    nx_errors = [error_message for _, _, error_message in nx_results if error_message is not None]
+
+    # Summary of errors
+    if len(nx_results) > 1 and nx_errors:
+        print_script_output(
+            '> {} of {} cross-section files were not read:'
+                .format(len(nx_errors), len(nx_results)),
+            'error')
+    for error_message in nx_errors:
+        print_script_output(error_message, 'error')
+
+    # Averaging and writing cross sections
+    if cross_sections:
+        write_spectrum(arguments.output_file, average_cross_sections(cross_sections))
+
+        # End of get_nx_spectrum.py execution
+        print_script_output(
+            '> Cross section averaged over {} files sucessfully written to {}!'
+                .format(len(cross_sections), arguments.output_file),
+            'job_done')
+
+    if nx_errors:
+        sys.exit(1)
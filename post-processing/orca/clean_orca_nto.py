@@ -10,10 +10,40 @@
 ### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
 ####################################################################################################
 #                                                                                                  #
-# Usage: clean_orca_nto.py <MOLDEN-FILE>                                                           #
+# Usage: clean_orca_nto.py <MOLDEN-FILE> [<MOLDEN-FILE> ...] [-occ <THRESHOLDS>] [--top <K>]       #
+#                          [--cumulative <FRACTION>] [--spin <SPIN>] [-j <JOBS>]                   #
+#                          [--summary <CSV-FILE>] [--shared-header | --npz [--compress]]           #
+#                          [--stats] [--stats-json <JSON-FILE>] [--profile <PROF-FILE>]            #
 #                                                                                                  #
 # Step options:                                                                                    #
 #               . 'occ': NTO Occupation Threshold (default: 0.01)                                  #
+#                        Several comma-separated thresholds write one file per threshold           #
+#                        ('nto.occ<THRESHOLD>.<MOLDEN-FILE>') from a single read                   #
+#                                                                                                  #
+# Selection options (applied with each occupation threshold):                                      #
+#               . 'top':        Keep the K NTOs of largest occupation of each spin                 #
+#               . 'cumulative': Keep NTOs until this fraction of the occupation of each spin is    #
+#                               covered (e.g. 0.99)                                                #
+#               . 'spin':       Select 'alpha' or 'beta' NTOs only                                 #
+#                                                                                                  #
+# Batch options:                                                                                   #
+#               . Molden files may be given as several names, glob patterns or folders (*.nto)     #
+#               . '-j': Number of parallel processes (default: 1)                                  #
+#               . '--summary': CSV table of kept NTOs and occupations of each state                #
+#                              (default: 'nto.summary.csv' for several files or thresholds, in the #
+#                              common folder of the Molden files)                                  #
+#                                                                                                  #
+# Output options:                                                                                  #
+#               . '--shared-header': Write the Molden header once ('molden.<HASH>.header') and     #
+#                                    compact '<OUTPUT>.mos' orbital files (see expand_molden.py)   #
+#               . '--npz': Export kept NTOs as '<OUTPUT>.npz' NumPy archives (coefficients matrix, #
+#                          energies, occupations, spins and symmetries), '--compress' to compress  #
+#                                                                                                  #
+# Statistics options:                                                                              #
+#               . '--stats':      Report wall time, bytes, lines, MB/s and peak memory of each     #
+#                                 phase (read, index, select, format, write)                       #
+#               . '--stats-json': Write these statistics, per file and in total, to a JSON file    #
+#               . '--profile':    Dump cProfile statistics (files run in a single process)         #
 #                                                                                                  #
 ####################################################################################################
 
@@ -26,8 +56,29 @@
 import sys
 ##       Parser for command-line options       ##
 import argparse
+##     Unix style pathname pattern expansion   ##
+from glob import glob
+##      Launching parallel tasks Module        ##
+from concurrent.futures import ProcessPoolExecutor
+##           Time access Module                ##
+import time
+##     CompChemTools Molden reader Module      ##
+try:
+    from compchemtools import molden, compressed, stats
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import molden, compressed, stats
 #################################################
 
+## Extensions of ORCA NTO Molden Files searched in folders
+NTO_MOLDEN_EXTENSIONS = ['.nto']
+
+## Default name of the summary table written for several files or thresholds (in their folder)
+NTO_SUMMARY_FILENAME = 'nto.summary.csv'
+
+class NTOMoldenError(Exception):
+    """Error raised when a NTO Molden File cannot be cleaned"""
+
 def print_script_output(_text, _type):
     """Function to print colored terminal messages
     Arguments:
@@ -46,106 +97,342 @@ def get_arguments():
     """
     parser = argparse.ArgumentParser()
 
-    parser.add_argument('molden_nto_file',
+    parser.add_argument('molden_nto_files',
                         type=str,
-                        help='Molden NTO filename (usually .molden.input extension)')
+                        nargs='+',
+                        help='Molden NTO filenames (usually .molden.input extension), '
+                             'glob patterns or folders')
 
-    parser.add_argument('-occ', dest='occupation_threshold',
+    parser.add_argument('-occ', dest='occupation_thresholds',
                         type=str,
-                        default=0.01,
-                        help='NTO occupation threshold')
+                        default='0.01',
+                        help='NTO occupation threshold (several comma-separated thresholds '
+                             'are allowed)')
+
+    parser.add_argument('--top', dest='top',
+                        type=int,
+                        default=None,
+                        help='keep the K NTOs of largest occupation of each spin')
+
+    parser.add_argument('--cumulative', dest='cumulative',
+                        type=float,
+                        default=None,
+                        help='keep NTOs until this fraction of the occupation of each spin is '
+                             'covered, e.g. 0.99')
+
+    parser.add_argument('--spin', dest='spin',
+                        type=str,
+                        default=None,
+                        choices=['alpha', 'beta'],
+                        help='select NTOs of a single spin')
+
+    parser.add_argument('-j', dest='jobs',
+                        type=int,
+                        default=1,
+                        help='number of parallel processes used for several Molden files')
+
+    parser.add_argument('--summary', dest='summary_file',
+                        type=str,
+                        default=None,
+                        help='CSV table of kept NTOs and occupations of each state')
+
+    # Molden files with a shared header and NumPy archives are alternative outputs
+    output_group = parser.add_mutually_exclusive_group()
+
+    output_group.add_argument('--shared-header', dest='shared_header',
+                              action='store_true',
+                              help='write the Molden header once (molden.<HASH>.header) and '
+                                   'compact \'.mos\' orbital files')
+
+    output_group.add_argument('--npz', dest='npz',
+                              action='store_true',
+                              help='export kept NTOs as NumPy archives (\'.npz\') instead of '
+                                   'Molden files')
+
+    parser.add_argument('--compress', dest='compress',
+                        action='store_true',
+                        help='compress NumPy archives (they can no longer be memory-mapped)')
+
+    parser.add_argument('--stats', dest='stats',
+                        action='store_true',
+                        help='report time, bytes, lines, throughput and peak memory of each phase')
+
+    parser.add_argument('--stats-json', dest='stats_json_file',
+                        type=str,
+                        default=None,
+                        help='write phase statistics to a JSON file')
+
+    parser.add_argument('--profile', dest='profile_file',
+                        type=str,
+                        default=None,
+                        help='dump cProfile statistics of the run (files run in a single process)')
 
     args = parser.parse_args()
 
-    # Convert occupation threshold to float
-    args.occupation_threshold = float(args.occupation_threshold)
+    # Convert occupation thresholds to floats
+    try:
+        args.occupation_thresholds = [float(threshold)
+                                      for threshold in args.occupation_thresholds.split(',')]
+    except ValueError:
+        parser.error('invalid occupation threshold: {}'.format(args.occupation_thresholds))
+
+    if args.jobs < 1:
+        parser.error('number of parallel processes must be positive')
+
+    # JSON statistics are measured as '--stats' ones
+    args.stats = args.stats or args.stats_json_file is not None
 
     return args
 
+def get_molden_nto_files(_arguments):
+    """Function to expand folders and glob patterns given by user into NTO Molden File names
+    Arguments:
+        _arguments {obj} -- arguments given by user
+    Returns:
+        list:molden_nto_files -- NTO Molden File names
+    """
+    molden_nto_files = []
+
+    for molden_nto_pattern in _arguments.molden_nto_files:
+        if path.isdir(molden_nto_pattern):
+            # Cleaned files ('nto.' prefix) of previous runs are skipped
+            for extension in NTO_MOLDEN_EXTENSIONS:
+                for compressed_extension in [''] + compressed.COMPRESSED_EXTENSIONS:
+                    molden_nto_files.extend(
+                        molden_nto_file for molden_nto_file in sorted(glob(
+                            path.join(molden_nto_pattern, '*' + extension + compressed_extension)))
+                        if not path.basename(molden_nto_file).startswith('nto.'))
+        elif any(character in molden_nto_pattern for character in '*?['):
+            molden_nto_files.extend(sorted(glob(molden_nto_pattern)))
+        else:
+            molden_nto_files.append(molden_nto_pattern)
+
+    return molden_nto_files
+
 def open_ntos_molden_file(_arguments):
     """Function to read NTO Molden File
     Arguments:
         _arguments {obj} -- arguments given by user
     Returns:
-        list:nto_file -- list containing NTO Molden File as strings in lines
+        str:nto_file -- NTO Molden File text
     """
     if path.isfile(_arguments.molden_nto_file):
-        with open(_arguments.molden_nto_file, 'rt') as file:
-            nto_file = file.readlines()
-            return nto_file
+        return molden.read_molden_file(_arguments.molden_nto_file)
     else:
-        print_script_output(
-            '> Orca Molden NTO file {} was not found.'.format(_arguments.molden_nto_file),
-            'error')
-        sys.exit()
+        raise NTOMoldenError(
+            '> Orca Molden NTO file {} was not found.'.format(_arguments.molden_nto_file))
 
-def format_nto_molden_file(_arguments, _nto_raw_file):
+def format_nto_molden_file(_arguments, _nto_raw_file, _nto_stats=None):
     """Function to format NTO Molden File removing unoccupied orbitals
     Arguments:
         _arguments {obj} -- arguments given by user
-        _nto_raw_file {list} -- NTO Molden File lines
+        _nto_raw_file {str} -- NTO Molden File text
+        _nto_stats {dict} -- phase statistics, or None
     Returns:
-        list:molden_header -- list containing Molden file header in lines
-        list:ntos_data -- list containing NTOs according to occupation threshold in lines
+        str:molden_header -- Molden file header
+        dict:ntos_data -- NTOs (MolecularOrbital) above each occupation threshold
     """
+    # Only orbitals metadata is needed to select NTOs
+    try:
+        return molden.select_nto_orbitals(_nto_raw_file, _arguments.occupation_thresholds,
+                                          _arguments.spin, _arguments.top, _arguments.cumulative,
+                                          _nto_stats)
+    except ValueError as error:
+        raise NTOMoldenError('> {} ({}).'.format(error, _arguments.molden_nto_file))
 
-    # Obtaining Molden file header
-    for line_number, line in enumerate(_nto_raw_file):
-        if "[MO]" in line:
-            molden_header_end_line = line_number
+def get_nto_molden_filename(_arguments, _occupation_threshold):
+    """Function to build the cleaned NTO Molden File name
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _occupation_threshold {float} -- NTO occupation threshold
+    Returns:
+        str:molden_output_filename -- cleaned NTO Molden File name
+    """
+    molden_output_prefix = 'nto.'
+    if len(_arguments.occupation_thresholds) > 1:
+        molden_output_prefix += 'occ{:g}.'.format(_occupation_threshold)
 
-    molden_header = _nto_raw_file[:molden_header_end_line+1].copy()
+    return path.join(path.dirname(_arguments.molden_nto_file),
+                     molden_output_prefix + path.basename(
+                         compressed.strip_compressed_extension(_arguments.molden_nto_file)))
 
-    # Obtaining NTOs
-    nto_start_lines_number = []
-    for line_number, line in enumerate(_nto_raw_file):
-        if "Sym=" in line:
-            nto_start_lines_number.append(line_number)
+def write_nto_molden(_arguments, _occupation_threshold, _nto_raw_file, _molden_header,
+                     _molden_ntos_data, _nto_stats=None):
+    """Function to write the cleaned NTO Molden File
 
-    ntos_data = []
-    for mo_start_line_number, mo_end_line_number in zip(nto_start_lines_number, nto_start_lines_number[1:]):
-        ntos_raw_data = _nto_raw_file[mo_start_line_number:mo_end_line_number].copy()
-        for line_number, line in enumerate(ntos_raw_data):
-            if "Occup=" in line:
-                nto_occup = float(line.strip().split()[1])
-                if nto_occup > _arguments.occupation_threshold:
-                    ntos_data.extend(ntos_raw_data)
+    Args:
+        _arguments {obj} -- arguments given by user
+        _occupation_threshold (float): NTO occupation threshold
+        _nto_raw_file (str): NTO Molden File text
+        _molden_header (str): Header of original Molden file
+        _molden_ntos_data (list): NTOs selected accordint to occupation threshold
+        _nto_stats (dict): phase statistics, or None
+    """
+    molden_output_filename = get_nto_molden_filename(_arguments, _occupation_threshold)
 
-    return molden_header, ntos_data
+    if _arguments.npz:
+        try:
+            with stats.measure_phase(_nto_stats, 'write') as write_record:
+                molden.write_molden_npz(molden_output_filename + '.npz', _nto_raw_file,
+                                        _molden_ntos_data, _arguments.compress)
+        except ValueError as error:
+            raise NTOMoldenError('> {} ({}).'.format(error, _arguments.molden_nto_file))
+        stats.add_counts(write_record, path.getsize(molden_output_filename + '.npz'),
+                         _items=len(_molden_ntos_data))
+        return
 
-def write_nto_molden(_arguments, _molden_header, _molden_ntos_data):
-    """_summary_
+    with stats.measure_phase(_nto_stats, 'format') as format_record:
+        ntos_text = molden.get_molden_orbitals_text(_nto_raw_file, _molden_ntos_data)
+    stats.count_text(format_record, ntos_text, len(_molden_ntos_data))
 
-    Args:
+    with stats.measure_phase(_nto_stats, 'write') as write_record:
+        if _arguments.shared_header:
+            molden.write_molden_shared(molden_output_filename, _molden_header, ntos_text)
+        else:
+            with open(molden_output_filename, 'w') as file:
+                file.write(_molden_header)
+                file.writelines(ntos_text)
+    stats.count_text(write_record, [_molden_header] + ntos_text, len(_molden_ntos_data))
+
+def process_nto_file(_arguments):
+    """Function to clean one NTO Molden File for every occupation threshold
+    Arguments:
+        _arguments {obj} -- arguments given by user, with a single 'molden_nto_file'
+    Returns:
+        str:molden_nto_file -- NTO Molden File name
+        list:nto_summary -- (threshold, kept NTOs occupations) of each threshold, or None
+        str:error_message -- error message, or None if the file was cleaned
+        dict:nto_stats -- phase statistics, or None without '--stats'
+    """
+    nto_stats = stats.new_stats(_arguments.stats)
+
+    try:
+        # Reading Molden File
+        with stats.measure_phase(nto_stats, 'read') as read_record:
+            ntos_molden_raw_file = open_ntos_molden_file(_arguments)
+        stats.count_text(read_record, ntos_molden_raw_file)
+
+        # Formatting Molden File removing non-occupied NTOs
+        molden_header, molden_ntos_data = format_nto_molden_file(_arguments, ntos_molden_raw_file,
+                                                                 nto_stats)
+
+        # Writing the cleaned Molden Files
+        nto_summary = []
+        for occupation_threshold, molden_ntos in molden_ntos_data.items():
+            write_nto_molden(_arguments, occupation_threshold, ntos_molden_raw_file,
+                             molden_header, molden_ntos, nto_stats)
+            nto_summary.append((occupation_threshold, [nto.occupation for nto in molden_ntos]))
+
+    except (NTOMoldenError, OSError, EOFError) as error:
+        return _arguments.molden_nto_file, None, str(error), nto_stats
+
+    return _arguments.molden_nto_file, nto_summary, None, nto_stats
+
+def get_nto_summary_filename(_arguments, _molden_nto_files):
+    """Function to build the summary table file name
+    The default table is written to the common folder of NTO Molden Files, as cleaned files.
+    Arguments:
         _arguments {obj} -- arguments given by user
-        _molden_header (list): Header of original Molden file
-        _molden_ntos_data (list): NTOs selected accordint to occupation threshold
+        _molden_nto_files {list} -- NTO Molden File names
+    Returns:
+        str:summary_filename -- summary table file name, or None if it is not written
     """
+    if _arguments.summary_file is not None:
+        return _arguments.summary_file
+
+    if len(_molden_nto_files) == 1 and len(_arguments.occupation_thresholds) == 1:
+        return None
+
+    molden_nto_folder = path.commonpath([path.dirname(path.abspath(molden_nto_file))
+                                         for molden_nto_file in _molden_nto_files])
 
-    molden_output_filename = "nto."+_arguments.molden_nto_file
+    return path.join(path.relpath(molden_nto_folder), NTO_SUMMARY_FILENAME)
 
-    with open(molden_output_filename, 'w') as file:
-        for line in _molden_header:
-            file.write(line)
-        for line in _molden_ntos_data:
-            file.write(line)
+def write_nto_summary(_summary_filename, _nto_results):
+    """Function to write the CSV table of kept NTOs and occupations of each state
+    Args:
+        _summary_filename (str): CSV table file name
+        _nto_results (list): results of process_nto_file for each NTO Molden File
+    """
+    summary_lines = ['Molden File,Occupation Threshold,Kept NTOs,Occupation Sum,Occupations\n']
+
+    for molden_nto_file, nto_summary, _, _ in _nto_results:
+        if nto_summary is None:
+            continue
+        for occupation_threshold, occupations in nto_summary:
+            summary_lines.append('{},{:g},{},{:.6f},{}\n'.format(
+                molden_nto_file, occupation_threshold, len(occupations), sum(occupations),
+                ' '.join('{:.6f}'.format(occupation) for occupation in occupations)))
+
+    with open(_summary_filename, 'w') as file:
+        file.writelines(summary_lines)
 
 # Main program
 if __name__ == '__main__':
 
     # Obtaining arguments from terminal
     arguments = get_arguments()
+    run_start = time.perf_counter()
+    profiler = stats.start_profile(arguments.profile_file)
+
+    # Expanding folders and glob patterns into NTO Molden Files
+    molden_nto_files = get_molden_nto_files(arguments)
+    nto_arguments = [argparse.Namespace(**vars(arguments), molden_nto_file=molden_nto_file)
+                     for molden_nto_file in molden_nto_files]
+
+    if not molden_nto_files:
+        print_script_output('> No Orca Molden NTO files were found.', 'error')
+        sys.exit(1)
 
-    # Reading Molden File
-    ntos_molden_raw_file = open_ntos_molden_file(arguments)
+    # Cleaning NTO Molden Files, in parallel for several files
+    if arguments.jobs > 1 and len(molden_nto_files) > 1 and profiler is None:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            nto_results = list(executor.map(process_nto_file, nto_arguments))
+    else:
+        nto_results = [process_nto_file(nto_argument) for nto_argument in nto_arguments]
+
+    nto_errors = [error_message for _, _, error_message, _ in nto_results
+                  if error_message is not None]
+
+    # Writing the summary table
+    summary_file = get_nto_summary_filename(arguments, molden_nto_files)
+    if summary_file is not None:
+        write_nto_summary(summary_file, nto_results)
 
-    # Formatting Molden File removing non-occupied NTOs
-    molden_header, molden_ntos_data = format_nto_molden_file(arguments, ntos_molden_raw_file)
+    stats.stop_profile(profiler, arguments.profile_file)
 
-    # Writing the '.xyz' file
-    write_nto_molden(arguments, molden_header, molden_ntos_data)
+    # Reporting phase statistics
+    if arguments.stats:
+        run_time = time.perf_counter() - run_start
+        peak_rss = stats.get_peak_rss(_children=True)
+        nto_stats = [(molden_nto_file, nto_file_stats, error_message)
+                     for molden_nto_file, _, error_message, nto_file_stats in nto_results]
+        print(stats.format_stats(stats.merge_stats([nto_file_stats for _, nto_file_stats, _
+                                                    in nto_stats]),
+                                 run_time, peak_rss))
+        if arguments.stats_json_file is not None:
+            stats.write_stats_json(arguments.stats_json_file, stats.get_run_metrics(
+                path.basename(__file__), nto_stats, run_time, peak_rss))
+
+    # Summary of errors
+    if len(nto_results) > 1 and nto_errors:
+        print_script_output(
+            '> {} of {} Orca Molden NTO files were not cleaned:'
+                .format(len(nto_errors), len(nto_results)),
+            'error')
+    for error_message in nto_errors:
+        print_script_output(error_message, 'error')
 
     # End of clean_orca_nto.py execution
-    print_script_output(
-        '> NTO Molden File from {} sucessfully cleaned!'.format(arguments.molden_nto_file),
-        'job_done')
\ No newline at end of file
+    if len(nto_results) == 1 and not nto_errors:
+        print_script_output(
+            '> NTO Molden File from {} sucessfully cleaned!'.format(molden_nto_files[0]),
+            'job_done')
+    elif len(nto_results) > len(nto_errors):
+        print_script_output(
+            '> {} NTO Molden Files sucessfully cleaned!'
+                .format(len(nto_results) - len(nto_errors)),
+            'job_done')
+
+    if nto_errors:
+        sys.exit(1)
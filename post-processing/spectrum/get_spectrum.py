@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+
+####################################################################################################
+#                                                                                                  #
+#                                         get_spectrum.py                                          #
+#       Python script to broaden stick spectra into absorption cross sections (Gauss/Lorentz)      #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: get_spectrum.py <CSV-FILE> [<CSV-FILE> ...] [-s <SHAPE>] [-w <WIDTH>] [-x <MIN:MAX:STEP>] #
+#                        [-o <FORMAT>] [-j <JOBS>] [--ensemble <FILE>]                             #
+#                                                                                                  #
+# Stick spectra are CSV tables of transition energies (eV) and oscillator strengths, e.g. written  #
+# by get_g09_td.py or g09td2csv.bash. Tables may be given as several names, glob patterns or       #
+# folders ('*.td.csv' files).                                                                      #
+#                                                                                                  #
+# Broadening options:                                                                              #
+#               . 's': Line shape, 'gauss' (default) or 'lorentz'                                  #
+#               . 'w': Broadening width in eV (default: 0.35, as StDev in PlotSpectrum.nb)         #
+#               . 'x': Energy grid in eV (default: 1 eV around transition energies, 0.01 eV step)  #
+#                                                                                                  #
+# Output options:                                                                                  #
+#               . 'csv': '<CSV-FILE>.spectrum.csv' table of energies and cross sections (default)  #
+#               . 'npy': '<CSV-FILE>.spectrum.npy' NumPy (grid, 2) array                           #
+#               . '--ensemble': Write only the cross section averaged over all geometries (nuclear #
+#                               ensemble), each table being one geometry unless it has a 'Log      #
+#                               File' column                                                       #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path
+##   System-specific parameters and functions  ##
+import sys
+##       Parser for command-line options       ##
+import argparse
+##     Unix style pathname pattern expansion   ##
+from glob import glob
+##      Launching parallel tasks Module        ##
+from concurrent.futures import ProcessPoolExecutor
+##     Fundamental package for array computing ##
+import numpy as np
+##    CompChemTools spectrum broadening Module ##
+try:
+    from compchemtools import spectrum, compressed
+except ImportError:
+    sys.path.append(path.dirname(path.dirname(path.dirname(path.realpath(__file__)))))
+    from compchemtools import spectrum, compressed
+#################################################
+
+## Stick spectrum tables searched in folders
+STICK_SPECTRUM_PATTERN = '*.td.csv'
+
+def print_script_output(_text, _type):
+    """Function to print colored terminal messages
+
+    Arguments:
+        _text {str} -- Text to be printed
+        _type {str} -- Type of message
+    """
+    if _type == 'error':
+        print('\033[91m' + _text + '\033[m')
+    elif _type == 'job_done':
+        print('\033[92m' + _text + '\033[m')
+
+def parse_energy_grid(_energy_grid):
+    """Function to convert a 'minimum:maximum:step' option into an energy grid option
+
+    Arguments:
+        _energy_grid {str} -- energy grid option (eV, step may be omitted)
+
+    Returns:
+        tuple:energy_grid -- (minimum, maximum, step)
+    """
+    fields = _energy_grid.split(':')
+    if len(fields) not in (2, 3):
+        raise ValueError('invalid energy grid {}'.format(_energy_grid))
+
+    minimum, maximum = float(fields[0]), float(fields[1])
+    step = float(fields[2]) if len(fields) == 3 and fields[2] else spectrum.SPECTRUM_STEP
+    if step <= 0.0 or maximum <= minimum:
+        raise ValueError('invalid energy grid {}'.format(_energy_grid))
+
+    return minimum, maximum, step
+
+def get_arguments():
+    """Function to obtaing the arguments from Terminal
+
+    Returns:
+        obj:args -- arguments given by user
+    """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('stick_files',
+                        type=str,
+                        nargs='+',
+                        help='stick spectrum CSV filenames, glob patterns or folders')
+
+    parser.add_argument('-s', dest='shape',
+                        type=str,
+                        default='gauss',
+                        choices=spectrum.SPECTRUM_SHAPES,
+                        help='line shape')
+
+    parser.add_argument('-w', dest='width',
+                        type=float,
+                        default=spectrum.SPECTRUM_WIDTH,
+                        help='broadening width (eV)')
+
+    parser.add_argument('-x', dest='energy_grid',
+                        type=str,
+                        default=None,
+                        help='energy grid (eV), e.g. 3:9:0.01')
+
+    parser.add_argument('-o', dest='output_format',
+                        type=str,
+                        default='csv',
+                        choices=['csv', 'npy'],
+                        help='spectrum format')
+
+    parser.add_argument('-j', dest='jobs',
+                        type=int,
+                        default=1,
+                        help='number of parallel processes used for several tables')
+
+    parser.add_argument('--ensemble', dest='ensemble_file',
+                        type=str,
+                        default=None,
+                        help='write the cross section averaged over all geometries')
+
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error('number of parallel processes must be positive')
+    if args.width <= 0.0:
+        parser.error('broadening width must be positive')
+
+    try:
+        if args.energy_grid is not None:
+            args.energy_grid = parse_energy_grid(args.energy_grid)
+    except ValueError:
+        parser.error('invalid energy grid option')
+
+    return args
+
+def get_stick_files(_arguments):
+    """Function to expand folders and glob patterns given by user into stick spectrum tables
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+
+    Returns:
+        list:stick_files -- stick spectrum CSV file names
+    """
+    stick_files = []
+
+    for stick_pattern in _arguments.stick_files:
+        if path.isdir(stick_pattern):
+            stick_files.extend(sorted(glob(path.join(stick_pattern, STICK_SPECTRUM_PATTERN))))
+        elif any(character in stick_pattern for character in '*?['):
+            stick_files.extend(sorted(glob(stick_pattern)))
+        else:
+            stick_files.append(stick_pattern)
+
+    return stick_files
+
+def get_energy_grid(_arguments, _stick_files):
+    """Function to build the energy grid shared by all spectra
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+        _stick_files {list} -- stick spectrum CSV file names
+
+    Returns:
+        ndarray:energy_grid -- grid energies (eV)
+    """
+    if _arguments.energy_grid is not None:
+        return spectrum.get_energy_grid(*_arguments.energy_grid)
+
+    # Grid from PlotSpectrum.nb getXMin/getXMax: 1 eV around transition energies
+    minimum, maximum = spectrum.get_energy_range(_stick_files)
+    if not np.isfinite(minimum):
+        raise ValueError('no transitions were found')
+
+    return spectrum.get_energy_grid(np.floor(minimum - spectrum.SPECTRUM_MARGIN),
+                                    np.ceil(maximum + spectrum.SPECTRUM_MARGIN))
+
+def get_spectrum_filename(_arguments):
+    """Function to build the spectrum filename from stick spectrum table name
+
+    Arguments:
+        _arguments {obj} -- arguments given by user
+
+    Returns:
+        str:spectrum_filename -- name of the spectrum file
+    """
+    return path.splitext(compressed.strip_compressed_extension(_arguments.stick_file))[0] \
+        + '.spectrum.' + _arguments.output_format
+
+def process_stick_file(_arguments):
+    """Function to broaden the stick spectrum of one table
+
+    The spectrum file is written by this function unless spectra are averaged over the ensemble.
+
+    Arguments:
+        _arguments {obj} -- arguments given by user, with a single 'stick_file' and 'grid'
+
+    Returns:
+        str:stick_file -- stick spectrum CSV file name
+        tuple:cross_section -- (summed cross section, number of geometries), or None on error
+        str:error_message -- error message, or None if the spectrum was obtained
+    """
+    try:
+        cross_section, geometries_number = spectrum.get_cross_section(
+            _arguments.stick_file, _arguments.grid, _arguments.width, _arguments.shape)
+
+        if _arguments.ensemble_file is None:
+            spectrum.write_spectrum(get_spectrum_filename(_arguments), _arguments.grid,
+                                    cross_section / geometries_number)
+
+    except (OSError, EOFError, ValueError) as error:
+        return _arguments.stick_file, None, '> {} could not be broadened: {}'.format(
+            _arguments.stick_file, error)
+
+    return _arguments.stick_file, (cross_section, geometries_number), None
+
+# Main program
+if __name__ == '__main__':
+
+    # Obtaining arguments from terminal
+    arguments = get_arguments()
+
+    # Expanding folders and glob patterns into stick spectrum tables
+    stick_files = get_stick_files(arguments)
+
+    if not stick_files:
+        print_script_output('> No stick spectrum files were found.', 'error')
+        sys.exit(1)
+
+    # Building energy grid
+    try:
+        energy_grid = get_energy_grid(arguments, stick_files)
+    except (OSError, ValueError) as error:
+        print_script_output('> Energy grid could not be built: {}'.format(error), 'error')
+        sys.exit(1)
+
+    stick_arguments = [argparse.Namespace(**vars(arguments), stick_file=stick_file,
+                                          grid=energy_grid)
+                       for stick_file in stick_files]
+
+    # Broadening spectra, in parallel for several tables
+    if arguments.jobs > 1 and len(stick_files) > 1:
+        with ProcessPoolExecutor(max_workers=arguments.jobs) as executor:
+            spectrum_results = list(executor.map(process_stick_file, stick_arguments))
+    else:
+        spectrum_results = [process_stick_file(stick_argument)
+                            for stick_argument in stick_arguments]
+
+    spectrum_errors = [error_message for _, _, error_message in spectrum_results
+                       if error_message is not None]
+
+    # Averaging cross sections over the nuclear ensemble
+    if arguments.ensemble_file is not None:
+        ensemble_results = [result for _, result, _ in spectrum_results if result is not None]
+        if ensemble_results:
+            geometries_number = sum(number for _, number in ensemble_results)
+            spectrum.write_spectrum(arguments.ensemble_file, energy_grid,
+                                    sum(cross_section for cross_section, _ in ensemble_results)
+                                    / geometries_number)
+            print_script_output(
+                '> Spectrum averaged over {} geometries sucessfully written to {}!'
+                    .format(geometries_number, arguments.ensemble_file),
+                'job_done')
+
+    # Summary of errors
+    for error_message in spectrum_errors:
+        print_script_output(error_message, 'error')
+
+    # End of get_spectrum.py execution
+    if arguments.ensemble_file is None and len(spectrum_results) > len(spectrum_errors):
+        print_script_output(
+            '> {} spectra sucessfully broadened!'
+                .format(len(spectrum_results) - len(spectrum_errors)),
+            'job_done')
+
+    if spectrum_errors:
+        sys.exit(1)
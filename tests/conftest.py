@@ -0,0 +1,146 @@
+####################################################################################################
+#                                                                                                  #
+#                                           conftest.py                                            #
+#        Shared helpers of the behaviour tests, run on files written by synthetic_files.py         #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+#                                                                                                  #
+# Usage: python -m pytest -q tests                                                                 #
+#                                                                                                  #
+# Scripts are run as the user runs them (a subprocess in the folder of the input files), and their #
+# outputs are compared with golden outputs built from the synthetic file formulas, so the tests    #
+# do not depend on the readers they check.                                                         #
+#                                                                                                  #
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Operating System Interfaces Module     ##
+from os import path
+##   System-specific parameters and functions  ##
+import sys
+##   Subprocess management Module              ##
+import subprocess
+##        Compression compatible with gzip     ##
+import zlib
+##      Interpret bytes as packed binary data  ##
+import struct
+#################################################
+
+## Root folder of CompChemTools repository
+COMPCHEMTOOLS_ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+
+sys.path.insert(0, COMPCHEMTOOLS_ROOT)
+sys.path.insert(0, path.join(COMPCHEMTOOLS_ROOT, 'benchmarks'))
+
+## Post-processing scripts under test
+TEST_SCRIPTS = {
+    'get_g09_geom': path.join('post-processing', 'g09', 'get_g09_geom.py'),
+    'get_g09_nto': path.join('post-processing', 'g09', 'get_g09_nto.py'),
+    'get_g09_td': path.join('post-processing', 'g09', 'get_g09_td.py'),
+    'get_molden_active_space': path.join('post-processing', 'molden',
+                                         'get_molden_active_space.py'),
+    'get_molden_orbitals': path.join('post-processing', 'molden', 'get_molden_orbitals.py'),
+    'get_spectrum': path.join('post-processing', 'spectrum', 'get_spectrum.py'),
+    'get_nx_spectrum': path.join('post-processing', 'newton-x', 'get_nx_spectrum.py'),
+    'clean_orca_nto': path.join('post-processing', 'orca', 'clean_orca_nto.py')
+}
+
+## Symbols of the atomic numbers cycled by synthetic_files.py (C, H, O, N)
+SYNTHETIC_SYMBOLS = {6: 'C', 1: 'H', 8: 'O', 7: 'N'}
+
+## Uncompressed size of the blocks of BGZF and seekable zstd test files (several blocks per file)
+TEST_BLOCK_SIZE = 4096
+
+def run_script(_script, _arguments, _folder):
+    """Function to run a post-processing script in a folder, as from the terminal
+
+    Arguments:
+        _script {str} -- script key of TEST_SCRIPTS
+        _arguments {list} -- command-line arguments
+        _folder {str} -- working folder
+
+    Returns:
+        CompletedProcess:process -- finished process, with its text output
+    """
+    return subprocess.run(
+        [sys.executable, path.join(COMPCHEMTOOLS_ROOT, TEST_SCRIPTS[_script])]
+        + [str(argument) for argument in _arguments],
+        cwd=str(_folder), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        universal_newlines=True)
+
+def get_synthetic_xyz(_atoms_number, _steps):
+    """Function to build the golden '.xyz' text of synthetic geometries
+
+    Coordinates follow format_g09_orientation of synthetic_files.py.
+
+    Arguments:
+        _atoms_number {int} -- number of atoms
+        _steps {list} -- synthetic optimization step of each frame
+
+    Returns:
+        str:xyz_text -- geometries in XYZ format, as written by get_g09_geom.py
+    """
+    import synthetic_files
+
+    xyz_lines = []
+    for step in _steps:
+        displacement = 0.001 * step
+        xyz_lines.append('{}\n\n'.format(_atoms_number))
+        for atom in range(_atoms_number):
+            atomic_number = synthetic_files.SYNTHETIC_ATOMIC_NUMBERS[
+                atom % len(synthetic_files.SYNTHETIC_ATOMIC_NUMBERS)]
+            coordinates = [float('{:.6f}'.format(coordinate)) for coordinate in (
+                1.4 * (atom % 10) + displacement, 1.4 * (atom // 10 % 10) - displacement,
+                1.4 * (atom // 100) + 0.5 * displacement)]
+            xyz_lines.append('%s\t%10.6f\t%10.6f\t%10.6f\n'
+                             % tuple([SYNTHETIC_SYMBOLS[atomic_number]] + coordinates))
+
+    return ''.join(xyz_lines)
+
+def write_bgzf_file(_filename, _data):
+    """Function to write bytes as a BGZF (blocked gzip) file, as bgzip does
+
+    Arguments:
+        _filename {str} -- BGZF file name
+        _data {bytes} -- uncompressed bytes
+    """
+    with open(_filename, 'wb') as file:
+        # The last block is the empty end-of-file block
+        for block_start in list(range(0, len(_data), TEST_BLOCK_SIZE)) + [len(_data)]:
+            block = _data[block_start:block_start + TEST_BLOCK_SIZE]
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            deflated = compressor.compress(block) + compressor.flush()
+
+            # gzip header with a 'BC' extra subfield holding the block size minus one
+            file.write(struct.pack('<4BI2BH2BHH', 31, 139, 8, 4, 0, 0, 255, 6, 66, 67, 2,
+                                   18 + len(deflated) + 8 - 1))
+            file.write(deflated)
+            file.write(struct.pack('<2I', zlib.crc32(block) & 0xffffffff, len(block)))
+
+def write_zstd_seekable_file(_filename, _data, _zstandard):
+    """Function to write bytes as a zstd seekable file (independent frames and seek table)
+
+    Arguments:
+        _filename {str} -- zstd seekable file name
+        _data {bytes} -- uncompressed bytes
+        _zstandard {module} -- zstandard package
+    """
+    compressor = _zstandard.ZstdCompressor()
+    chunks = [_data[chunk_start:chunk_start + TEST_BLOCK_SIZE]
+              for chunk_start in range(0, len(_data), TEST_BLOCK_SIZE)]
+    frames = [compressor.compress(chunk) for chunk in chunks]
+
+    # Seek table entries (compressed and uncompressed sizes), closed by its footer
+    seek_table = b''.join(struct.pack('<2I', len(frame), len(chunk))
+                          for frame, chunk in zip(frames, chunks))
+    seek_table += struct.pack('<IBI', len(frames), 0, 0x8F92EAB1)
+
+    with open(_filename, 'wb') as file:
+        file.writelines(frames)
+        file.write(struct.pack('<2I', 0x184D2A5E, len(seek_table)))
+        file.write(seek_table)
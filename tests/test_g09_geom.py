@@ -0,0 +1,210 @@
+####################################################################################################
+#                                                                                                  #
+#                                         test_g09_geom.py                                         #
+#      Golden-output tests of get_g09_geom.py and compchemtools.g09 on synthetic g09 Log Files     #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##   Support for gzip, bzip2 and xz files      ##
+import gzip
+import bz2
+import lzma
+##       JSON encoder and decoder Module       ##
+import json
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script, get_synthetic_xyz, write_bgzf_file, write_zstd_seekable_file
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+#################################################
+
+## Size of synthetic g09 Log Files (more than 10 atoms, so all coordinates change along rows)
+TEST_ATOMS = 12
+TEST_STEPS = 6
+
+## Step options and the synthetic steps of their frames ('opt' is written again after the
+## stationary point, so 'all' holds one frame more than steps)
+TEST_STEP_FRAMES = [
+    ('opt', [TEST_STEPS]),
+    ('-1', [TEST_STEPS]),
+    ('-2', [TEST_STEPS - 1]),
+    ('0', [1]),
+    ('3', [4]),
+    ('all', list(range(1, TEST_STEPS + 1)) + [TEST_STEPS]),
+    ('1:5:2', [2, 4])
+]
+
+## Compressed variants of g09 Log Files: extension and opener of streaming compressions
+TEST_COMPRESSIONS = {
+    'gzip': ('.gz', gzip.open),
+    'bzip2': ('.bz2', bz2.open),
+    'xz': ('.xz', lzma.open),
+    'bgzf': ('.bgz', None),
+    'zstd': ('.zst', None),
+    'zstd-seekable': ('.zst', None)
+}
+
+def get_xyz_label(_step):
+    """Function to build the step label of '.xyz' file names ('1:5:2' -> '1_5_2')
+
+    Arguments:
+        _step {str} -- step option
+
+    Returns:
+        str:step_label -- step label
+    """
+    return _step.replace(':', '_')
+
+def write_compressed_log(_filename, _data, _compression):
+    """Function to write g09 Log File bytes with a compression of TEST_COMPRESSIONS
+
+    Arguments:
+        _filename {str} -- compressed file name
+        _data {bytes} -- g09 Log File bytes
+        _compression {str} -- compression name
+    """
+    if _compression == 'bgzf':
+        write_bgzf_file(_filename, _data)
+
+    elif _compression.startswith('zstd'):
+        zstandard = pytest.importorskip('zstandard')
+        if _compression == 'zstd':
+            with open(_filename, 'wb') as file:
+                file.write(zstandard.ZstdCompressor().compress(_data))
+        else:
+            write_zstd_seekable_file(_filename, _data, zstandard)
+
+    else:
+        with TEST_COMPRESSIONS[_compression][1](_filename, 'wb') as file:
+            file.write(_data)
+
+@pytest.fixture
+def g09_log(tmp_path):
+    """Synthetic g09 optimization Log File 'opt.log' in a temporary folder"""
+    synthetic_files.write_g09_optimization_log(str(tmp_path / 'opt.log'), TEST_ATOMS, TEST_STEPS)
+    return tmp_path / 'opt.log'
+
+@pytest.mark.parametrize('orientation', ['input', 'standard'])
+@pytest.mark.parametrize('step, frames', TEST_STEP_FRAMES)
+def test_g09_geometry_steps(g09_log, step, frames, orientation):
+    """Step options write the golden geometries of a plain Log File"""
+    process = run_script('get_g09_geom', [g09_log.name, '-n', step, '-f', orientation,
+                                          '--no-cache'], g09_log.parent)
+
+    assert process.returncode == 0, process.stdout
+    assert (g09_log.parent / 'opt.{}.xyz'.format(get_xyz_label(step))).read_text() \
+        == get_synthetic_xyz(TEST_ATOMS, frames)
+
+@pytest.mark.parametrize('compression', sorted(TEST_COMPRESSIONS))
+def test_g09_geometry_compressed(g09_log, compression):
+    """Compressed Log Files write the same geometries as plain Log Files"""
+    compressed_log = g09_log.parent / ('compressed.log' + TEST_COMPRESSIONS[compression][0])
+    write_compressed_log(str(compressed_log), g09_log.read_bytes(), compression)
+    g09_log.unlink()
+
+    for step, frames in TEST_STEP_FRAMES:
+        process = run_script('get_g09_geom', [compressed_log.name, '-n', step],
+                             compressed_log.parent)
+
+        assert process.returncode == 0, process.stdout
+        assert (compressed_log.parent / 'compressed.{}.xyz'.format(get_xyz_label(step))) \
+            .read_text() == get_synthetic_xyz(TEST_ATOMS, frames)
+
+def test_g09_index_extension(g09_log):
+    """A grown Log File extends its '.g09idx' index, giving the geometries of a new index"""
+    g09_data = g09_log.read_bytes()
+    grown_log = g09_log.parent / 'grown.log'
+
+    # Running job: the Log File is cut in the middle of a line of its third step
+    cut_offset = g09_data.index(b'Step number   3') + 5
+    grown_log.write_bytes(g09_data[:cut_offset])
+
+    process = run_script('get_g09_geom', [grown_log.name, '-n', '1'], grown_log.parent)
+    assert process.returncode == 0, process.stdout
+    first_index = json.loads((grown_log.parent / 'grown.log.g09idx').read_text())
+
+    with open(str(grown_log), 'ab') as file:
+        file.write(g09_data[cut_offset:])
+
+    # Only the bytes after the last complete line of the first index are scanned
+    process = run_script('get_g09_geom', [grown_log.name, '-n', '-2', '--stats-json',
+                                          'stats.json'], grown_log.parent)
+    assert process.returncode == 0, process.stdout
+    assert json.loads((grown_log.parent / 'stats.json').read_text())['phases']['index']['bytes'] \
+        == len(g09_data) - first_index['scanned_size']
+
+    for step, frames in TEST_STEP_FRAMES:
+        process = run_script('get_g09_geom', [grown_log.name, '-n', step], grown_log.parent)
+
+        assert process.returncode == 0, process.stdout
+        assert (grown_log.parent / 'grown.{}.xyz'.format(get_xyz_label(step))).read_text() \
+            == get_synthetic_xyz(TEST_ATOMS, frames)
+
+    g09_index = json.loads((grown_log.parent / 'grown.log.g09idx').read_text())
+    assert g09_index['scanned_size'] == len(g09_data)
+    assert g09_index['total_steps'] == TEST_STEPS
+    for marker_key, offsets in first_index['offsets'].items():
+        assert g09_index['offsets'][marker_key][:len(offsets)] == offsets
+
+def test_g09_scan_segments(tmp_path):
+    """'opt' and negative steps select the same geometries reading backwards and indexing
+
+    A relaxed scan holds several optimizations, each closed by a stationary point: 'opt' is the
+    geometry after the last stationary point, -N the geometry before the N-th last step.
+    """
+    first_log, second_log = tmp_path / 'first.log', tmp_path / 'second.log'
+    synthetic_files.write_g09_optimization_log(str(first_log), TEST_ATOMS, 3)
+    synthetic_files.write_g09_optimization_log(str(second_log), TEST_ATOMS, 2)
+    scan_data = first_log.read_bytes() + second_log.read_bytes()
+
+    (tmp_path / 'scan.log').write_bytes(scan_data)
+    write_compressed_log(str(tmp_path / 'scangz.log.gz'), scan_data, 'gzip')
+
+    # Steps of the scan: 1, 2, 3 (first optimization), 1, 2 (second optimization)
+    for step, frames in [('opt', [2]), ('-1', [2]), ('-2', [1]), ('-3', [3]), ('-5', [1])]:
+        for scan_log in ['scan.log', 'scangz.log.gz']:
+            process = run_script('get_g09_geom', [scan_log, '-n', step, '--no-cache'],
+                                 tmp_path)
+
+            assert process.returncode == 0, process.stdout
+            assert (tmp_path / '{}.{}.xyz'.format(scan_log.split('.')[0], step)).read_text() \
+                == get_synthetic_xyz(TEST_ATOMS, frames)
+
+def test_g09_truncated_at_stationary_point(g09_log):
+    """'opt' falls back to the last geometry before the stationary point ending a Log File"""
+    g09_data = g09_log.read_bytes()
+    stationary_end = g09_data.index(b'\n', g09_data.index(b'Stationary point found')) + 1
+    g09_log.write_bytes(g09_data[:stationary_end])
+    write_compressed_log(str(g09_log.parent / 'optgz.log.gz'), g09_data[:stationary_end], 'gzip')
+
+    for g09_log_file in ['opt.log', 'optgz.log.gz']:
+        process = run_script('get_g09_geom', [g09_log_file, '-n', 'opt', '-f', 'standard',
+                                              '--no-cache'], g09_log.parent)
+
+        assert process.returncode == 0, process.stdout
+        assert (g09_log.parent / '{}.opt.xyz'.format(g09_log_file.split('.')[0])).read_text() \
+            == get_synthetic_xyz(TEST_ATOMS, [TEST_STEPS])
+
+def test_g09_library_sources(g09_log):
+    """The library reads file names, compressed files, file objects and bytes alike"""
+    import compchemtools
+
+    write_compressed_log(str(g09_log.parent / 'opt.log.gz'), g09_log.read_bytes(), 'gzip')
+    g09_sources = [str(g09_log), str(g09_log.parent / 'opt.log.gz'), g09_log.read_bytes()]
+
+    for step in ['opt', -1, 0, '1:5:2']:
+        geometries = [compchemtools.get_g09_geometry(g09_source, _step=step)
+                      for g09_source in g09_sources]
+        with open(str(g09_log), 'rb') as file:
+            geometries.append(compchemtools.get_g09_geometry(file, _step=step))
+
+        for geometry in geometries[1:]:
+            assert (geometry.atomic_numbers == geometries[0].atomic_numbers).all()
+            assert (geometry.coordinates == geometries[0].coordinates).all()
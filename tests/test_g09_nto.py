@@ -0,0 +1,99 @@
+####################################################################################################
+#                                                                                                  #
+#                                          test_g09_nto.py                                         #
+#        Golden-output tests of get_g09_nto.py on synthetic g09 TD and NTO Log Files (splicing)    #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Support for gzip compressed files      ##
+import gzip
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+#################################################
+
+## Number of excited states of synthetic g09 TD Log Files
+TEST_STATES = 3
+
+def get_line_start(_text, _line):
+    """Function to find the start of the first line holding a text
+
+    Arguments:
+        _text {str} -- file text
+        _line {str} -- text of the line
+
+    Returns:
+        int:line_start -- offset of the line
+    """
+    return _text.rindex('\n', 0, _text.index(_line)) + 1
+
+def get_golden_nto(_td_text, _nto_text, _state):
+    """Function to build the golden converted NTO Log File of a state
+
+    The orbitals section of the TD Log File (after its title line, up to the 'Density Matrix'
+    line) is replaced by the NTO block of the state, without its last two lines.
+
+    Arguments:
+        _td_text {str} -- g09 TD Log File text
+        _nto_text {str} -- g09 NTO Log File text
+        _state {int} -- state number
+
+    Returns:
+        str:nto_text -- converted NTO Log File text
+    """
+    mo_start = _td_text.index('\n', _td_text.index('Molecular Orbital Coefficients')) + 1
+    mo_end = get_line_start(_td_text[mo_start:], 'Density Matrix') + mo_start
+
+    nto_start = get_line_start(_nto_text, 'Orbitals for state {:2d}:'.format(_state))
+    nto_end = get_line_start(_nto_text[nto_start:], 'Density Matrix') + nto_start
+
+    return _td_text[:mo_start] + _nto_text[nto_start:nto_end] + _td_text[mo_end:]
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+@pytest.mark.parametrize('extension', ['', '.gz'])
+def test_nto_splicing(tmp_path, extension, jobs):
+    """Every NTO block replaces the orbitals section of the TD Log File, one file per state"""
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES)
+    synthetic_files.write_g09_nto_log(str(tmp_path / 'single.log'), [2])
+    synthetic_files.write_g09_nto_log(str(tmp_path / 'states.log'), range(1, TEST_STATES + 1))
+    td_text = (tmp_path / 'td.log').read_text()
+    nto_texts = {filename: (tmp_path / filename).read_text()
+                 for filename in ['single.log', 'states.log']}
+
+    if extension:
+        for filename in ['td.log'] + sorted(nto_texts):
+            with gzip.open(str(tmp_path / (filename + extension)), 'wb') as file:
+                file.write((tmp_path / filename).read_bytes())
+            (tmp_path / filename).unlink()
+
+    process = run_script('get_g09_nto', ['td.log' + extension, 'single.log' + extension,
+                                         'states.log' + extension, '-j', jobs], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    assert (tmp_path / 'single.nto.log').read_text() \
+        == get_golden_nto(td_text, nto_texts['single.log'], 2)
+    for state in range(1, TEST_STATES + 1):
+        assert (tmp_path / 'states.state{}.nto.log'.format(state)).read_text() \
+            == get_golden_nto(td_text, nto_texts['states.log'], state)
+
+def test_nto_unfinished_td(tmp_path):
+    """A TD Log File without the orbitals section is reported and writes no NTO file"""
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES)
+    synthetic_files.write_g09_nto_log(str(tmp_path / 'nto.log'), [1])
+    td_text = (tmp_path / 'td.log').read_text()
+    (tmp_path / 'td.log').write_text(td_text.replace('Molecular Orbital Coefficients', 'MO'))
+
+    process = run_script('get_g09_nto', ['td.log', 'nto.log'], tmp_path)
+
+    assert process.returncode != 0
+    assert 'gfinput Pop=Full' in process.stdout
+    assert not (tmp_path / 'nto.nto.log').exists()
@@ -0,0 +1,121 @@
+####################################################################################################
+#                                                                                                  #
+#                                          test_g09_td.py                                          #
+#           Golden-output tests of get_g09_td.py on synthetic g09 TD Log Files (excited states)    #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Support for gzip compressed files      ##
+import gzip
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script, get_synthetic_xyz
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+#################################################
+
+## Number of excited states of synthetic g09 TD Log Files (the excitation from HOMO-1 is the
+## dominant one from state 7 on)
+TEST_STATES = 8
+
+## Header of excited states tables
+TEST_TD_HEADER = 'Transition Energy (eV),Oscillator Strength,Wavelength (nm),State,Label,' \
+                 '<S**2>,Excitations'
+
+def get_golden_td_lines(_log_file=None):
+    """Function to build the golden table lines of synthetic excited states
+
+    Arguments:
+        _log_file {str} -- g09 Log File name added as last column, if given
+
+    Returns:
+        list:table_lines -- CSV lines (without header), in state order
+    """
+    table_lines = []
+
+    for state in range(1, TEST_STATES + 1):
+        energy, oscillator_strength, excitations = synthetic_files.get_g09_excited_state(state)
+        excitations = sorted(excitations, key=lambda excitation: -abs(excitation[2]))
+        table_lines.append('{:.4f},{:.4f},{:.2f},{},Singlet-A,0.000,"{}"'.format(
+            energy, oscillator_strength, synthetic_files.G09_EV_NM / energy, state,
+            '; '.join('{}->{} ({:.5f})'.format(*excitation) for excitation in excitations))
+            + (',' + _log_file if _log_file is not None else ''))
+
+    return table_lines
+
+@pytest.mark.parametrize('extension', ['', '.gz'])
+def test_td_table(tmp_path, extension):
+    """Excited states are written with their dominant orbital excitations first"""
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES)
+    if extension:
+        with gzip.open(str(tmp_path / 'td.log.gz'), 'wb') as file:
+            file.write((tmp_path / 'td.log').read_bytes())
+        (tmp_path / 'td.log').unlink()
+
+    process = run_script('get_g09_td', ['td.log' + extension], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    assert (tmp_path / 'td.td.csv').read_text().splitlines() \
+        == [TEST_TD_HEADER] + get_golden_td_lines()
+
+def test_td_combined_npz(tmp_path):
+    """Combined tables hold the states of every Log File, with their file names"""
+    np = pytest.importorskip('numpy')
+    (tmp_path / 'logs').mkdir()
+    for log_file in ['first.log', 'second.log']:
+        synthetic_files.write_g09_td_log(str(tmp_path / 'logs' / log_file), TEST_STATES)
+
+    process = run_script('get_g09_td', ['logs', '-j', '2', '--combine', 'all.csv'], tmp_path)
+    assert process.returncode == 0, process.stdout
+    assert (tmp_path / 'all.csv').read_text().splitlines() == [TEST_TD_HEADER + ',Log File'] \
+        + get_golden_td_lines('logs/first.log') + get_golden_td_lines('logs/second.log')
+    assert not list((tmp_path / 'logs').glob('*.td.csv'))
+
+    process = run_script('get_g09_td', ['logs/first.log', '-o', 'npz'], tmp_path)
+    assert process.returncode == 0, process.stdout
+    with np.load(str(tmp_path / 'logs' / 'first.td.npz')) as td_archive:
+        assert td_archive['states'].tolist() == list(range(1, TEST_STATES + 1))
+        assert np.allclose(td_archive['energies'],
+                           [synthetic_files.get_g09_excited_state(state)[0]
+                            for state in range(1, TEST_STATES + 1)])
+        assert np.allclose(td_archive['oscillator_strengths'],
+                           [synthetic_files.get_g09_excited_state(state)[1]
+                            for state in range(1, TEST_STATES + 1)])
+
+@pytest.mark.parametrize('orientation', ['input', 'standard'])
+def test_td_geometry(tmp_path, orientation):
+    """The geometry of the excited states is written from the same pass as the table"""
+    pytest.importorskip('numpy')
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES, _atoms_number=5)
+
+    process = run_script('get_g09_td', ['td.log', '--geometry', '-f', orientation], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    assert (tmp_path / 'td.td.csv').read_text().splitlines() \
+        == [TEST_TD_HEADER] + get_golden_td_lines()
+    assert (tmp_path / 'td.td.xyz').read_text() == get_synthetic_xyz(5, [0])
+
+    process = run_script('get_g09_td', ['td.log', '-f', 'zmat', '--geometry', '--combine',
+                                        'all.csv'], tmp_path)
+    assert process.returncode != 0
+    assert 'No steps were found in td.log' in process.stdout
+    assert not (tmp_path / 'all.csv').read_text().splitlines()[1:]
+
+def test_td_without_states(tmp_path):
+    """A Log File without excited states is reported among the files of a batch"""
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES)
+    synthetic_files.write_g09_optimization_log(str(tmp_path / 'opt.log'), 3, 2)
+
+    process = run_script('get_g09_td', ['td.log', 'opt.log'], tmp_path)
+
+    assert process.returncode != 0
+    assert 'Excited states were not found in opt.log' in process.stdout
+    assert (tmp_path / 'td.td.csv').is_file()
+    assert not (tmp_path / 'opt.td.csv').exists()
@@ -0,0 +1,219 @@
+####################################################################################################
+#                                                                                                  #
+#                                          test_molden.py                                          #
+#      Golden-output tests of Molden and NTO scripts on synthetic Molden files (block splicing)    #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##     Regular expression operations Module    ##
+import re
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+#################################################
+
+## Size of synthetic Molden files
+TEST_ATOMS = 4
+TEST_BASIS_SIZE = 24
+TEST_ORBITALS = 24
+
+def split_molden_text(_molden_text):
+    """Function to split a synthetic Molden text into its header and orbital blocks
+
+    Arguments:
+        _molden_text {str} -- Molden File text
+
+    Returns:
+        str:molden_header -- text up to the '[MO]' line (included)
+        list:molden_blocks -- text of each orbital block, in file order
+    """
+    header_end = _molden_text.index('[MO]\n') + len('[MO]\n')
+    molden_blocks = re.split(r'(?m)^(?= Sym=)', _molden_text[header_end:])
+
+    return _molden_text[:header_end], [block for block in molden_blocks if block]
+
+def get_block_occupation(_molden_block):
+    """Function to read the occupation of an orbital block
+
+    Arguments:
+        _molden_block {str} -- orbital block text
+
+    Returns:
+        float:occupation -- 'Occup=' value
+    """
+    return float(re.search(r'Occup=\s*(\S+)', _molden_block).group(1))
+
+def write_molden(_folder, _filename, _occupation_profile):
+    """Function to write a synthetic Molden file in a folder
+
+    Arguments:
+        _folder {Path} -- folder
+        _filename {str} -- Molden file name
+        _occupation_profile {str} -- occupation profile ('closed', 'cas' or 'nto')
+
+    Returns:
+        Path:molden_file -- Molden file path
+    """
+    synthetic_files.write_molden_file(str(_folder / _filename), TEST_ATOMS, TEST_BASIS_SIZE,
+                                      TEST_ORBITALS, _occupation_profile)
+    return _folder / _filename
+
+@pytest.mark.parametrize('threshold', ['0.01', '0.1', '0.27'])
+def test_nto_splicing(tmp_path, threshold):
+    """Cleaned NTO files copy the header and the blocks of NTOs above the threshold
+
+    The threshold is strict: '0.27' is the occupation of the second pair of synthetic NTOs.
+    """
+    molden_file = write_molden(tmp_path, 'mol.nto', 'nto')
+    process = run_script('clean_orca_nto', [molden_file.name, '-occ', threshold], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    molden_header, molden_blocks = split_molden_text(molden_file.read_text())
+    nto_header, nto_blocks = split_molden_text((tmp_path / 'nto.mol.nto').read_text())
+
+    assert nto_header == molden_header
+    assert nto_blocks == [block for block in molden_blocks
+                          if get_block_occupation(block) > float(threshold)]
+
+def test_nto_summary_folder(tmp_path):
+    """The default summary of a batch run is written next to the NTO files"""
+    (tmp_path / 'ntos').mkdir()
+    (tmp_path / 'run').mkdir()
+    for molden_filename in ['first.nto', 'second.nto']:
+        write_molden(tmp_path / 'ntos', molden_filename, 'nto')
+
+    process = run_script('clean_orca_nto', [str(tmp_path / 'ntos')], tmp_path / 'run')
+    assert process.returncode == 0, process.stdout
+
+    assert (tmp_path / 'ntos' / 'nto.summary.csv').is_file()
+    assert not (tmp_path / 'run' / 'nto.summary.csv').exists()
+    assert len((tmp_path / 'ntos' / 'nto.summary.csv').read_text().splitlines()) == 3
+
+def test_active_space_splicing(tmp_path):
+    """Active space files copy the header and the blocks of fractionally occupied orbitals"""
+    molden_file = write_molden(tmp_path, 'mol.molden', 'cas')
+    process = run_script('get_molden_active_space', [molden_file.name], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    molden_header, molden_blocks = split_molden_text(molden_file.read_text())
+    cas_header, cas_blocks = split_molden_text((tmp_path / 'cas.mol.molden').read_text())
+
+    assert cas_header == molden_header
+    assert cas_blocks == [block for block in molden_blocks
+                          if 0.0 < get_block_occupation(block) < 2.0]
+
+def test_molden_orbitals_index(tmp_path):
+    """Selected orbitals are copied as raw blocks, with a '.moldenidx' index reused by size
+    and modification time"""
+    molden_file = write_molden(tmp_path, 'mol.molden', 'closed')
+    molden_header, molden_blocks = split_molden_text(molden_file.read_text())
+
+    for _ in range(2):
+        process = run_script('get_molden_orbitals', [molden_file.name, '-i', '2-4,7'], tmp_path)
+        assert process.returncode == 0, process.stdout
+        assert (tmp_path / 'orb.mol.molden').read_text() \
+            == molden_header + ''.join(molden_blocks[index] for index in [1, 2, 3, 6])
+    assert (tmp_path / 'mol.molden.moldenidx').is_file()
+
+    # A rewritten Molden file (other orbitals) is indexed again
+    synthetic_files.write_molden_file(str(molden_file), TEST_ATOMS, TEST_BASIS_SIZE,
+                                      TEST_ORBITALS // 2, 'closed', _seed=1)
+    molden_header, molden_blocks = split_molden_text(molden_file.read_text())
+
+    process = run_script('get_molden_orbitals', [molden_file.name, '--frontier', '1'], tmp_path)
+    assert process.returncode == 0, process.stdout
+    assert (tmp_path / 'orb.mol.molden').read_text() == molden_header + ''.join(
+        molden_blocks[TEST_ORBITALS // 4 - 2:TEST_ORBITALS // 4 + 2])
+
+def test_npz_malformed_coefficients(tmp_path):
+    """A malformed coefficient line is reported and leaves no NumPy archive"""
+    molden_file = write_molden(tmp_path, 'mol.nto', 'nto')
+    molden_text = molden_file.read_text()
+    coefficients_start = molden_text.index('Occup=')
+    coefficients_start = molden_text.index('\n', coefficients_start) + 1
+    molden_file.write_text(molden_text[:coefficients_start] + '   1   not-a-number\n'
+                           + molden_text[coefficients_start:])
+
+    process = run_script('clean_orca_nto', [molden_file.name, '--npz'], tmp_path)
+
+    assert process.returncode != 0
+    assert 'not-a-number' in process.stdout
+    assert not list(tmp_path.glob('*.npz*'))
+
+@pytest.mark.parametrize('script, molden_filename, occupation_profile',
+                         [('clean_orca_nto', 'mol.nto', 'nto'),
+                          ('get_molden_active_space', 'mol.molden', 'cas')])
+def test_exclusive_outputs(tmp_path, script, molden_filename, occupation_profile):
+    """A shared header and a NumPy archive cannot be requested together"""
+    molden_file = write_molden(tmp_path, molden_filename, occupation_profile)
+    process = run_script(script, [molden_file.name, '--shared-header', '--npz'], tmp_path)
+
+    assert process.returncode == 2
+    assert 'not allowed with argument' in process.stdout
+    assert sorted(path.name for path in tmp_path.iterdir()) == [molden_filename]
+
+def test_active_space_unrestricted(tmp_path):
+    """Beta orbitals keep the default window between 0 and 2, '--unrestricted' selects the
+    window between 0 and 1"""
+    molden_file = write_molden(tmp_path, 'uhf.molden', 'cas')
+    molden_header, molden_blocks = split_molden_text(molden_file.read_text())
+    molden_blocks = [block.replace('Spin= Alpha', 'Spin= Beta') if orbital % 2 else block
+                     for orbital, block in enumerate(molden_blocks)]
+    molden_file.write_text(molden_header + ''.join(molden_blocks))
+
+    for arguments, maximum in [([], 2.0), (['--unrestricted'], 1.0)]:
+        process = run_script('get_molden_active_space', [molden_file.name] + arguments, tmp_path)
+        assert process.returncode == 0, process.stdout
+
+        assert split_molden_text((tmp_path / 'cas.uhf.molden').read_text())[1] \
+            == [block for block in molden_blocks if 0.0 < get_block_occupation(block) < maximum]
+
+def test_read_molden(tmp_path):
+    """Whole Molden files are parsed into atoms, basis shells and orbital coefficients, and the
+    cache of parsed headers stays bounded"""
+    import compchemtools
+    from compchemtools import molden
+
+    np = pytest.importorskip('numpy')
+    basis_size = TEST_BASIS_SIZE + 2
+    synthetic_files.write_molden_file(str(tmp_path / 'mol.molden'), TEST_ATOMS, basis_size,
+                                      TEST_ORBITALS, 'cas')
+    molden_text = (tmp_path / 'mol.molden').read_text()
+    molden_data = compchemtools.read_molden(str(tmp_path / 'mol.molden'))
+
+    assert molden_data.atoms.symbols == ['C', 'H', 'O', 'N']
+    assert molden_data.atoms.atomic_numbers.tolist() == synthetic_files.SYNTHETIC_ATOMIC_NUMBERS
+    assert molden_data.atoms.units == 'AU'
+    assert np.allclose(molden_data.atoms.coordinates[:, 0], [0.0, 2.6, 5.2, 7.8])
+
+    # Shells of format_molden_gto: two 'p' shells per atom, one more 's' shell on the first atoms
+    assert [(shell.atom, shell.shell_type) for shell in molden_data.shells] \
+        == [(1, 'p'), (1, 'p'), (1, 's'), (2, 'p'), (2, 'p'), (2, 's'), (3, 'p'), (3, 'p'),
+            (4, 'p'), (4, 'p')]
+    assert molden_data.shells[2].contraction.shape == (2, 1)
+    assert sum(3 if shell.shell_type == 'p' else 1 for shell in molden_data.shells) == basis_size
+
+    _, molden_blocks = split_molden_text(molden_text)
+    assert len(molden_data.orbitals) == TEST_ORBITALS
+    for orbital, molden_block in zip(molden_data.orbitals, molden_blocks):
+        assert orbital.occupation == get_block_occupation(molden_block)
+        assert np.allclose(orbital.coefficients, [float(line.split()[1]) for line
+                                                  in molden_block.splitlines()[4:]])
+
+    # Headers differing by their title, more than the cache holds
+    for title in range(2 * molden.MOLDEN_HEADER_CACHE_SIZE):
+        molden.read_molden(molden_text.replace('BaseName=synthetic', 'BaseName={}'.format(title))
+                           .encode('ascii'))
+        assert len(molden.MOLDEN_HEADER_CACHE) <= molden.MOLDEN_HEADER_CACHE_SIZE
+    assert molden.read_molden(molden_text.encode('ascii')).atoms is not molden_data.atoms
+    assert molden.read_molden(molden_text.encode('ascii')).shells \
+        is molden.read_molden(molden_text.encode('ascii')).shells
@@ -0,0 +1,111 @@
+####################################################################################################
+#                                                                                                  #
+#                                       test_nx_spectrum.py                                        #
+#          Tests of get_nx_spectrum.py on synthetic Newton-X cross-section files (averaging)       #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script
+#################################################
+
+np = pytest.importorskip('numpy')
+
+## Header line of Newton-X cross-section files
+TEST_NX_HEADER = ' DE/eV    lambda/nm    sigma/A^2        +/-error/A^2\n'
+
+def write_cross_section(_filename, _energies, _sigma, _error, _header=TEST_NX_HEADER):
+    """Function to write a Newton-X cross-section file
+
+    Arguments:
+        _filename {Path} -- cross-section file name
+        _energies {list} -- energies (eV)
+        _sigma {list} -- cross sections (A^2)
+        _error {float} -- error of every cross section (A^2)
+        _header {str} -- lines before the data
+    """
+    _filename.parent.mkdir(parents=True, exist_ok=True)
+    _filename.write_text(_header + ''.join(
+        '   {:.3f}   {:.2f}   {:.5E}   {:.5E}\n'.format(energy, 1239.84193 / energy, sigma, _error)
+        for energy, sigma in zip(_energies, _sigma)))
+
+def read_spectrum(_filename):
+    """Function to read an averaged cross-section table
+
+    Arguments:
+        _filename {Path} -- averaged cross-section CSV file name
+
+    Returns:
+        str:header -- header line
+        ndarray:spectrum -- (points, 5) averaged cross-section array
+    """
+    header = _filename.read_text().splitlines()[0]
+    return header, np.loadtxt(str(_filename), delimiter=',', skiprows=1, ndmin=2)
+
+def test_nx_average(tmp_path):
+    """Cross sections of a folder tree are averaged, with propagated and standard errors"""
+    energies = [2.0, 2.5, 3.0]
+    write_cross_section(tmp_path / 'a' / 'cross-section.dat', energies, [1e-3, 2e-3, 3e-3], 1e-4)
+    write_cross_section(tmp_path / 'b' / 'cross-section.dat', energies, [3e-3, 4e-3, 5e-3], 1e-4)
+
+    process = run_script('get_nx_spectrum', ['-j', '2'], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    header, spectrum = read_spectrum(tmp_path / 'cross-section.average.csv')
+    assert header == 'DE/eV,lambda/nm,sigma/A^2,error/A^2,stderr/A^2'
+    assert np.allclose(spectrum[:, 0], energies)
+    assert np.allclose(spectrum[:, 2], [2e-3, 3e-3, 4e-3])
+    assert np.allclose(spectrum[:, 3], np.sqrt(2) * 1e-4 / 2)
+    assert np.allclose(spectrum[:, 4], 1e-3)
+
+def test_nx_partial_grids(tmp_path):
+    """Energies outside the grid of a file are averaged over the other files only"""
+    write_cross_section(tmp_path / 'first.dat', [2.0, 2.5, 3.0, 3.5], [1e-3, 2e-3, 3e-3, 4e-3],
+                        1e-4)
+    write_cross_section(tmp_path / 'second.dat', [2.25, 2.75, 3.25], [4e-3, 5e-3, 6e-3], 1e-4)
+
+    process = run_script('get_nx_spectrum', ['first.dat', 'second.dat', '-o', 'average.npy'],
+                         tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    spectrum = np.load(str(tmp_path / 'average.npy'))
+    assert np.allclose(spectrum[:, 2], [1e-3, 3.25e-3, 4.25e-3, 4e-3])
+    assert np.allclose(spectrum[:, 3], [1e-4, np.sqrt(2) * 1e-4 / 2, np.sqrt(2) * 1e-4 / 2,
+                                        1e-4])
+    assert np.allclose(spectrum[:, 4], [0.0, 1.25e-3, 1.25e-3, 0.0])
+
+@pytest.mark.parametrize('header', ['# Newton-X cross section\n\n' + TEST_NX_HEADER,
+                                    '#' + TEST_NX_HEADER])
+def test_nx_header_lines(tmp_path, header):
+    """The Newton-X header may follow comment lines or start with '#'"""
+    write_cross_section(tmp_path / 'cross-section.dat', [2.0, 2.5], [1e-3, 2e-3], 1e-4, header)
+
+    process = run_script('get_nx_spectrum', [], tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    _, spectrum = read_spectrum(tmp_path / 'cross-section.average.csv')
+    assert np.allclose(spectrum[:, 2], [1e-3, 2e-3])
+
+def test_nx_errors(tmp_path):
+    """Files without the Newton-X header or data are reported, the others are averaged"""
+    write_cross_section(tmp_path / 'good.dat', [2.0, 2.5], [1e-3, 2e-3], 1e-4)
+    write_cross_section(tmp_path / 'other.dat', [2.0, 2.5], [1e-3, 2e-3], 1e-4, 'E sigma\n')
+    write_cross_section(tmp_path / 'empty.dat', [], [], 1e-4)
+
+    process = run_script('get_nx_spectrum', ['good.dat', 'other.dat', 'empty.dat', 'missing.dat',
+                                             '-o', 'average.csv'], tmp_path)
+
+    assert process.returncode != 0
+    assert '3 of 4 cross-section files were not read' in process.stdout
+    assert 'other.dat is not from Newton-X' in process.stdout
+    assert 'empty.dat has no data' in process.stdout
+    assert 'missing.dat was not found' in process.stdout
+    assert np.allclose(read_spectrum(tmp_path / 'average.csv')[1][:, 2], [1e-3, 2e-3])
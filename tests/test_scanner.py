@@ -0,0 +1,165 @@
+####################################################################################################
+#                                                                                                  #
+#                                         test_scanner.py                                          #
+#     Tests of compchemtools.scanner handlers and of the single-pass compchemtools.g09 reader      #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##      Core tools for working with streams    ##
+import io
+##       Testing framework Module              ##
+import pytest
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+##   CompChemTools scanner and g09 Modules     ##
+from compchemtools import scanner, g09
+#################################################
+
+## Size of synthetic g09 Log Files
+TEST_ATOMS = 12
+TEST_STEPS = 6
+TEST_STATES = 4
+
+## Chunk sizes splitting marker lines and sections across chunks
+TEST_CHUNK_SIZES = [7, 64, scanner.SCANNER_CHUNK_SIZE]
+
+class CountingReader(io.BytesIO):
+    """Bytes buffer counting the bytes read from it"""
+
+    def __init__(self, _data):
+        super().__init__(_data)
+        self.read_size = 0
+
+    def read(self, _size=-1):
+        data = super().read(_size)
+        self.read_size += len(data)
+        return data
+
+def get_line_start(_text, _line, _start=0):
+    """Function to find the start of the first line holding a text
+
+    Arguments:
+        _text {bytes} -- file data
+        _line {bytes} -- text of the line
+        _start {int} -- offset where the search starts
+
+    Returns:
+        int:line_start -- offset of the line
+    """
+    return _text.rindex(b'\n', 0, _text.index(_line, _start)) + 1
+
+def scan_all_sections(_g09_log_file, _chunk_size):
+    """Function to scan g09 Log File with the handlers of every section
+
+    Arguments:
+        _g09_log_file {str} -- g09 Log File name
+        _chunk_size {int} -- size of the chunks read from log file (bytes)
+
+    Returns:
+        dict:g09_results -- scanner results
+    """
+    g09_results = {}
+    g09_handlers = {}
+    scanner.add_g09_geometry_handlers(g09_handlers, g09_results)
+    scanner.add_g09_td_handlers(g09_handlers, g09_results)
+    scanner.add_g09_nto_handlers(g09_handlers, g09_results)
+    scanner.add_termination_handlers(g09_handlers, g09_results)
+    scanner.scan_log_file(_g09_log_file, g09_handlers, _chunk_size=_chunk_size)
+
+    return g09_results
+
+@pytest.mark.parametrize('chunk_size', TEST_CHUNK_SIZES)
+def test_section_handlers(tmp_path, chunk_size):
+    """Sections and marker offsets do not depend on where chunks split the log file"""
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES)
+    synthetic_files.write_g09_nto_log(str(tmp_path / 'nto.log'), [1, 3])
+    td_data = (tmp_path / 'td.log').read_bytes()
+    nto_data = (tmp_path / 'nto.log').read_bytes()
+
+    td_results = scan_all_sections(str(tmp_path / 'td.log'), chunk_size)
+    nto_results = scan_all_sections(str(tmp_path / 'nto.log'), chunk_size)
+
+    # Input orientation: marker, four header lines and the atom lines
+    assert [offset for offset, _ in td_results['g09_geometries']] \
+        == [get_line_start(td_data, b'Input orientation:')]
+    assert len(td_results['g09_geometries'][0][1]) == g09.G09_BLOCK_HEADER_LINES + 3
+
+    assert [len(lines) for _, lines in td_results['g09_excited_states']] == [3] * TEST_STATES
+    assert td_results['g09_excited_states'][-1][0] \
+        == get_line_start(td_data, b'Excited State   4:')
+    assert td_results['g09_mo_start'] \
+        == [td_data.index(b'\n', td_data.index(b'Molecular Orbital Coefficients')) + 1]
+    assert td_results['g09_mo_end'] == [get_line_start(td_data, b'Density Matrix')]
+    assert td_results['g09_termination'] == [get_line_start(td_data, b'Normal termination')]
+    assert td_results['g09_nto_blocks'] == [] and td_results['orca_termination'] == []
+
+    # NTO blocks end two lines before 'Populations using transition density'
+    nto_spans = [(start, end) for start, end, _ in nto_results['g09_nto_blocks']]
+    second_start = get_line_start(nto_data, b'for state  3')
+    assert nto_spans == [(get_line_start(nto_data, b'for state  1'),
+                          get_line_start(nto_data, b'Density Matrix')),
+                         (second_start, get_line_start(nto_data, b'Density Matrix', second_start))]
+
+def test_read_g09_log(tmp_path):
+    """Geometry, excited states and orbitals sections are read in a single pass"""
+    np = pytest.importorskip('numpy')
+    synthetic_files.write_g09_td_log(str(tmp_path / 'td.log'), TEST_STATES)
+    td_data = (tmp_path / 'td.log').read_bytes()
+
+    td_reader = CountingReader(td_data)
+    g09_log = g09.read_g09_log(td_reader, _step=0, _orientation='standard')
+    assert td_reader.read_size == len(td_data)
+
+    g09_geometry = g09.get_g09_geometry(td_data, _step=0, _orientation='standard')
+    assert np.array_equal(g09_log.geometry.atomic_numbers, g09_geometry.atomic_numbers)
+    assert np.array_equal(g09_log.geometry.coordinates, g09_geometry.coordinates)
+
+    assert [excited_state.state for excited_state in g09_log.excited_states] \
+        == list(range(1, TEST_STATES + 1))
+    for excited_state in g09_log.excited_states:
+        energy, oscillator_strength, excitations = \
+            synthetic_files.get_g09_excited_state(excited_state.state)
+        assert (excited_state.energy, excited_state.oscillator_strength) \
+            == pytest.approx((energy, oscillator_strength))
+        assert excited_state.excitations[0] \
+            == (str(excitations[1][0]), '->', str(excitations[1][1]), excitations[1][2])
+
+    assert g09_log.nto_blocks == []
+    assert td_data[slice(*g09_log.mo_span)].splitlines()[0] == b' mo line 0'
+
+    g09_log = g09.read_g09_log(str(tmp_path / 'td.log'), ['excited_states'])
+    assert g09_log.geometry is None and g09_log.nto_blocks is None and g09_log.mo_span is None
+    with pytest.raises(ValueError):
+        g09.read_g09_log(td_data, ['geometry', 'orbitals'])
+
+@pytest.mark.parametrize('step', ['opt', '-2', '0', '3', 'all', '1:5:2'])
+def test_read_g09_log_steps(tmp_path, step):
+    """Steps of optimization Log Files are selected as get_g09_geometry selects them"""
+    np = pytest.importorskip('numpy')
+    synthetic_files.write_g09_optimization_log(str(tmp_path / 'opt.log'), TEST_ATOMS, TEST_STEPS)
+
+    g09_log = g09.read_g09_log(str(tmp_path / 'opt.log'), ['geometry'], _step=step)
+    g09_geometry = g09.get_g09_geometry(str(tmp_path / 'opt.log'), _step=step)
+
+    assert np.array_equal(g09_log.geometry.atomic_numbers, g09_geometry.atomic_numbers)
+    assert np.array_equal(g09_log.geometry.coordinates, g09_geometry.coordinates)
+
+def test_read_g09_log_errors(tmp_path):
+    """Missing geometries are reported as for get_g09_geometry"""
+    synthetic_files.write_g09_nto_log(str(tmp_path / 'nto.log'), [2])
+    synthetic_files.write_g09_optimization_log(str(tmp_path / 'opt.log'), 3, 2, _stationary=False)
+
+    g09_log = g09.read_g09_log(str(tmp_path / 'nto.log'), ['ntos'])
+    assert [nto_block.state for nto_block in g09_log.nto_blocks] == [2]
+    assert g09_log.mo_span is None
+
+    with pytest.raises(g09.G09LogError, match='No steps were found'):
+        g09.read_g09_log(str(tmp_path / 'nto.log'))
+    with pytest.raises(g09.G09LogError, match='Stationary point was not found'):
+        g09.read_g09_log(str(tmp_path / 'opt.log'), ['geometry'])
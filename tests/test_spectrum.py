@@ -0,0 +1,110 @@
+####################################################################################################
+#                                                                                                  #
+#                                         test_spectrum.py                                         #
+#       Tests of compchemtools.spectrum and get_spectrum.py on analytic line shapes and tables     #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script
+#################################################
+
+np = pytest.importorskip('numpy')
+spectrum = pytest.importorskip('compchemtools.spectrum')
+
+## Sticks of test tables: (transition energy (eV), oscillator strength, geometry)
+TEST_STICKS = [(3.0, 0.2, 'first.log'), (4.5, 0.05, 'first.log'),
+               (3.2, 0.4, 'second.log'), (5.0, 0.1, 'second.log')]
+
+## Areas of line shapes of unit height and width, between -10 and 10 widths
+TEST_SHAPE_AREAS = [('gauss', np.sqrt(2.0 * np.pi)), ('lorentz', 2.0 * np.arctan(10.0))]
+
+def write_stick_table(_filename, _sticks, _geometries=True):
+    """Function to write a stick spectrum table, as get_g09_td.py does
+
+    Arguments:
+        _filename {Path} -- table file name
+        _sticks {list} -- (energy, oscillator strength, geometry) sticks
+        _geometries {bool} -- write the 'Log File' column of combined tables
+    """
+    table_lines = ['Transition Energy (eV),Oscillator Strength,Wavelength (nm),State'
+                   + (',Log File' if _geometries else '') + '\n']
+    for stick, (energy, oscillator_strength, geometry) in enumerate(_sticks):
+        table_lines.append('{:.4f},{:.4f},{:.2f},{}'.format(
+            energy, oscillator_strength, 1239.84193 / energy, stick + 1)
+            + (',' + geometry if _geometries else '') + '\n')
+
+    _filename.write_text(''.join(table_lines))
+
+def test_cross_section_factor():
+    """Oscillator strengths become cross sections (a.u.) times 2 * pi^2 * alpha"""
+    assert spectrum.CROSS_SECTION_FACTOR == pytest.approx(0.1440439, rel=1e-6)
+
+@pytest.mark.parametrize('shape, area', TEST_SHAPE_AREAS)
+def test_line_shapes(shape, area):
+    """Line shapes peak at the oscillator strength, with the analytic areas and half widths"""
+    width = 0.2
+    energy_grid = spectrum.get_energy_grid(1.0, 5.0, 0.001)
+    broadened = spectrum.broaden_sticks(energy_grid, np.array([3.0]), np.array([0.5]), width,
+                                        shape)
+
+    assert broadened[np.argmax(broadened)] == pytest.approx(0.5)
+    assert energy_grid[np.argmax(broadened)] == pytest.approx(3.0)
+    assert 0.001 * broadened.sum() == pytest.approx(0.5 * width * area, rel=1e-4)
+
+    half_height = spectrum.broaden_sticks(np.array([3.0 + width]), np.array([3.0]),
+                                          np.array([0.5]), width, shape)[0]
+    assert half_height == pytest.approx(0.5 * (np.exp(-0.5) if shape == 'gauss' else 0.5))
+
+    with pytest.raises(ValueError):
+        spectrum.broaden_sticks(energy_grid, np.array([3.0]), np.array([0.5]), width, 'voigt')
+
+@pytest.mark.parametrize('chunk_size', [1, 3, spectrum.SPECTRUM_CHUNK_SIZE])
+def test_cross_section_chunks(tmp_path, chunk_size):
+    """Cross sections of a table do not depend on the number of sticks broadened at once"""
+    write_stick_table(tmp_path / 'sticks.td.csv', TEST_STICKS)
+    energy_grid = spectrum.get_energy_grid(2.0, 6.0)
+
+    cross_section, geometries_number = spectrum.get_cross_section(
+        str(tmp_path / 'sticks.td.csv'), energy_grid, 0.3, 'lorentz', chunk_size)
+
+    assert geometries_number == 2
+    assert np.allclose(cross_section, spectrum.CROSS_SECTION_FACTOR * sum(
+        oscillator_strength * spectrum.broaden_sticks(energy_grid, np.array([energy]),
+                                                      np.array([1.0]), 0.3, 'lorentz')
+        for energy, oscillator_strength, _ in TEST_STICKS))
+
+def test_ensemble_spectrum(tmp_path):
+    """The ensemble spectrum of separate tables is the spectrum of their combined table"""
+    write_stick_table(tmp_path / 'combined.csv', TEST_STICKS)
+    for geometry in ['first', 'second']:
+        write_stick_table(tmp_path / '{}.td.csv'.format(geometry),
+                          [stick for stick in TEST_STICKS if stick[2] == geometry + '.log'],
+                          _geometries=False)
+
+    process = run_script('get_spectrum', ['combined.csv', '-x', '2:6'], tmp_path)
+    assert process.returncode == 0, process.stdout
+    process = run_script('get_spectrum', ['.', '-x', '2:6', '--ensemble', 'ensemble.csv'],
+                         tmp_path)
+    assert process.returncode == 0, process.stdout
+
+    assert not (tmp_path / 'first.td.spectrum.csv').exists()
+    combined = np.loadtxt(str(tmp_path / 'combined.spectrum.csv'), delimiter=',', skiprows=1)
+    ensemble = np.loadtxt(str(tmp_path / 'ensemble.csv'), delimiter=',', skiprows=1)
+    assert combined.shape == (401, 2)
+    assert np.allclose(ensemble, combined)
+
+    # Two geometries: the cross section of all sticks divided by two
+    broadened = spectrum.broaden_sticks(spectrum.get_energy_grid(2.0, 6.0),
+                                        np.array([stick[0] for stick in TEST_STICKS]),
+                                        np.array([stick[1] for stick in TEST_STICKS]))
+    assert np.allclose(combined[:, 1], spectrum.CROSS_SECTION_FACTOR / 2 * broadened,
+                       rtol=1e-5, atol=1e-12)
@@ -0,0 +1,106 @@
+####################################################################################################
+#                                                                                                  #
+#                                          test_stats.py                                           #
+#     Tests of the phase counters of compchemtools.stats, from library calls and '--stats-json'    #
+#                                                                                                  #
+####################################################################################################
+### Author: Carlos E. V. de Moura, Ph.D. (https://github.com/carlosevmoura)                      ###
+### From CompChemTools repository (https://github.com/carlosevmoura/CompChemTools)               ###
+####################################################################################################
+
+#################################################
+###              Loading modules              ###
+#################################################
+##       JSON encoder and decoder Module       ##
+import json
+##       Testing framework Module              ##
+import pytest
+##     Shared helpers of behaviour tests       ##
+from conftest import run_script
+##   Synthetic g09 and Molden files Module     ##
+import synthetic_files
+##  CompChemTools statistics and readers       ##
+from compchemtools import stats, g09
+#################################################
+
+## Size of synthetic files
+TEST_ATOMS = 12
+TEST_STEPS = 4
+TEST_ORBITALS = 24
+
+def test_phase_records():
+    """Phases are measured only in the records given to them, with no state in the module"""
+    with stats.measure_phase(None, 'read') as record:
+        assert record is None
+    stats.add_counts(None, 10, 1, 1)
+    assert stats.new_stats(False) is None
+
+    g09_stats = stats.new_stats(True)
+    for _ in range(2):
+        with stats.measure_phase(g09_stats, 'read') as record:
+            stats.count_text(record, ['first\nline\n', b'second\n'], 2)
+
+    assert sorted(g09_stats) == ['read']
+    assert g09_stats['read']['calls'] == 2
+    assert (g09_stats['read']['bytes'], g09_stats['read']['lines'],
+            g09_stats['read']['items']) == (2 * 18, 2 * 3, 2 * 2)
+    assert g09_stats['read']['time'] >= 0.0
+
+    assert stats.merge_stats([g09_stats, None, g09_stats])['read']['bytes'] == 4 * 18
+
+def test_library_counters(tmp_path):
+    """Library scans count bytes, lines and markers only in the records passed to them"""
+    synthetic_files.write_g09_optimization_log(str(tmp_path / 'opt.log'), TEST_ATOMS, TEST_STEPS)
+    g09_data = (tmp_path / 'opt.log').read_bytes()
+
+    marker_offsets, _ = g09.scan_g09_file(str(tmp_path / 'opt.log'))
+    g09_stats = stats.new_stats(True)
+    assert g09.scan_g09_file(str(tmp_path / 'opt.log'), _stats=g09_stats)[0] == marker_offsets
+
+    assert g09_stats['index']['bytes'] == len(g09_data)
+    assert g09_stats['index']['lines'] == g09_data.count(b'\n')
+    assert g09_stats['index']['items'] == sum(len(offsets) for offsets in marker_offsets.values())
+
+    pytest.importorskip('numpy')
+    from compchemtools import molden
+
+    synthetic_files.write_molden_file(str(tmp_path / 'mol.nto'), 4, 24, TEST_ORBITALS, 'nto')
+    molden_text = (tmp_path / 'mol.nto').read_text()
+    nto_stats = stats.new_stats(True)
+    _, ntos_data = molden.select_nto_orbitals(molden_text, [0.1, 0.01], _stats=nto_stats)
+
+    assert sorted(nto_stats) == ['index', 'select']
+    assert nto_stats['index']['bytes'] == len(molden_text)
+    assert nto_stats['index']['items'] == TEST_ORBITALS
+    assert nto_stats['select']['items'] == len(ntos_data[0.1]) + len(ntos_data[0.01]) == 4 + 8
+
+@pytest.mark.parametrize('script, input_filename', [('get_g09_geom', 'opt.log'),
+                                                    ('clean_orca_nto', 'mol.nto')])
+def test_stats_json(tmp_path, script, input_filename):
+    """'--stats-json' writes the counters of every phase, per file and in total"""
+    synthetic_files.write_g09_optimization_log(str(tmp_path / 'opt.log'), TEST_ATOMS, TEST_STEPS)
+    synthetic_files.write_molden_file(str(tmp_path / 'mol.nto'), 4, 24, TEST_ORBITALS, 'nto')
+    input_size = (tmp_path / input_filename).stat().st_size
+
+    process = run_script(script, [input_filename, '--stats-json', 'stats.json'], tmp_path)
+    assert process.returncode == 0, process.stdout
+    metrics = json.loads((tmp_path / 'stats.json').read_text())
+
+    assert metrics['files_number'] == 1 and metrics['errors_number'] == 0
+    assert metrics['files'][0]['phases'] == {
+        phase: {counter: value for counter, value in record.items() if counter != 'throughput'}
+        for phase, record in metrics['phases'].items()}
+
+    if script == 'get_g09_geom':
+        # Optimized geometry read from the end of the Log File: one frame of TEST_ATOMS atoms
+        assert sorted(metrics['phases']) == ['format', 'read', 'write']
+        assert metrics['phases']['format']['items'] == 1
+        assert metrics['phases']['write']['lines'] == TEST_ATOMS + 2
+        assert metrics['phases']['write']['bytes'] == (tmp_path / 'opt.opt.xyz').stat().st_size
+    else:
+        assert sorted(metrics['phases']) == ['format', 'index', 'read', 'select', 'write']
+        assert metrics['phases']['read']['bytes'] == metrics['phases']['index']['bytes'] \
+            == input_size
+        assert metrics['phases']['index']['items'] == TEST_ORBITALS
+        assert metrics['phases']['write']['bytes'] \
+            == (tmp_path / 'nto.mol.nto').stat().st_size